@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+from sqlalchemy.engine import make_url
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Funkcja dostarczająca wiadomość tematu do lokalnych połączeń WebSocket
+Deliver = Callable[[str, dict], None]
+
+
+def encode_message(topic: str, message: dict) -> str:
+    """Koduje wiadomość tematu do postaci przesyłanej między procesami."""
+    return json.dumps({"topic": topic, "message": message}, separators=(",", ":"))
+
+
+def decode_message(payload: str) -> Tuple[str, dict]:
+    """Dekoduje wiadomość zakodowaną przez encode_message.
+
+    Returns:
+        Krotka (temat, wiadomość).
+    """
+    data = json.loads(payload)
+    return data["topic"], data["message"]
+
+
+class Backplane(ABC):
+    """Interfejs kanału publikacji wiadomości WebSocket (pub/sub) między workerami.
+
+    Wiadomość opublikowana przez dowolny proces aplikacji jest dostarczana
+    do funkcji deliver każdego procesu (również nadawcy), który następnie
+    rozsyła ją do własnych połączeń WebSocket.
+    """
+
+    @abstractmethod
+    async def start(self, deliver: Deliver) -> None:
+        """Zaczyna odbierać wiadomości i przekazywać je do deliver."""
+
+    @abstractmethod
+    async def publish(self, topic: str, message: dict) -> None:
+        """Publikuje wiadomość tematu do wszystkich procesów."""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Kończy odbieranie wiadomości i zwalnia zasoby."""
+
+
+class InProcessBackplane(Backplane):
+    """Kanał w obrębie jednego procesu - wiadomość dostarczana jest od razu.
+
+    Domyślny kanał menedżera WebSocket (jeden worker).
+    """
+
+    def __init__(self, deliver: Optional[Deliver] = None) -> None:
+        """Inicjalizuje kanał.
+
+        Args:
+            deliver: Funkcja dostarczająca wiadomości (można ją podać później w start).
+        """
+        self._deliver = deliver
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, topic: str, message: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(topic, message)
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresBackplane(Backplane):
+    """Kanał oparty na PostgreSQL LISTEN/NOTIFY.
+
+    Każdy worker utrzymuje jedno własne połączenie asyncpg (poza pulą
+    aplikacji), nasłuchuje na kanale i publikuje przez pg_notify. Baza
+    danych powiadamia również nadawcę, więc wiadomość dociera do jego
+    połączeń tą samą drogą co do pozostałych workerów.
+
+    Attributes:
+        dsn: Adres bazy danych PostgreSQL (bez nazwy sterownika SQLAlchemy).
+        channel: Nazwa kanału NOTIFY.
+    """
+
+    def __init__(self, url: str, channel: str) -> None:
+        """Inicjalizuje kanał bez połączenia z bazą danych.
+
+        Args:
+            url: Adres bazy danych (np. DATABASE_URL, także z nazwą sterownika).
+            channel: Nazwa kanału NOTIFY.
+        """
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._deliver: Optional[Deliver] = None
+        self._connection: Any = None
+        self._lock = asyncio.Lock()
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        async with self._lock:
+            await self._connect()
+
+    async def _connect(self) -> None:
+        """Otwiera połączenie i rejestruje nasłuch kanału (wywoływane pod blokadą)."""
+        import asyncpg
+
+        self._connection = await asyncpg.connect(self.dsn)
+        await self._connection.add_listener(self.channel, self._on_notify)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """Obsługuje powiadomienie NOTIFY - dostarcza wiadomość lokalnym połączeniom."""
+        try:
+            topic, message = decode_message(payload)
+        except (ValueError, KeyError):
+            logger.warning("Ignoring malformed backplane notification")
+            return
+        if self._deliver is not None:
+            self._deliver(topic, message)
+
+    async def publish(self, topic: str, message: dict) -> None:
+        # jedno połączenie asyncpg nie może wykonywać równoległych zapytań
+        async with self._lock:
+            if self._connection is None or self._connection.is_closed():
+                # zerwane połączenie - ponowne połączenie wznawia też nasłuch
+                await self._connect()
+            await self._connection.execute("SELECT pg_notify($1, $2)", self.channel, encode_message(topic, message))
+
+    async def stop(self) -> None:
+        async with self._lock:
+            connection, self._connection = self._connection, None
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+
+class UnixSocketBackplane(Backplane):
+    """Kanał oparty na gniazdach Unix (datagramy) w katalogu współdzielonym przez workery.
+
+    Każdy proces tworzy w katalogu własne gniazdo, a publikacja wysyła
+    datagram do wszystkich gniazd w katalogu (również własnego). Nie wymaga
+    brokera ani bazy danych - przeznaczony do pracy lokalnej i testów
+    (wszystkie workery na jednym hoście).
+
+    Attributes:
+        directory: Katalog z gniazdami workerów.
+        path: Gniazdo bieżącego procesu.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Inicjalizuje kanał bez gniazda.
+
+        Args:
+            directory: Katalog z gniazdami workerów (tworzony w razie potrzeby).
+        """
+        self.directory = Path(directory)
+        self.path = self.directory / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock"
+        self._deliver: Optional[Deliver] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._sender: Optional[socket.socket] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        self.directory.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DatagramReceiver(self),
+            local_addr=str(self.path),
+            family=socket.AF_UNIX,
+        )
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+
+    def _receive(self, data: bytes) -> None:
+        """Dostarcza odebrany datagram lokalnym połączeniom."""
+        try:
+            topic, message = decode_message(data.decode())
+        except (ValueError, KeyError):
+            logger.warning("Ignoring malformed backplane datagram")
+            return
+        if self._deliver is not None:
+            self._deliver(topic, message)
+
+    async def publish(self, topic: str, message: dict) -> None:
+        if self._sender is None:
+            raise RuntimeError("Backplane is not started")
+        data = encode_message(topic, message).encode()
+        for peer in self.directory.glob("*.sock"):
+            try:
+                self._sender.sendto(data, str(peer))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # gniazdo zakończonego workera
+                peer.unlink(missing_ok=True)
+            except BlockingIOError:
+                logger.warning("Backplane peer %s is not keeping up, message dropped", peer.name)
+
+    async def stop(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._sender is not None:
+            self._sender.close()
+            self._sender = None
+        self.path.unlink(missing_ok=True)
+
+
+class _DatagramReceiver(asyncio.DatagramProtocol):
+    """Protokół asyncio przekazujący datagramy do UnixSocketBackplane."""
+
+    def __init__(self, backplane: UnixSocketBackplane) -> None:
+        self.backplane = backplane
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.backplane._receive(data)
+
+
+def create_backplane() -> Backplane:
+    """Tworzy kanał publikacji wiadomości WebSocket zgodnie z ustawieniami.
+
+    Returns:
+        Kanał wybrany przez WS_BACKPLANE ("memory", "postgres" lub "unix").
+
+    Raises:
+        ValueError: Jeśli kanał postgres wybrano dla bazy danych innej niż PostgreSQL.
+    """
+    if settings.WS_BACKPLANE == "postgres":
+        if make_url(settings.DATABASE_URL).get_backend_name() != "postgresql":
+            raise ValueError("WS_BACKPLANE=postgres requires a PostgreSQL DATABASE_URL")
+        return PostgresBackplane(settings.DATABASE_URL, settings.WS_BACKPLANE_CHANNEL)
+    if settings.WS_BACKPLANE == "unix":
+        directory = settings.WS_BACKPLANE_DIR or os.path.join(tempfile.gettempdir(), "dogshelter-ws")
+        return UnixSocketBackplane(directory)
+    return InProcessBackplane()
@@ -0,0 +1,121 @@
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Awaitable, Callable, Dict, Optional, Union
+from .config import settings
+from .websocket_manager import WebSocketManager, manager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingUpdate:
+    """Oczekująca aktualizacja tematu.
+
+    Attributes:
+        first_requested: Czas (monotoniczny) pierwszego żądania w oknie.
+        last_requested: Czas (monotoniczny) ostatniego żądania w oknie.
+    """
+    first_requested: float
+    last_requested: float
+
+
+class StatsBroadcaster:
+    """Łączy (coalescing) aktualizacje statystyk wysyłane przez WebSocket.
+
+    Pierwsze żądanie aktualizacji tematu czeka przez okno czasowe, a kolejne
+    żądania w tym oknie są jedynie zliczane. Po upływie okna (liczonego od
+    ostatniego żądania, ale nie dłużej niż max_latency od pierwszego) wysyłany
+    jest jeden, najnowszy snapshot statystyk.
+
+    Attributes:
+        window: Okno łączenia aktualizacji w sekundach.
+        max_latency: Maksymalne opóźnienie wysyłki od pierwszego żądania w sekundach.
+        sent_updates: Liczba wysłanych aktualizacji.
+        merged_updates: Liczba żądań połączonych z inną aktualizacją.
+    """
+
+    def __init__(
+        self,
+        ws_manager: WebSocketManager,
+        window: Optional[float] = None,
+        max_latency: Optional[float] = None,
+    ) -> None:
+        """Inicjalizuje broadcaster bez oczekujących aktualizacji.
+
+        Args:
+            ws_manager: Menedżer WebSocket, przez który wysyłane są wiadomości.
+            window: Okno łączenia aktualizacji w sekundach
+                (domyślnie STATS_BROADCAST_WINDOW_MS z ustawień).
+            max_latency: Maksymalne opóźnienie wysyłki w sekundach
+                (domyślnie STATS_BROADCAST_MAX_LATENCY_MS z ustawień).
+        """
+        self.manager = ws_manager
+        self._window = window
+        self._max_latency = max_latency
+        self.sent_updates: int = 0
+        self.merged_updates: int = 0
+        self._lock = Lock()
+        self._pending: Dict[str, _PendingUpdate] = {}
+
+    @property
+    def window(self) -> float:
+        """Okno łączenia aktualizacji w sekundach."""
+        return self._window if self._window is not None else settings.STATS_BROADCAST_WINDOW_MS / 1000
+
+    @property
+    def max_latency(self) -> float:
+        """Maksymalne opóźnienie wysyłki w sekundach (nie mniejsze niż okno)."""
+        max_latency = self._max_latency
+        if max_latency is None:
+            max_latency = settings.STATS_BROADCAST_MAX_LATENCY_MS / 1000
+        return max(max_latency, self.window)
+
+    async def request(self, topic: str, build_message: Callable[[], Union[dict, Awaitable[dict]]]) -> None:
+        """Zgłasza potrzebę wysłania aktualnych statystyk tematu.
+
+        Args:
+            topic: Nazwa tematu (np. "dogs", "cats").
+            build_message: Funkcja (lub funkcja asynchroniczna) budująca wiadomość;
+                wywoływana dopiero w chwili wysyłki, więc wysyłany jest najnowszy stan.
+        """
+        now = time.monotonic()
+        with self._lock:
+            pending = self._pending.get(topic)
+            if pending is not None:
+                # aktualizacja tematu jest już zaplanowana - zostanie wysłana z nowszym stanem
+                pending.last_requested = now
+                self.merged_updates += 1
+                return
+            pending = _PendingUpdate(first_requested=now, last_requested=now)
+            self._pending[topic] = pending
+
+        try:
+            while True:
+                with self._lock:
+                    deadline = min(pending.last_requested + self.window,
+                                   pending.first_requested + self.max_latency)
+                delay = deadline - time.monotonic()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                del self._pending[topic]
+
+        message = build_message()
+        if inspect.isawaitable(message):
+            message = await message
+        self.sent_updates += 1
+        await self.manager.broadcast(topic, message)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Zwraca liczniki wysłanych i połączonych aktualizacji."""
+        return {"sent_updates": self.sent_updates, "merged_updates": self.merged_updates}
+
+
+# Globalna instancja broadcastera statystyk
+stats_broadcaster: StatsBroadcaster = StatsBroadcaster(manager)
@@ -0,0 +1,251 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Tuple
+from .config import settings
+from .versions import table_versions
+
+# Dane zwierzęcia zapisywane w pamięci podręcznej (wartości zgodne z JSON)
+EntityData = Dict[str, Any]
+
+
+class CacheBackend(ABC):
+    """Interfejs magazynu pamięci podręcznej encji.
+
+    Wartości są słownikami zgodnymi z JSON, więc implementacja może
+    przechowywać je poza procesem (np. w Redisie).
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[EntityData]:
+        """Zwraca wartość klucza lub None, jeśli jej nie ma (lub wygasła)."""
+
+    @abstractmethod
+    def set(self, key: str, value: EntityData) -> None:
+        """Zapisuje wartość klucza."""
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]) -> None:
+        """Usuwa podane klucze."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Zwraca liczniki działania magazynu (trafienia, chybienia, wyrzucenia)."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Ograniczona pamięć podręczna LRU z czasem życia wpisów (TTL) w pamięci procesu.
+
+    Po przekroczeniu max_size wyrzucany jest najdawniej używany wpis,
+    a wpisy starsze niż ttl są traktowane jak brakujące.
+
+    Attributes:
+        max_size: Maksymalna liczba wpisów.
+        ttl: Czas życia wpisu w sekundach.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Inicjalizuje pustą pamięć podręczną.
+
+        Args:
+            max_size: Maksymalna liczba wpisów.
+            ttl: Czas życia wpisu w sekundach.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, Tuple[float, EntityData]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[EntityData]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: EntityData) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class EntityCache:
+    """Pamięć podręczna odczytów pojedynczych zwierząt (read-through).
+
+    Wpisy są unieważniane przez operacje aktualizacji i usuwania. Odczyt
+    z bazy danych zapisuje wynik tylko wtedy, gdy w trakcie zapytania wersja
+    tabeli się nie zmieniła, więc równoległy zapis nie zostawi w pamięci
+    podręcznej nieaktualnych danych.
+
+    Zapisy wykonane w innych workerach unieważniają wpisy po dotarciu ich
+    zdarzeń z outboxa przez kanał (app.invalidation, WS_BACKPLANE inny niż memory).
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None) -> None:
+        """Inicjalizuje pamięć podręczną.
+
+        Args:
+            backend: Magazyn wpisów (domyślnie MemoryCacheBackend z ENTITY_CACHE_SIZE
+                i ENTITY_CACHE_TTL, tworzony przy pierwszym użyciu).
+        """
+        self._backend = backend
+
+    @property
+    def backend(self) -> CacheBackend:
+        """Magazyn wpisów pamięci podręcznej."""
+        if self._backend is None:
+            self._backend = MemoryCacheBackend(settings.ENTITY_CACHE_SIZE, settings.ENTITY_CACHE_TTL)
+        return self._backend
+
+    def use(self, backend: Optional[CacheBackend]) -> None:
+        """Podmienia magazyn wpisów (None - domyślny magazyn w pamięci procesu)."""
+        self._backend = backend
+
+    @staticmethod
+    def _key(table: str, entity_id: int) -> str:
+        return f"{table}:{entity_id}"
+
+    def get(self, table: str, entity_id: int) -> Optional[EntityData]:
+        """Zwraca zapisane dane zwierzęcia lub None."""
+        return self.backend.get(self._key(table, entity_id))
+
+    def set(self, table: str, entity_id: int, value: EntityData, version: int) -> None:
+        """Zapisuje dane zwierzęcia odczytane przy danej wersji tabeli.
+
+        Args:
+            table: Nazwa tabeli ("dogs" lub "cats").
+            entity_id: Identyfikator zwierzęcia.
+            value: Dane zwierzęcia.
+            version: Wersja tabeli odczytana przed zapytaniem do bazy danych.
+        """
+        if table_versions.get(table) == version:
+            self.backend.set(self._key(table, entity_id), value)
+
+    def invalidate(self, table: str, entity_ids: Iterable[int]) -> None:
+        """Usuwa wpisy zmienionych lub usuniętych zwierząt."""
+        self.backend.delete([self._key(table, entity_id) for entity_id in entity_ids])
+
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy."""
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Zwraca liczniki magazynu wpisów."""
+        return self.backend.stats()
+
+
+class ResultCache:
+    """Pamięć podręczna wyników zapytań analitycznych ważnych do następnego zapisu.
+
+    Wpis zapamiętuje wersje tabel, przy których wyznaczono wynik, i jest
+    traktowany jak brakujący po każdym zapisie do którejkolwiek z tabel.
+    Liczba wpisów (np. różnych filtrów) ograniczona jest polityką LRU.
+
+    Attributes:
+        tables: Tabele, od których zależą wyniki.
+        max_size: Maksymalna liczba wpisów.
+    """
+
+    def __init__(self, tables: Tuple[str, ...], max_size: int = 64) -> None:
+        """Inicjalizuje pustą pamięć podręczną.
+
+        Args:
+            tables: Tabele, od których zależą wyniki.
+            max_size: Maksymalna liczba wpisów.
+        """
+        self.tables = tables
+        self.max_size = max_size
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, ...], Any]]" = OrderedDict()
+
+    def versions(self) -> Tuple[int, ...]:
+        """Zwraca bieżące wersje tabel (odczytywane przed zapytaniem do bazy danych)."""
+        return tuple(table_versions.get(table) for table in self.tables)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Zwraca wynik zapisany przy bieżących wersjach tabel lub None."""
+        versions = self.versions()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != versions:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, versions: Tuple[int, ...]) -> None:
+        """Zapisuje wynik, jeśli w trakcie zapytania nie było zapisu do tabel.
+
+        Args:
+            key: Klucz wyniku (np. parametry zapytania).
+            value: Wynik zapytania.
+            versions: Wersje tabel odczytane przed zapytaniem do bazy danych.
+        """
+        if self.max_size <= 0 or self.versions() != versions:
+            return
+        with self._lock:
+            self._entries[key] = (versions, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Pamięć podręczna pojedynczych zwierząt współdzielona przez całą aplikację
+entity_cache: EntityCache = EntityCache()
+
+# Pamięć podręczna statystyk długości pobytu (ważna do następnego zapisu psów lub kotów)
+stay_stats_cache: ResultCache = ResultCache(("dogs", "cats"))
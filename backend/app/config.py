@@ -1,13 +1,88 @@
+from functools import lru_cache
+from typing import Any, Literal
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
-load_dotenv()
-
 class Settings(BaseSettings):
     """Klasa ustawień aplikacji.
-       Przechowuje adresy URL do baz danych produkcyjnej i testowej.
+       Przechowuje adresy URL do baz danych produkcyjnej i testowej
+       oraz parametry działania aplikacji.
     """
     DATABASE_URL: str
     TEST_DATABASE_URL: str | None = None
+    # Adres bazy danych dla sterownika asynchronicznego (domyślnie DATABASE_URL z asyncpg/aiosqlite)
+    ASYNC_DATABASE_URL: str | None = None
+    # Liczba stałych połączeń w puli (dla każdego silnika: synchronicznego i asynchronicznego)
+    DB_POOL_SIZE: int = 5
+    # Liczba dodatkowych połączeń tworzonych ponad DB_POOL_SIZE przy dużym obciążeniu
+    DB_MAX_OVERFLOW: int = 10
+    # Maksymalny czas (w sekundach) oczekiwania na wolne połączenie z puli
+    DB_POOL_TIMEOUT: float = 30.0
+    # Czas (w sekundach), po którym połączenie jest odnawiane (-1 - bez odnawiania)
+    DB_POOL_RECYCLE: int = 1800
+    # Czy sprawdzać połączenie (SELECT 1) przed każdym pobraniem z puli
+    DB_POOL_PRE_PING: bool = True
+    # Odstęp (w sekundach) między uzgodnieniami liczników zajętości z bazą danych
+    OCCUPANCY_RECONCILE_INTERVAL: float = 60.0
+    # Maksymalna liczba oczekujących wiadomości w kolejce jednego połączenia WebSocket
+    WS_SEND_QUEUE_SIZE: int = 100
+    # Zachowanie przy pełnej kolejce: odrzucenie najstarszej wiadomości lub rozłączenie klienta
+    WS_OVERFLOW_POLICY: Literal["drop_oldest", "disconnect"] = "drop_oldest"
+    # Kanał rozsyłania wiadomości WebSocket między workerami: w procesie, PostgreSQL LISTEN/NOTIFY lub gniazda Unix
+    WS_BACKPLANE: Literal["memory", "postgres", "unix"] = "memory"
+    # Nazwa kanału NOTIFY dla WS_BACKPLANE=postgres
+    WS_BACKPLANE_CHANNEL: str = "shelter_ws"
+    # Katalog gniazd workerów dla WS_BACKPLANE=unix (domyślnie w katalogu tymczasowym systemu)
+    WS_BACKPLANE_DIR: str | None = None
+    # Okno (w ms), w którym kolejne aktualizacje statystyk są łączone w jedną wiadomość
+    STATS_BROADCAST_WINDOW_MS: int = 100
+    # Maksymalne opóźnienie (w ms) wysyłki statystyk przy ciągłym napływie zmian
+    STATS_BROADCAST_MAX_LATENCY_MS: int = 500
+    # Maksymalna liczba zdarzeń odczytywanych z outboxa w jednej partii
+    OUTBOX_BATCH_SIZE: int = 100
+    # Odstęp (w sekundach) między sprawdzeniami outboxa, gdy nie ma powiadomień
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    # Czas (w sekundach), po którym nieprzekazana partia zdarzeń (błąd konsumenta, awaria workera) jest odczytywana ponownie
+    OUTBOX_RETRY_DELAY: float = 30.0
+    # Liczba prób przekazania zdarzenia, po której jest ono usuwane z outboxa
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    # Maksymalna liczba zwierząt w jednym żądaniu operacji masowej (/bulk)
+    BULK_MAX_ITEMS: int = 1000
+    # Liczba wierszy pobieranych naraz z kursora bazy danych podczas eksportu
+    EXPORT_BATCH_SIZE: int = 1000
+    # Liczba wierszy walidowanych i zapisywanych naraz podczas importu
+    IMPORT_CHUNK_SIZE: int = 1000
+    # Maksymalna liczba zwierząt w pamięci podręcznej odczytów pojedynczych zwierząt (0 - wyłączona)
+    ENTITY_CACHE_SIZE: int = 1024
+    # Czas życia (w sekundach) wpisu w pamięci podręcznej pojedynczych zwierząt
+    ENTITY_CACHE_TTL: float = 60.0
+    # Czy przed przyjęciem ruchu rozgrzewać pulę połączeń i wykonywać najczęstsze zapytania
+    STARTUP_WARMUP: bool = False
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Wczytuje ustawienia (z pliku .env i zmiennych środowiskowych) przy pierwszym użyciu.
+
+    Returns:
+        Instancja Settings współdzielona przez całą aplikację.
+    """
+    load_dotenv()
+    return Settings()
+
+
+class _LazySettings:
+    """Pośrednik do ustawień wczytywanych dopiero przy pierwszym odczycie.
+
+    Pozwala modułom importować `settings` bez wczytywania .env i walidacji
+    konfiguracji w chwili importu (wykonywane jest to w lifespan aplikacji).
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(get_settings(), name, value)
+
 
-settings = Settings()
+settings: Settings = _LazySettings()  # type: ignore[assignment]
@@ -0,0 +1,264 @@
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import Boolean, ColumnElement, Row, Select, String, and_, cast, func, literal_column, null, or_, select, true, union_all
+from sqlalchemy.orm import Session
+from .dog import dog_filter_clauses, dog_stats_select
+from .cat import cat_filter_clauses, cat_stats_select
+from .pagination import decode_animal_cursor, encode_animal_cursor
+from ..models.cat import Cat
+from ..models.dog import Dog
+from ..occupancy import STATUSES, counters
+from ..schemas.animal import Animal as AnimalSchema, AnimalFilter
+from ..schemas.cat import CatFilter
+from ..schemas.dog import DogFilter
+
+# Pola odpowiedzi (schemat Animal) w kolejności kodowania JSON
+ANIMAL_FIELDS: List[str] = list(AnimalSchema.model_fields)
+
+# Kolumny porządku listy całego schroniska (paginacja keyset)
+ANIMAL_ORDER: Tuple[str, ...] = ("admitted_date", "species", "id")
+
+# Gatunek -> (model ORM, schemat filtrów, funkcja budująca warunki filtrów)
+SPECIES: Dict[str, Tuple[Any, Any, Callable[[Any], List[ColumnElement[bool]]]]] = {
+    "dogs": (Dog, DogFilter, dog_filter_clauses),
+    "cats": (Cat, CatFilter, cat_filter_clauses),
+}
+
+
+def get_shelter_stats(db: Session) -> Dict[str, Dict[str, int]]:
+    """Generuje statystyki psów i kotów jednym zapytaniem do bazy danych.
+
+    Oba jednowierszowe agregaty (dla psów i kotów) są łączone w jednym
+    SELECT, więc całe schronisko kosztuje jeden round trip.
+
+    Args:
+        db: Sesja bazy danych.
+
+    Returns:
+        Słownik {"dogs": statystyki psów, "cats": statystyki kotów}, gdzie
+        statystyki mają ten sam format co wynik get_dog_stats / get_cat_stats.
+    """
+    dogs = dog_stats_select().subquery("dog_stats")
+    cats = cat_stats_select().subquery("cat_stats")
+    columns = [column.label(f"dogs__{column.name}") for column in dogs.c]
+    columns += [column.label(f"cats__{column.name}") for column in cats.c]
+
+    # oba podzapytania zwracają dokładnie jeden wiersz, więc łączymy je bez warunku
+    row = db.execute(select(*columns).select_from(dogs.join(cats, true()))).one()
+
+    stats: Dict[str, Dict[str, int]] = {"dogs": {}, "cats": {}}
+    for key, value in row._mapping.items():
+        species, name = key.split("__", 1)
+        stats[species][name] = value
+    return stats
+
+
+def refresh_occupancy(db: Session) -> None:
+    """Wczytuje liczniki zajętości schroniska z bazy danych.
+
+    Wykonuje jedno zapytanie get_shelter_stats. Używane przy starcie
+    aplikacji oraz przy okresowym uzgadnianiu liczników.
+
+    Args:
+        db: Sesja bazy danych.
+    """
+    counters.load(get_shelter_stats(db))
+
+
+def get_occupancy_stats(db: Session, species: str) -> Dict[str, int]:
+    """Zwraca statystyki gatunku z liczników w pamięci.
+
+    Zapytanie do bazy danych wykonywane jest tylko wtedy, gdy liczniki
+    nie zostały jeszcze wczytane.
+
+    Args:
+        db: Sesja bazy danych.
+        species: Gatunek ("dogs" lub "cats").
+
+    Returns:
+        Słownik statystyk w formacie get_dog_stats / get_cat_stats.
+    """
+    stats = counters.snapshot(species)
+    if stats is None:
+        refresh_occupancy(db)
+        stats = counters.snapshot(species)
+    return stats
+
+
+def _species_columns(species: str) -> Dict[str, ColumnElement[Any]]:
+    """Zwraca kolumny tabeli gatunku sprowadzone do wspólnych typów listy zwierząt.
+
+    Enumy rozmiaru i statusu są rzutowane na napisy (typy enum psów i kotów
+    w PostgreSQL nie są zgodne w UNION), a psy nie mają kolumny indoor_only.
+    """
+    model = SPECIES[species][0]
+    table = model.__table__
+    return {
+        # stała w SQL (nazwy gatunków pochodzą z SPECIES, nie od klienta)
+        "species": literal_column(f"'{species}'", String),
+        "id": table.c.id,
+        "name": table.c.name,
+        "size": cast(table.c.size, String),
+        "birth_date": table.c.birth_date,
+        "sex": table.c.sex,
+        "neutered": table.c.neutered,
+        "admitted_date": table.c.admitted_date,
+        "released_date": table.c.released_date,
+        "status": cast(table.c.status, String),
+        "indoor_only": table.c.indoor_only if "indoor_only" in table.c else cast(null(), Boolean),
+    }
+
+
+def _after_position(species: str, position: Tuple[date, str, int]) -> ColumnElement[bool]:
+    """Warunek keyset (admitted_date, species, id) > pozycja kursora dla tabeli jednego gatunku.
+
+    Gatunek jest stały w obrębie tabeli, więc warunek sprowadza się do
+    porównania (admitted_date, id) i korzysta z indeksu ix_*_admitted_date_id.
+    """
+    model = SPECIES[species][0]
+    last_date, last_species, last_id = position
+    if species > last_species:
+        return model.admitted_date >= last_date
+    if species < last_species:
+        return model.admitted_date > last_date
+    return or_(
+        model.admitted_date > last_date,
+        and_(model.admitted_date == last_date, model.id > last_id),
+    )
+
+
+def _species_select(
+    species: str,
+    fields: List[str],
+    filters: Optional[AnimalFilter],
+    position: Optional[Tuple[date, str, int]] = None,
+) -> Select:
+    """Buduje SELECT jednej tabeli (gałąź UNION ALL listy całego schroniska)."""
+    model, filter_schema, filter_clauses = SPECIES[species]
+    columns = _species_columns(species)
+    species_filters = None
+    if filters is not None:
+        species_filters = filter_schema(**filters.model_dump(exclude={"species"}, exclude_none=True))
+    stmt = select(*(columns[field].label(field) for field in fields)).where(*filter_clauses(species_filters))
+    if position is not None:
+        stmt = stmt.where(_after_position(species, position))
+    return stmt
+
+
+def _selected_species(filters: Optional[AnimalFilter]) -> List[str]:
+    """Zwraca gatunki objęte filtrami (domyślnie psy i koty)."""
+    if filters is not None and filters.species is not None:
+        return [filters.species]
+    return list(SPECIES)
+
+
+def animals_union(
+    fields: List[str],
+    filters: Optional[AnimalFilter] = None,
+    position: Optional[Tuple[date, str, int]] = None,
+) -> Any:
+    """Łączy tabele psów i kotów w jedno podzapytanie UNION ALL.
+
+    Filtry i warunek kursora stosowane są w każdej gałęzi osobno, więc
+    baza danych może użyć indeksów obu tabel.
+
+    Args:
+        fields: Pola schematu Animal wybierane w każdej gałęzi.
+        filters: Filtry listy (opcjonalne).
+        position: Pozycja z kursora poprzedniej strony (opcjonalne).
+
+    Returns:
+        Podzapytanie "animals" z kolumnami fields.
+    """
+    branches = [_species_select(species, fields, filters, position) for species in _selected_species(filters)]
+    stmt = branches[0] if len(branches) == 1 else union_all(*branches)
+    return stmt.subquery("animals")
+
+
+def get_animal_rows(
+    db: Session,
+    filters: Optional[AnimalFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Row], Optional[str]]:
+    """Pobiera listę psów i kotów jednym zapytaniem UNION ALL.
+
+    Zwierzęta są uporządkowane po dacie przyjęcia, gatunku i ID; gatunek
+    zwracany jest w kolumnie species.
+
+    Args:
+        db: Sesja bazy danych.
+        filters: Filtry wykonywane w zapytaniu SQL (opcjonalne).
+        limit: Maksymalna liczba zwierząt na stronie (None - wszystkie).
+        cursor: Kursor zwrócony z poprzedniej strony (opcjonalne).
+        fields: Pola schematu Animal w kolejności schematu (domyślnie ANIMAL_FIELDS).
+
+    Returns:
+        Krotka (lista wierszy, kursor następnej strony lub None). Wiersze zaczynają
+        się od kolumn fields; na końcu mogą zawierać kolumny porządku listy.
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    fields = fields or ANIMAL_FIELDS
+    position = None
+    if cursor:
+        position = decode_animal_cursor(cursor)
+        if position[1] not in SPECIES:
+            raise ValueError("Invalid cursor")
+
+    # kolumny porządku (i kursora) dołączane na końcu, jeśli nie wybrano ich w fields
+    animals = animals_union(fields + [field for field in ANIMAL_ORDER if field not in fields], filters, position)
+    stmt = select(animals).order_by(*(animals.c[field] for field in ANIMAL_ORDER))
+
+    if limit is None:
+        return list(db.execute(stmt).all()), None
+
+    # pobieramy jeden element więcej, żeby wiedzieć czy istnieje następna strona
+    rows = list(db.execute(stmt.limit(limit + 1)).all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_animal_cursor(last.admitted_date, last.species, last.id)
+
+
+def get_animal_stats(db: Session, filters: Optional[AnimalFilter] = None) -> Dict[str, Dict[str, int]]:
+    """Generuje statystyki psów i kotów spełniających filtry jednym zapytaniem.
+
+    Agreguje podzapytanie UNION ALL obu tabel z grupowaniem po gatunku.
+
+    Args:
+        db: Sesja bazy danych.
+        filters: Filtry (te same co dla listy całego schroniska, opcjonalne).
+
+    Returns:
+        Słownik {"dogs": ..., "cats": ..., "animals": ...} ze statystykami w formacie
+        get_dog_stats / get_cat_stats; "animals" sumuje oba gatunki
+        (all_animals_total). Gatunki wykluczone filtrem species są pomijane.
+    """
+    animals = animals_union(["species", "status"], filters)
+    aggregates = [
+        func.count().filter(animals.c.status == status).label(status)
+        for status in STATUSES
+    ]
+    rows = db.execute(select(animals.c.species, *aggregates).group_by(animals.c.species)).all()
+    counts = {row.species: row._mapping for row in rows}
+
+    per_species = {
+        species: {status: counts[species][status] if species in counts else 0 for status in STATUSES}
+        for species in _selected_species(filters)
+    }
+    per_species["animals"] = {
+        status: sum(values[status] for values in per_species.values()) for status in STATUSES
+    }
+    return {
+        species: {
+            "current_in_shelter": values["arrived"],
+            "adopted_total": values["adopted"],
+            "returned_total": values["returned"],
+            f"all_{species}_total": sum(values.values()),
+        }
+        for species, values in per_species.items()
+    }
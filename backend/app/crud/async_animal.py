@@ -0,0 +1,55 @@
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import animal as crud, length_of_stay, occupancy
+from ..schemas.animal import AnimalFilter
+
+
+async def get_shelter_stats(db: AsyncSession) -> Dict[str, Dict[str, int]]:
+    """Asynchroniczna wersja get_shelter_stats (statystyki psów i kotów jednym zapytaniem)."""
+    return await db.run_sync(crud.get_shelter_stats)
+
+
+async def refresh_occupancy(db: AsyncSession) -> None:
+    """Asynchroniczna wersja refresh_occupancy (wczytanie liczników zajętości z bazy danych)."""
+    await db.run_sync(crud.refresh_occupancy)
+
+
+async def get_occupancy_stats(db: AsyncSession, species: str) -> Dict[str, int]:
+    """Asynchroniczna wersja get_occupancy_stats (statystyki z liczników w pamięci)."""
+    return await db.run_sync(crud.get_occupancy_stats, species)
+
+
+async def get_animal_rows(
+    db: AsyncSession,
+    filters: Optional[AnimalFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Row], Optional[str]]:
+    """Asynchroniczna wersja get_animal_rows (psy i koty jednym zapytaniem UNION ALL).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    return await db.run_sync(crud.get_animal_rows, filters, limit, cursor, fields)
+
+
+async def get_animal_stats(db: AsyncSession, filters: Optional[AnimalFilter] = None) -> Dict[str, Dict[str, int]]:
+    """Asynchroniczna wersja get_animal_stats (statystyki psów i kotów spełniających filtry)."""
+    return await db.run_sync(crud.get_animal_stats, filters)
+
+
+async def get_occupancy_history(db: AsyncSession, date_from: date, date_to: date) -> List[Dict[str, Any]]:
+    """Asynchroniczna wersja get_occupancy_history (zajętość w kolejnych dniach z zestawienia dziennego).
+
+    Raises:
+        ValueError: Jeśli zakres jest pusty lub zbyt długi.
+    """
+    return await db.run_sync(occupancy.get_occupancy_history, date_from, date_to)
+
+
+async def get_stay_stats(db: AsyncSession, filters: Optional[AnimalFilter] = None) -> Dict[str, Any]:
+    """Asynchroniczna wersja get_stay_stats (trafienie w pamięci podręcznej nie wymaga bazy danych)."""
+    return await db.run_sync(length_of_stay.get_stay_stats, filters)
@@ -0,0 +1,99 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import cat as crud
+from ..cache import EntityData, entity_cache
+from ..models.cat import Cat
+from ..schemas.cat import CatCreate, CatUpdate, CatFilter, CatBulkUpdate
+
+# Asynchroniczne wersje operacji CRUD na kotach.
+# Zapytania wykonywane są przez AsyncSession.run_sync: kod z crud/cat.py działa
+# w greenlecie w pętli zdarzeń, a operacje I/O obsługuje sterownik asynchroniczny,
+# więc endpointy nie zajmują wątków z puli Starlette.
+
+
+async def get_cats(
+    db: AsyncSession,
+    filters: Optional[CatFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Cat], Optional[str]]:
+    """Asynchroniczna wersja get_cats (lista kotów z filtrami i paginacją).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    return await db.run_sync(crud.get_cats, filters, limit, cursor)
+
+
+async def get_cat_rows(
+    db: AsyncSession,
+    filters: Optional[CatFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Row], Optional[str]]:
+    """Asynchroniczna wersja get_cat_rows (lista kotów jako wiersze Core).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    return await db.run_sync(crud.get_cat_rows, filters, limit, cursor, fields)
+
+
+async def search_cat_rows(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    fields: Optional[List[str]] = None,
+) -> List[Row]:
+    """Asynchroniczna wersja search_cat_rows (wyszukiwanie po imieniu)."""
+    return await db.run_sync(crud.search_cat_rows, q, limit, fields)
+
+
+async def get_cat(db: AsyncSession, cat_id: int) -> Optional[Cat]:
+    """Asynchroniczna wersja get_cat."""
+    return await db.run_sync(crud.get_cat, cat_id)
+
+
+async def get_cat_data(db: AsyncSession, cat_id: int) -> Optional[EntityData]:
+    """Asynchroniczna wersja get_cat_data (trafienie w pamięci podręcznej nie wymaga bazy danych)."""
+    cached = entity_cache.get("cats", cat_id)
+    if cached is not None:
+        return cached
+    return await db.run_sync(crud.load_cat_data, cat_id)
+
+
+async def create_cat(db: AsyncSession, cat: CatCreate) -> Cat:
+    """Asynchroniczna wersja create_cat."""
+    return await db.run_sync(crud.create_cat, cat)
+
+
+async def update_cat(db: AsyncSession, cat_id: int, cat: CatUpdate) -> Optional[Cat]:
+    """Asynchroniczna wersja update_cat."""
+    return await db.run_sync(crud.update_cat, cat_id, cat)
+
+
+async def delete_cat(db: AsyncSession, cat_id: int) -> bool:
+    """Asynchroniczna wersja delete_cat."""
+    return await db.run_sync(crud.delete_cat, cat_id)
+
+
+async def create_cats(db: AsyncSession, cats: List[CatCreate]) -> List[Cat]:
+    """Asynchroniczna wersja create_cats."""
+    return await db.run_sync(crud.create_cats, cats)
+
+
+async def update_cats(db: AsyncSession, cats: List[CatBulkUpdate]) -> Dict[int, Cat]:
+    """Asynchroniczna wersja update_cats."""
+    return await db.run_sync(crud.update_cats, cats)
+
+
+async def delete_cats(db: AsyncSession, cat_ids: List[int]) -> List[int]:
+    """Asynchroniczna wersja delete_cats."""
+    return await db.run_sync(crud.delete_cats, cat_ids)
+
+
+async def get_cat_stats(db: AsyncSession) -> Dict[str, int]:
+    """Asynchroniczna wersja get_cat_stats."""
+    return await db.run_sync(crud.get_cat_stats)
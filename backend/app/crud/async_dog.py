@@ -0,0 +1,99 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import dog as crud
+from ..cache import EntityData, entity_cache
+from ..models.dog import Dog
+from ..schemas.dog import DogCreate, DogUpdate, DogFilter, DogBulkUpdate
+
+# Asynchroniczne wersje operacji CRUD na psach.
+# Zapytania wykonywane są przez AsyncSession.run_sync: kod z crud/dog.py działa
+# w greenlecie w pętli zdarzeń, a operacje I/O obsługuje sterownik asynchroniczny,
+# więc endpointy nie zajmują wątków z puli Starlette.
+
+
+async def get_dogs(
+    db: AsyncSession,
+    filters: Optional[DogFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dog], Optional[str]]:
+    """Asynchroniczna wersja get_dogs (lista psów z filtrami i paginacją).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    return await db.run_sync(crud.get_dogs, filters, limit, cursor)
+
+
+async def get_dog_rows(
+    db: AsyncSession,
+    filters: Optional[DogFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Row], Optional[str]]:
+    """Asynchroniczna wersja get_dog_rows (lista psów jako wiersze Core).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    return await db.run_sync(crud.get_dog_rows, filters, limit, cursor, fields)
+
+
+async def search_dog_rows(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    fields: Optional[List[str]] = None,
+) -> List[Row]:
+    """Asynchroniczna wersja search_dog_rows (wyszukiwanie po imieniu)."""
+    return await db.run_sync(crud.search_dog_rows, q, limit, fields)
+
+
+async def get_dog(db: AsyncSession, dog_id: int) -> Optional[Dog]:
+    """Asynchroniczna wersja get_dog."""
+    return await db.run_sync(crud.get_dog, dog_id)
+
+
+async def get_dog_data(db: AsyncSession, dog_id: int) -> Optional[EntityData]:
+    """Asynchroniczna wersja get_dog_data (trafienie w pamięci podręcznej nie wymaga bazy danych)."""
+    cached = entity_cache.get("dogs", dog_id)
+    if cached is not None:
+        return cached
+    return await db.run_sync(crud.load_dog_data, dog_id)
+
+
+async def create_dog(db: AsyncSession, dog: DogCreate) -> Dog:
+    """Asynchroniczna wersja create_dog."""
+    return await db.run_sync(crud.create_dog, dog)
+
+
+async def update_dog(db: AsyncSession, dog_id: int, dog: DogUpdate) -> Optional[Dog]:
+    """Asynchroniczna wersja update_dog."""
+    return await db.run_sync(crud.update_dog, dog_id, dog)
+
+
+async def delete_dog(db: AsyncSession, dog_id: int) -> bool:
+    """Asynchroniczna wersja delete_dog."""
+    return await db.run_sync(crud.delete_dog, dog_id)
+
+
+async def create_dogs(db: AsyncSession, dogs: List[DogCreate]) -> List[Dog]:
+    """Asynchroniczna wersja create_dogs."""
+    return await db.run_sync(crud.create_dogs, dogs)
+
+
+async def update_dogs(db: AsyncSession, dogs: List[DogBulkUpdate]) -> Dict[int, Dog]:
+    """Asynchroniczna wersja update_dogs."""
+    return await db.run_sync(crud.update_dogs, dogs)
+
+
+async def delete_dogs(db: AsyncSession, dog_ids: List[int]) -> List[int]:
+    """Asynchroniczna wersja delete_dogs."""
+    return await db.run_sync(crud.delete_dogs, dog_ids)
+
+
+async def get_dog_stats(db: AsyncSession) -> Dict[str, int]:
+    """Asynchroniczna wersja get_dog_stats."""
+    return await db.run_sync(crud.get_dog_stats)
@@ -1,22 +1,159 @@
-from typing import Optional, List, Dict
-from sqlalchemy import func
+from typing import Optional, List, Dict, Iterator, Tuple
+from sqlalchemy import ColumnElement, Row, RowMapping, delete, func, insert, select, Select
 from sqlalchemy.orm import Session
 from .. import models
-from ..schemas.cat import CatCreate, CatUpdate
+from ..config import settings
+from ..schemas.cat import Cat as CatSchema, CatCreate, CatUpdate, CatFilter, CatBulkUpdate
 from ..models.cat import Cat, CatStatus
+from .pagination import paginate, paginate_rows
+from .search import search_rows
+from .occupancy import record_stay_changes, stay_of
+from ..occupancy import counters
+from ..versions import table_versions
+from ..cache import EntityData, entity_cache
+from ..events import AnimalCreated, AnimalUpdated, AnimalDeleted, dispatcher, record_event, record_events, snapshot_animal
 
 
-def get_cats(db: Session) -> List[Cat]:
+# Pola odpowiedzi (schemat Cat) w kolejności kodowania JSON
+CAT_FIELDS: List[str] = list(CatSchema.model_fields)
+
+
+def cat_filter_clauses(filters: Optional[CatFilter]) -> List[ColumnElement[bool]]:
+    """Zamienia filtry listy kotów na warunki SQL.
+
+    Args:
+        filters: Filtry listy (opcjonalne).
+
+    Returns:
+        Lista warunków do użycia w klauzuli WHERE (pusta, jeśli brak filtrów).
+    """
+    clauses: List[ColumnElement[bool]] = []
+    if filters is None:
+        return clauses
+    if filters.status is not None:
+        clauses.append(Cat.status == filters.status)
+    if filters.size is not None:
+        clauses.append(Cat.size == filters.size)
+    if filters.neutered is not None:
+        clauses.append(Cat.neutered == filters.neutered)
+    if filters.indoor_only is not None:
+        clauses.append(Cat.indoor_only == filters.indoor_only)
+    if filters.admitted_from is not None:
+        clauses.append(Cat.admitted_date >= filters.admitted_from)
+    if filters.admitted_to is not None:
+        clauses.append(Cat.admitted_date <= filters.admitted_to)
+    if filters.released_from is not None:
+        clauses.append(Cat.released_date >= filters.released_from)
+    if filters.released_to is not None:
+        clauses.append(Cat.released_date <= filters.released_to)
+    return clauses
+
+
+def get_cats(
+    db: Session,
+    filters: Optional[CatFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Cat], Optional[str]]:
     """Pobiera listę kotów z bazy danych.
     
     Args:
         db: Sesja bazy danych.
+        filters: Filtry wykonywane w zapytaniu SQL (opcjonalne).
+        limit: Maksymalna liczba kotów na stronie (None - wszystkie).
+        cursor: Kursor zwrócony z poprzedniej strony (opcjonalne).
         
     Returns:
-        Lista obiektów Cat.
+        Krotka (lista obiektów Cat, kursor następnej strony lub None).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    query = db.query(Cat).filter(*cat_filter_clauses(filters))
+    return paginate(query, Cat, limit, cursor)
+
+
+def get_cat_rows(
+    db: Session,
+    filters: Optional[CatFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Row], Optional[str]]:
+    """Pobiera listę kotów jako wiersze Core (bez obiektów ORM).
+
+    Wybiera tylko kolumny wybranych pól schematu Cat, więc wiersze można
+    zakodować do JSON bez walidacji Pydantic (serialization.encode_rows).
+
+    Args:
+        db: Sesja bazy danych.
+        filters: Filtry wykonywane w zapytaniu SQL (opcjonalne).
+        limit: Maksymalna liczba kotów na stronie (None - wszystkie).
+        cursor: Kursor zwrócony z poprzedniej strony (opcjonalne).
+        fields: Pola schematu Cat w kolejności schematu (domyślnie CAT_FIELDS).
+
+    Returns:
+        Krotka (lista wierszy, kursor następnej strony lub None). Wiersze zaczynają
+        się od kolumn fields; przy stronicowaniu na końcu mogą zawierać kolumny kursora.
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    fields = fields or CAT_FIELDS
+    columns = [Cat.__table__.c[field] for field in fields]
+    if limit is not None:
+        # kolumny potrzebne do wyznaczenia kursora następnej strony
+        columns += [Cat.__table__.c[field] for field in ("admitted_date", "id") if field not in fields]
+    stmt = select(*columns).where(*cat_filter_clauses(filters))
+    return paginate_rows(db, stmt, Cat, limit, cursor)
+
+
+def search_cat_rows(
+    db: Session,
+    q: str,
+    limit: int,
+    fields: Optional[List[str]] = None,
+) -> List[Row]:
+    """Wyszukuje koty po imieniu (prefiks, podciąg, literówki) z użyciem indeksu wyszukiwania.
+
+    Args:
+        db: Sesja bazy danych.
+        q: Szukany napis.
+        limit: Maksymalna liczba wyników.
+        fields: Pola schematu Cat w kolejności schematu (domyślnie CAT_FIELDS).
+
+    Returns:
+        Lista wierszy uporządkowana według trafności (szczegóły w search.search_rows).
+    """
+    return search_rows(db, Cat, q, limit, fields or CAT_FIELDS)
+
+
+def iter_cat_batches(
+    db: Session,
+    filters: Optional[CatFilter] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator[List[RowMapping]]:
+    """Odczytuje kotów partiami przez kursor po stronie serwera.
+
+    W przeciwieństwie do get_cats nie tworzy obiektów ORM ani nie wczytuje
+    całej tabeli do pamięci - wiersze pobierane są z bazy po batch_size.
+
+    Args:
+        db: Sesja bazy danych.
+        filters: Filtry wykonywane w zapytaniu SQL (opcjonalne).
+        batch_size: Liczba wierszy pobieranych z kursora naraz (domyślnie EXPORT_BATCH_SIZE).
+
+    Yields:
+        Kolejne partie wierszy (mapowania kolumna -> wartość) w kolejności
+        daty przyjęcia i ID.
     """
-    query = db.query(Cat)
-    return query.all()
+    stmt = (
+        select(*Cat.__table__.columns)
+        .where(*cat_filter_clauses(filters))
+        .order_by(Cat.admitted_date, Cat.id)
+        .execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+    )
+    yield from db.execute(stmt).mappings().partitions()
 
 
 def get_cat(db: Session, cat_id: int) -> Optional[Cat]:
@@ -31,6 +168,43 @@ def get_cat(db: Session, cat_id: int) -> Optional[Cat]:
     """
     return db.query(models.cat.Cat).filter(models.cat.Cat.id == cat_id).first()
 
+def load_cat_data(db: Session, cat_id: int) -> Optional[EntityData]:
+    """Odczytuje kota z bazy danych i zapisuje go w pamięci podręcznej.
+
+    Args:
+        db: Sesja bazy danych.
+        cat_id: Identyfikator kota.
+
+    Returns:
+        Dane kota zgodne ze schematem Cat (wartości JSON) lub None, jeśli nie znaleziono.
+    """
+    version = table_versions.get("cats")
+    db_cat = get_cat(db, cat_id)
+    if db_cat is None:
+        return None
+    data = CatSchema.model_validate(db_cat).model_dump(mode="json")
+    entity_cache.set("cats", cat_id, data, version)
+    return data
+
+def get_cat_data(db: Session, cat_id: int) -> Optional[EntityData]:
+    """Pobiera dane pojedynczego kota przez pamięć podręczną (read-through).
+
+    Args:
+        db: Sesja bazy danych.
+        cat_id: Identyfikator kota.
+
+    Returns:
+        Dane kota zgodne ze schematem Cat lub None, jeśli nie znaleziono.
+
+    Note:
+        Wpisy unieważniane są przez update_cat, delete_cat, update_cats i delete_cats;
+        nieistniejące zwierzęta nie są zapamiętywane.
+    """
+    cached = entity_cache.get("cats", cat_id)
+    if cached is not None:
+        return cached
+    return load_cat_data(db, cat_id)
+
 
 def create_cat(db: Session, cat: CatCreate) -> Cat:
     """Tworzy nowego kota w bazie danych.
@@ -44,11 +218,19 @@ def create_cat(db: Session, cat: CatCreate) -> Cat:
         
     Note:
         Automatycznie commituje zmiany do bazy danych.
+        W tej samej transakcji zapisuje zdarzenie domenowe w outboxie.
+        Aktualizuje dzienne zestawienie zajętości (occupancy_daily) w tej samej transakcji.
+        Po commicie aktualizuje liczniki zajętości schroniska w pamięci.
     """
     db_cat = models.cat.Cat(**cat.model_dump())
     db.add(db_cat)
+    db.flush()
+    record_event(db, AnimalCreated("cats", db_cat.id, snapshot_animal(db_cat)))
+    record_stay_changes(db, "cats", [(None, stay_of(db_cat))])
     db.commit()
     db.refresh(db_cat)
+    counters.apply("cats", None, db_cat.status)
+    dispatcher.notify()
     return db_cat
 
 
@@ -66,18 +248,40 @@ def update_cat(db: Session, cat_id: int, cat: CatUpdate) -> Optional[Cat]:
     Note:
         Automatycznie commituje zmiany do bazy danych.
         Wykorzystuje partial update - aktualizuje tylko podane pola.
+        W tej samej transakcji zapisuje zdarzenie AnimalUpdated ze zmienionymi polami
+        (aktualizacja bez zmian nie zapisuje zdarzenia ani nie zmienia wersji tabeli).
+        Aktualizuje dzienne zestawienie zajętości (occupancy_daily) w tej samej transakcji.
+        Po commicie aktualizuje liczniki zajętości o ewentualną zmianę statusu.
+        Usuwa kota z pamięci podręcznej odczytów (entity_cache).
     """
     db_cat = get_cat(db, cat_id)
     if not db_cat:
         return None
         
+    old_status = db_cat.status
+    old_stay = stay_of(db_cat)
+    before = snapshot_animal(db_cat)
     update_data = cat.model_dump(exclude_unset=True)
 
     for key, value in update_data.items():
         setattr(db_cat, key, value)
 
+    after = snapshot_animal(db_cat)
+    changed = [key for key in after if after[key] != before[key]]
+    if not changed:
+        # nic się nie zmieniło - bez zdarzenia, nowej wersji tabeli i unieważniania
+        return db_cat
+
+    record_event(db, AnimalUpdated("cats", db_cat.id, {
+        "old": {key: before[key] for key in changed},
+        "new": {key: after[key] for key in changed},
+    }))
+    record_stay_changes(db, "cats", [(old_stay, stay_of(db_cat))])
     db.commit()
+    entity_cache.invalidate("cats", [cat_id])
     db.refresh(db_cat)
+    counters.apply("cats", old_status, db_cat.status)
+    dispatcher.notify()
     return db_cat
 
 
@@ -93,15 +297,174 @@ def delete_cat(db: Session, cat_id: int) -> bool:
         
     Note:
         Automatycznie commituje zmiany do bazy danych.
+        W tej samej transakcji zapisuje zdarzenie domenowe w outboxie.
+        Aktualizuje dzienne zestawienie zajętości (occupancy_daily) w tej samej transakcji.
+        Po commicie aktualizuje liczniki zajętości schroniska w pamięci.
+        Usuwa kota z pamięci podręcznej odczytów (entity_cache).
     """
     db_cat = get_cat(db, cat_id)
     if db_cat:
+        old_status = db_cat.status
+        record_event(db, AnimalDeleted("cats", db_cat.id, snapshot_animal(db_cat)))
+        record_stay_changes(db, "cats", [(stay_of(db_cat), None)])
         db.delete(db_cat)
         db.commit()
+        entity_cache.invalidate("cats", [cat_id])
+        counters.apply("cats", old_status, None)
+        dispatcher.notify()
         return True
     return False
 
 
+def create_cats(db: Session, cats: List[CatCreate]) -> List[Cat]:
+    """Tworzy wiele kotów jedną wielowierszową instrukcją INSERT.
+
+    Args:
+        db: Sesja bazy danych.
+        cats: Dane nowych kotów zgodne ze schematem CatCreate.
+
+    Returns:
+        Lista utworzonych obiektów Cat w kolejności danych wejściowych.
+
+    Note:
+        Wszystkie koty zapisywane są w jednej transakcji razem ze zdarzeniami w outboxie.
+        Dispatcher zdarzeń jest powiadamiany raz dla całej partii.
+    """
+    if not cats:
+        return []
+
+    created = db.scalars(
+        insert(Cat).returning(Cat, sort_by_parameter_order=True),
+        [cat.model_dump() for cat in cats],
+    ).all()
+    record_events(db, [AnimalCreated("cats", db_cat.id, snapshot_animal(db_cat)) for db_cat in created])
+    record_stay_changes(db, "cats", [(None, stay_of(db_cat)) for db_cat in created])
+    db.commit()
+
+    ids = [db_cat.id for db_cat in created]
+    loaded = _get_cats_by_ids(db, ids)
+    for db_cat in loaded.values():
+        counters.apply("cats", None, db_cat.status)
+    dispatcher.notify()
+    return [loaded[cat_id] for cat_id in ids]
+
+
+def update_cats(db: Session, cats: List[CatBulkUpdate]) -> Dict[int, Cat]:
+    """Aktualizuje wiele kotów w jednej transakcji.
+
+    Koty wczytywane są jednym zapytaniem, a zmiany zapisywane przy commicie
+    w partiach (executemany) grupowanych po zestawie zmienionych kolumn.
+
+    Args:
+        db: Sesja bazy danych.
+        cats: Dane do aktualizacji z identyfikatorami kotów (partial update).
+
+    Returns:
+        Słownik id -> zaktualizowany obiekt Cat (tylko dla znalezionych kotów).
+
+    Note:
+        Zdarzenia AnimalUpdated zapisywane są w tej samej transakcji.
+        Dispatcher zdarzeń jest powiadamiany raz dla całej partii.
+        Zmienione koty usuwane są z pamięci podręcznej odczytów (entity_cache).
+    """
+    found = _get_cats_by_ids(db, [cat.id for cat in cats])
+    before = {cat_id: snapshot_animal(db_cat) for cat_id, db_cat in found.items()}
+    old_statuses = {cat_id: db_cat.status for cat_id, db_cat in found.items()}
+    old_stays = {cat_id: stay_of(db_cat) for cat_id, db_cat in found.items()}
+
+    for cat in cats:
+        db_cat = found.get(cat.id)
+        if db_cat is None:
+            continue
+        for key, value in cat.model_dump(exclude_unset=True, exclude={"id"}).items():
+            setattr(db_cat, key, value)
+
+    events = []
+    for cat_id, db_cat in found.items():
+        after = snapshot_animal(db_cat)
+        changed = [key for key in after if after[key] != before[cat_id][key]]
+        if changed:
+            events.append(AnimalUpdated("cats", cat_id, {
+                "old": {key: before[cat_id][key] for key in changed},
+                "new": {key: after[key] for key in changed},
+            }))
+    record_stay_changes(db, "cats", [(old_stays[cat_id], stay_of(db_cat)) for cat_id, db_cat in found.items()])
+    db.flush()
+    record_events(db, events)
+    db.commit()
+    if events:
+        entity_cache.invalidate("cats", [event.animal_id for event in events])
+
+    loaded = _get_cats_by_ids(db, list(found))
+    for cat_id, db_cat in loaded.items():
+        counters.apply("cats", old_statuses[cat_id], db_cat.status)
+    if events:
+        dispatcher.notify()
+    return loaded
+
+
+def delete_cats(db: Session, cat_ids: List[int]) -> List[int]:
+    """Usuwa wiele kotów jedną instrukcją DELETE.
+
+    Args:
+        db: Sesja bazy danych.
+        cat_ids: Identyfikatory kotów do usunięcia.
+
+    Returns:
+        Lista identyfikatorów faktycznie usuniętych kotów (w kolejności z cat_ids).
+
+    Note:
+        Zdarzenia AnimalDeleted zapisywane są w tej samej transakcji.
+        Dispatcher zdarzeń jest powiadamiany raz dla całej partii.
+        Usunięte koty usuwane są z pamięci podręcznej odczytów (entity_cache).
+    """
+    found = _get_cats_by_ids(db, cat_ids)
+    if not found:
+        return []
+
+    old_statuses = {cat_id: db_cat.status for cat_id, db_cat in found.items()}
+    record_events(db, [AnimalDeleted("cats", cat_id, snapshot_animal(db_cat)) for cat_id, db_cat in found.items()])
+    record_stay_changes(db, "cats", [(stay_of(db_cat), None) for db_cat in found.values()])
+    db.execute(delete(Cat).where(Cat.id.in_(list(found))))
+    db.commit()
+    entity_cache.invalidate("cats", found)
+
+    for old_status in old_statuses.values():
+        counters.apply("cats", old_status, None)
+    dispatcher.notify()
+    return list(found)
+
+
+def _get_cats_by_ids(db: Session, cat_ids: List[int]) -> Dict[int, Cat]:
+    """Wczytuje koty o podanych identyfikatorach jednym zapytaniem.
+
+    Słownik zachowuje kolejność identyfikatorów z wejścia (bez powtórzeń),
+    więc zdarzenia i wyniki operacji masowych mają kolejność żądania.
+    """
+    if not cat_ids:
+        return {}
+    loaded = {db_cat.id: db_cat for db_cat in db.query(Cat).filter(Cat.id.in_(set(cat_ids)))}
+    return {cat_id: loaded[cat_id] for cat_id in dict.fromkeys(cat_ids) if cat_id in loaded}
+
+
+def cat_stats_select() -> Select:
+    """Buduje zapytanie liczące statystyki kotów w jednym przebiegu po tabeli.
+
+    Zamiast osobnego COUNT dla każdego statusu używa agregatów z klauzulą
+    FILTER, dzięki czemu wszystkie liczniki wyznaczane są jednym zapytaniem.
+
+    Returns:
+        Zapytanie SELECT zwracające jeden wiersz z kolumnami current_in_shelter,
+        adopted_total, returned_total i all_cats_total.
+    """
+    return select(
+        func.count(Cat.id).filter(Cat.status == CatStatus.arrived).label("current_in_shelter"),
+        func.count(Cat.id).filter(Cat.status == CatStatus.adopted).label("adopted_total"),
+        func.count(Cat.id).filter(Cat.status == CatStatus.returned).label("returned_total"),
+        func.count(Cat.id).label("all_cats_total"),
+    )
+
+
 def get_cat_stats(db: Session) -> Dict[str, int]:
     """Generuje statystyki wszystkich kotów w systemie.
     
@@ -118,14 +481,5 @@ def get_cat_stats(db: Session) -> Dict[str, int]:
     Note:
         Statystyki są wykorzystywane do aktualizacji real-time przez WebSocket.
     """
-    current = db.query(func.count(Cat.id)).filter(Cat.status == CatStatus.arrived).scalar()
-    adopted = db.query(func.count(Cat.id)).filter(Cat.status == CatStatus.adopted).scalar()
-    returned = db.query(func.count(Cat.id)).filter(Cat.status == CatStatus.returned).scalar()
-    total = db.query(func.count(Cat.id)).scalar()
-
-    return {
-        "current_in_shelter": current,
-        "adopted_total": adopted,
-        "returned_total": returned,
-        "all_cats_total": total
-    }
+    row = db.execute(cat_stats_select()).one()
+    return dict(row._mapping)
@@ -1,24 +1,157 @@
-from typing import Optional, List, Dict
-from sqlalchemy import func
+from typing import Optional, List, Dict, Iterator, Tuple
+from sqlalchemy import ColumnElement, Row, RowMapping, delete, func, insert, select, Select
 from sqlalchemy.orm import Session
 from .. import models
-from ..schemas.dog import DogCreate, DogUpdate
+from ..config import settings
+from ..schemas.dog import Dog as DogSchema, DogCreate, DogUpdate, DogFilter, DogBulkUpdate
 from ..models.dog import Dog, DogStatus
+from .pagination import paginate, paginate_rows
+from .search import search_rows
+from .occupancy import record_stay_changes, stay_of
+from ..occupancy import counters
+from ..versions import table_versions
+from ..cache import EntityData, entity_cache
+from ..events import AnimalCreated, AnimalUpdated, AnimalDeleted, dispatcher, record_event, record_events, snapshot_animal
+
+
+# Pola odpowiedzi (schemat Dog) w kolejności kodowania JSON
+DOG_FIELDS: List[str] = list(DogSchema.model_fields)
+
+
+def dog_filter_clauses(filters: Optional[DogFilter]) -> List[ColumnElement[bool]]:
+    """Zamienia filtry listy psów na warunki SQL.
+
+    Args:
+        filters: Filtry listy (opcjonalne).
+
+    Returns:
+        Lista warunków do użycia w klauzuli WHERE (pusta, jeśli brak filtrów).
+    """
+    clauses: List[ColumnElement[bool]] = []
+    if filters is None:
+        return clauses
+    if filters.status is not None:
+        clauses.append(Dog.status == filters.status)
+    if filters.size is not None:
+        clauses.append(Dog.size == filters.size)
+    if filters.neutered is not None:
+        clauses.append(Dog.neutered == filters.neutered)
+    if filters.admitted_from is not None:
+        clauses.append(Dog.admitted_date >= filters.admitted_from)
+    if filters.admitted_to is not None:
+        clauses.append(Dog.admitted_date <= filters.admitted_to)
+    if filters.released_from is not None:
+        clauses.append(Dog.released_date >= filters.released_from)
+    if filters.released_to is not None:
+        clauses.append(Dog.released_date <= filters.released_to)
+    return clauses
+
 
 def get_dogs(
     db: Session,
-) -> List[Dog]:
+    filters: Optional[DogFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dog], Optional[str]]:
     """Pobiera listę psów z bazy danych.
     
     Args:
         db: Sesja bazy danych.
+        filters: Filtry wykonywane w zapytaniu SQL (opcjonalne).
+        limit: Maksymalna liczba psów na stronie (None - wszystkie).
+        cursor: Kursor zwrócony z poprzedniej strony (opcjonalne).
         
     Returns:
-        Lista obiektów Dog.
+        Krotka (lista obiektów Dog, kursor następnej strony lub None).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
     """
-    query = db.query(Dog)
+    query = db.query(Dog).filter(*dog_filter_clauses(filters))
+    return paginate(query, Dog, limit, cursor)
 
-    return query.all()
+
+def get_dog_rows(
+    db: Session,
+    filters: Optional[DogFilter] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Row], Optional[str]]:
+    """Pobiera listę psów jako wiersze Core (bez obiektów ORM).
+
+    Wybiera tylko kolumny wybranych pól schematu Dog, więc wiersze można
+    zakodować do JSON bez walidacji Pydantic (serialization.encode_rows).
+
+    Args:
+        db: Sesja bazy danych.
+        filters: Filtry wykonywane w zapytaniu SQL (opcjonalne).
+        limit: Maksymalna liczba psów na stronie (None - wszystkie).
+        cursor: Kursor zwrócony z poprzedniej strony (opcjonalne).
+        fields: Pola schematu Dog w kolejności schematu (domyślnie DOG_FIELDS).
+
+    Returns:
+        Krotka (lista wierszy, kursor następnej strony lub None). Wiersze zaczynają
+        się od kolumn fields; przy stronicowaniu na końcu mogą zawierać kolumny kursora.
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    fields = fields or DOG_FIELDS
+    columns = [Dog.__table__.c[field] for field in fields]
+    if limit is not None:
+        # kolumny potrzebne do wyznaczenia kursora następnej strony
+        columns += [Dog.__table__.c[field] for field in ("admitted_date", "id") if field not in fields]
+    stmt = select(*columns).where(*dog_filter_clauses(filters))
+    return paginate_rows(db, stmt, Dog, limit, cursor)
+
+
+def search_dog_rows(
+    db: Session,
+    q: str,
+    limit: int,
+    fields: Optional[List[str]] = None,
+) -> List[Row]:
+    """Wyszukuje psy po imieniu (prefiks, podciąg, literówki) z użyciem indeksu wyszukiwania.
+
+    Args:
+        db: Sesja bazy danych.
+        q: Szukany napis.
+        limit: Maksymalna liczba wyników.
+        fields: Pola schematu Dog w kolejności schematu (domyślnie DOG_FIELDS).
+
+    Returns:
+        Lista wierszy uporządkowana według trafności (szczegóły w search.search_rows).
+    """
+    return search_rows(db, Dog, q, limit, fields or DOG_FIELDS)
+
+
+def iter_dog_batches(
+    db: Session,
+    filters: Optional[DogFilter] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator[List[RowMapping]]:
+    """Odczytuje psów partiami przez kursor po stronie serwera.
+
+    W przeciwieństwie do get_dogs nie tworzy obiektów ORM ani nie wczytuje
+    całej tabeli do pamięci - wiersze pobierane są z bazy po batch_size.
+
+    Args:
+        db: Sesja bazy danych.
+        filters: Filtry wykonywane w zapytaniu SQL (opcjonalne).
+        batch_size: Liczba wierszy pobieranych z kursora naraz (domyślnie EXPORT_BATCH_SIZE).
+
+    Yields:
+        Kolejne partie wierszy (mapowania kolumna -> wartość) w kolejności
+        daty przyjęcia i ID.
+    """
+    stmt = (
+        select(*Dog.__table__.columns)
+        .where(*dog_filter_clauses(filters))
+        .order_by(Dog.admitted_date, Dog.id)
+        .execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+    )
+    yield from db.execute(stmt).mappings().partitions()
 
 
 def get_dog(db: Session, dog_id: int) -> Optional[Dog]:
@@ -33,6 +166,43 @@ def get_dog(db: Session, dog_id: int) -> Optional[Dog]:
     """
     return db.query(models.dog.Dog).filter(models.dog.Dog.id == dog_id).first()
 
+def load_dog_data(db: Session, dog_id: int) -> Optional[EntityData]:
+    """Odczytuje psa z bazy danych i zapisuje go w pamięci podręcznej.
+
+    Args:
+        db: Sesja bazy danych.
+        dog_id: Identyfikator psa.
+
+    Returns:
+        Dane psa zgodne ze schematem Dog (wartości JSON) lub None, jeśli nie znaleziono.
+    """
+    version = table_versions.get("dogs")
+    db_dog = get_dog(db, dog_id)
+    if db_dog is None:
+        return None
+    data = DogSchema.model_validate(db_dog).model_dump(mode="json")
+    entity_cache.set("dogs", dog_id, data, version)
+    return data
+
+def get_dog_data(db: Session, dog_id: int) -> Optional[EntityData]:
+    """Pobiera dane pojedynczego psa przez pamięć podręczną (read-through).
+
+    Args:
+        db: Sesja bazy danych.
+        dog_id: Identyfikator psa.
+
+    Returns:
+        Dane psa zgodne ze schematem Dog lub None, jeśli nie znaleziono.
+
+    Note:
+        Wpisy unieważniane są przez update_dog, delete_dog, update_dogs i delete_dogs;
+        nieistniejące zwierzęta nie są zapamiętywane.
+    """
+    cached = entity_cache.get("dogs", dog_id)
+    if cached is not None:
+        return cached
+    return load_dog_data(db, dog_id)
+
 def create_dog(db: Session, dog: DogCreate) -> Dog:
     """Tworzy nowego psa w bazie danych.
     
@@ -45,11 +215,19 @@ def create_dog(db: Session, dog: DogCreate) -> Dog:
         
     Note:
         Automatycznie commituje zmiany do bazy danych.
+        W tej samej transakcji zapisuje zdarzenie domenowe w outboxie.
+        Aktualizuje dzienne zestawienie zajętości (occupancy_daily) w tej samej transakcji.
+        Po commicie aktualizuje liczniki zajętości schroniska w pamięci.
     """
     db_dog = models.dog.Dog(**dog.model_dump())
     db.add(db_dog)
+    db.flush()
+    record_event(db, AnimalCreated("dogs", db_dog.id, snapshot_animal(db_dog)))
+    record_stay_changes(db, "dogs", [(None, stay_of(db_dog))])
     db.commit()
     db.refresh(db_dog)
+    counters.apply("dogs", None, db_dog.status)
+    dispatcher.notify()
 
     return db_dog
 
@@ -67,18 +245,40 @@ def update_dog(db: Session, dog_id: int, dog: DogUpdate) -> Optional[Dog]:
     Note:
         Automatycznie commituje zmiany do bazy danych.
         Wykorzystuje partial update - aktualizuje tylko podane pola.
+        W tej samej transakcji zapisuje zdarzenie AnimalUpdated ze zmienionymi polami
+        (aktualizacja bez zmian nie zapisuje zdarzenia ani nie zmienia wersji tabeli).
+        Aktualizuje dzienne zestawienie zajętości (occupancy_daily) w tej samej transakcji.
+        Po commicie aktualizuje liczniki zajętości o ewentualną zmianę statusu.
+        Usuwa psa z pamięci podręcznej odczytów (entity_cache).
     """
     db_dog = get_dog(db, dog_id)
     if not db_dog:
         return None
         
+    old_status = db_dog.status
+    old_stay = stay_of(db_dog)
+    before = snapshot_animal(db_dog)
     update_data = dog.model_dump(exclude_unset=True)
 
     for key, value in update_data.items():
         setattr(db_dog, key, value)
 
+    after = snapshot_animal(db_dog)
+    changed = [key for key in after if after[key] != before[key]]
+    if not changed:
+        # nic się nie zmieniło - bez zdarzenia, nowej wersji tabeli i unieważniania
+        return db_dog
+
+    record_event(db, AnimalUpdated("dogs", db_dog.id, {
+        "old": {key: before[key] for key in changed},
+        "new": {key: after[key] for key in changed},
+    }))
+    record_stay_changes(db, "dogs", [(old_stay, stay_of(db_dog))])
     db.commit()
+    entity_cache.invalidate("dogs", [dog_id])
     db.refresh(db_dog)
+    counters.apply("dogs", old_status, db_dog.status)
+    dispatcher.notify()
 
     return db_dog
 
@@ -94,14 +294,168 @@ def delete_dog(db: Session, dog_id: int) -> bool:
         
     Note:
         Automatycznie commituje zmiany do bazy danych.
+        W tej samej transakcji zapisuje zdarzenie domenowe w outboxie.
+        Aktualizuje dzienne zestawienie zajętości (occupancy_daily) w tej samej transakcji.
+        Po commicie aktualizuje liczniki zajętości schroniska w pamięci.
+        Usuwa psa z pamięci podręcznej odczytów (entity_cache).
     """
     db_dog = get_dog(db, dog_id)
     if db_dog:
+        old_status = db_dog.status
+        record_event(db, AnimalDeleted("dogs", db_dog.id, snapshot_animal(db_dog)))
+        record_stay_changes(db, "dogs", [(stay_of(db_dog), None)])
         db.delete(db_dog)
         db.commit()
+        entity_cache.invalidate("dogs", [dog_id])
+        counters.apply("dogs", old_status, None)
+        dispatcher.notify()
         return True
     return False
 
+def create_dogs(db: Session, dogs: List[DogCreate]) -> List[Dog]:
+    """Tworzy wiele psów jedną wielowierszową instrukcją INSERT.
+
+    Args:
+        db: Sesja bazy danych.
+        dogs: Dane nowych psów zgodne ze schematem DogCreate.
+
+    Returns:
+        Lista utworzonych obiektów Dog w kolejności danych wejściowych.
+
+    Note:
+        Wszystkie psy zapisywane są w jednej transakcji razem ze zdarzeniami w outboxie.
+        Dispatcher zdarzeń jest powiadamiany raz dla całej partii.
+    """
+    if not dogs:
+        return []
+
+    created = db.scalars(
+        insert(Dog).returning(Dog, sort_by_parameter_order=True),
+        [dog.model_dump() for dog in dogs],
+    ).all()
+    record_events(db, [AnimalCreated("dogs", db_dog.id, snapshot_animal(db_dog)) for db_dog in created])
+    record_stay_changes(db, "dogs", [(None, stay_of(db_dog)) for db_dog in created])
+    db.commit()
+
+    ids = [db_dog.id for db_dog in created]
+    loaded = _get_dogs_by_ids(db, ids)
+    for db_dog in loaded.values():
+        counters.apply("dogs", None, db_dog.status)
+    dispatcher.notify()
+    return [loaded[dog_id] for dog_id in ids]
+
+def update_dogs(db: Session, dogs: List[DogBulkUpdate]) -> Dict[int, Dog]:
+    """Aktualizuje wiele psów w jednej transakcji.
+
+    Psy wczytywane są jednym zapytaniem, a zmiany zapisywane przy commicie
+    w partiach (executemany) grupowanych po zestawie zmienionych kolumn.
+
+    Args:
+        db: Sesja bazy danych.
+        dogs: Dane do aktualizacji z identyfikatorami psów (partial update).
+
+    Returns:
+        Słownik id -> zaktualizowany obiekt Dog (tylko dla znalezionych psów).
+
+    Note:
+        Zdarzenia AnimalUpdated zapisywane są w tej samej transakcji.
+        Dispatcher zdarzeń jest powiadamiany raz dla całej partii.
+        Zmienione psy usuwane są z pamięci podręcznej odczytów (entity_cache).
+    """
+    found = _get_dogs_by_ids(db, [dog.id for dog in dogs])
+    before = {dog_id: snapshot_animal(db_dog) for dog_id, db_dog in found.items()}
+    old_statuses = {dog_id: db_dog.status for dog_id, db_dog in found.items()}
+    old_stays = {dog_id: stay_of(db_dog) for dog_id, db_dog in found.items()}
+
+    for dog in dogs:
+        db_dog = found.get(dog.id)
+        if db_dog is None:
+            continue
+        for key, value in dog.model_dump(exclude_unset=True, exclude={"id"}).items():
+            setattr(db_dog, key, value)
+
+    events = []
+    for dog_id, db_dog in found.items():
+        after = snapshot_animal(db_dog)
+        changed = [key for key in after if after[key] != before[dog_id][key]]
+        if changed:
+            events.append(AnimalUpdated("dogs", dog_id, {
+                "old": {key: before[dog_id][key] for key in changed},
+                "new": {key: after[key] for key in changed},
+            }))
+    record_stay_changes(db, "dogs", [(old_stays[dog_id], stay_of(db_dog)) for dog_id, db_dog in found.items()])
+    db.flush()
+    record_events(db, events)
+    db.commit()
+    if events:
+        entity_cache.invalidate("dogs", [event.animal_id for event in events])
+
+    loaded = _get_dogs_by_ids(db, list(found))
+    for dog_id, db_dog in loaded.items():
+        counters.apply("dogs", old_statuses[dog_id], db_dog.status)
+    if events:
+        dispatcher.notify()
+    return loaded
+
+def delete_dogs(db: Session, dog_ids: List[int]) -> List[int]:
+    """Usuwa wiele psów jedną instrukcją DELETE.
+
+    Args:
+        db: Sesja bazy danych.
+        dog_ids: Identyfikatory psów do usunięcia.
+
+    Returns:
+        Lista identyfikatorów faktycznie usuniętych psów (w kolejności z dog_ids).
+
+    Note:
+        Zdarzenia AnimalDeleted zapisywane są w tej samej transakcji.
+        Dispatcher zdarzeń jest powiadamiany raz dla całej partii.
+        Usunięte psy usuwane są z pamięci podręcznej odczytów (entity_cache).
+    """
+    found = _get_dogs_by_ids(db, dog_ids)
+    if not found:
+        return []
+
+    old_statuses = {dog_id: db_dog.status for dog_id, db_dog in found.items()}
+    record_events(db, [AnimalDeleted("dogs", dog_id, snapshot_animal(db_dog)) for dog_id, db_dog in found.items()])
+    record_stay_changes(db, "dogs", [(stay_of(db_dog), None) for db_dog in found.values()])
+    db.execute(delete(Dog).where(Dog.id.in_(list(found))))
+    db.commit()
+    entity_cache.invalidate("dogs", found)
+
+    for old_status in old_statuses.values():
+        counters.apply("dogs", old_status, None)
+    dispatcher.notify()
+    return list(found)
+
+def _get_dogs_by_ids(db: Session, dog_ids: List[int]) -> Dict[int, Dog]:
+    """Wczytuje psy o podanych identyfikatorach jednym zapytaniem.
+
+    Słownik zachowuje kolejność identyfikatorów z wejścia (bez powtórzeń),
+    więc zdarzenia i wyniki operacji masowych mają kolejność żądania.
+    """
+    if not dog_ids:
+        return {}
+    loaded = {db_dog.id: db_dog for db_dog in db.query(Dog).filter(Dog.id.in_(set(dog_ids)))}
+    return {dog_id: loaded[dog_id] for dog_id in dict.fromkeys(dog_ids) if dog_id in loaded}
+
+def dog_stats_select() -> Select:
+    """Buduje zapytanie liczące statystyki psów w jednym przebiegu po tabeli.
+
+    Zamiast osobnego COUNT dla każdego statusu używa agregatów z klauzulą
+    FILTER, dzięki czemu wszystkie liczniki wyznaczane są jednym zapytaniem.
+
+    Returns:
+        Zapytanie SELECT zwracające jeden wiersz z kolumnami current_in_shelter,
+        adopted_total, returned_total i all_dogs_total.
+    """
+    return select(
+        func.count(Dog.id).filter(Dog.status == DogStatus.arrived).label("current_in_shelter"),
+        func.count(Dog.id).filter(Dog.status == DogStatus.adopted).label("adopted_total"),
+        func.count(Dog.id).filter(Dog.status == DogStatus.returned).label("returned_total"),
+        func.count(Dog.id).label("all_dogs_total"),
+    )
+
 def get_dog_stats(db: Session) -> Dict[str, int]:
     """Generuje statystyki wszystkich psów w systemie.
     
@@ -118,15 +472,6 @@ def get_dog_stats(db: Session) -> Dict[str, int]:
     Note:
         Statystyki są wykorzystywane do aktualizacji real-time przez WebSocket.
     """
-    current = db.query(func.count(Dog.id)).filter(Dog.status == DogStatus.arrived).scalar()
-    adopted = db.query(func.count(Dog.id)).filter(Dog.status == DogStatus.adopted).scalar()
-    returned = db.query(func.count(Dog.id)).filter(Dog.status == DogStatus.returned).scalar()
-    total = db.query(func.count(Dog.id)).scalar()
-
-    return {
-        "current_in_shelter": current,
-        "adopted_total": adopted,
-        "returned_total": returned,
-        "all_dogs_total": total
-    }
+    row = db.execute(dog_stats_select()).one()
+    return dict(row._mapping)
 
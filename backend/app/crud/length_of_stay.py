@@ -0,0 +1,168 @@
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import ColumnElement, Date, Integer, case, cast, func, literal, select
+from sqlalchemy.orm import Session
+from .animal import animals_union
+from ..cache import stay_stats_cache
+from ..schemas.animal import AnimalFilter
+
+# Percentyle długości pobytu: nazwa pola -> ułamek
+PERCENTILES: Dict[str, float] = {"median_days": 0.5, "p90_days": 0.9, "p99_days": 0.99}
+
+# Dolne granice przedziałów histogramu długości pobytu (w dniach, ostatni przedział jest otwarty)
+STAY_BUCKETS: Tuple[int, ...] = (0, 7, 30, 90, 180, 365)
+
+# Kolumny grupowania statystyk
+GROUP_FIELDS: Tuple[str, ...] = ("species", "size", "neutered")
+
+
+def _stay_days(dialect: str, admitted: ColumnElement[Any], end: ColumnElement[Any]) -> ColumnElement[int]:
+    """Zwraca wyrażenie SQL liczby dni między datami (end - admitted).
+
+    PostgreSQL odejmuje daty bezpośrednio (wynik integer), a SQLite
+    przechowuje daty jako tekst, więc różnica liczona jest przez julianday.
+    """
+    if dialect == "postgresql":
+        return end - admitted
+    return cast(func.julianday(end) - func.julianday(admitted), Integer)
+
+
+def _bucket_columns(stay: ColumnElement[int]) -> List[ColumnElement[int]]:
+    """Zwraca agregaty COUNT(*) FILTER dla kolejnych przedziałów histogramu."""
+    columns = []
+    for index, lower in enumerate(STAY_BUCKETS):
+        condition = stay >= lower
+        if index + 1 < len(STAY_BUCKETS):
+            condition = condition & (stay < STAY_BUCKETS[index + 1])
+        columns.append(func.count().filter(condition).label(f"bucket_{index}"))
+    return columns
+
+
+def _sqlite_percentile(stay: ColumnElement[int], rank: ColumnElement[int], size: ColumnElement[int], fraction: float) -> ColumnElement[float]:
+    """Percentyl z interpolacją liniową (jak percentile_cont) z numerów wierszy w grupie.
+
+    Pozycja percentyla w posortowanej grupie to fraction * (n - 1) (od zera);
+    wynik interpoluje wartości sąsiednich wierszy. SQLite nie ma funkcji
+    percentile_cont, więc wiersze numerowane są funkcją okna row_number.
+    """
+    position = (size - 1) * fraction
+    lower_rank = cast(position, Integer) + 1
+    lower = func.max(case((rank == lower_rank, stay)))
+    upper = func.max(case((rank == lower_rank + 1, stay)))
+    weight = func.max(position - cast(position, Integer))
+    return lower + weight * (func.coalesce(upper, lower) - lower)
+
+
+def _stay_stats_select(dialect: str, filters: Optional[AnimalFilter], today: date) -> Any:
+    """Buduje zapytanie statystyk długości pobytu pogrupowanych po GROUP_FIELDS."""
+    animals = animals_union(list(GROUP_FIELDS) + ["admitted_date", "released_date"], filters)
+    end = func.coalesce(animals.c.released_date, literal(today, Date))
+    group = [animals.c[field] for field in GROUP_FIELDS]
+    stays = select(
+        *group,
+        _stay_days(dialect, animals.c.admitted_date, end).label("stay"),
+        (animals.c.released_date.is_(None)).label("in_shelter"),
+    )
+
+    if dialect == "postgresql":
+        source = stays.subquery("stays")
+        percentiles = [
+            func.percentile_cont(fraction).within_group(source.c.stay).label(name)
+            for name, fraction in PERCENTILES.items()
+        ]
+    else:
+        # numer wiersza w grupie i liczność grupy dla interpolacji percentyli
+        stays = stays.subquery("stays")
+        partition = [stays.c[field] for field in GROUP_FIELDS]
+        source = select(
+            stays,
+            func.row_number().over(partition_by=partition, order_by=stays.c.stay).label("rank"),
+            func.count().over(partition_by=partition).label("group_size"),
+        ).subquery("ranked_stays")
+        percentiles = [
+            _sqlite_percentile(source.c.stay, source.c.rank, source.c.group_size, fraction).label(name)
+            for name, fraction in PERCENTILES.items()
+        ]
+
+    group_columns = [source.c[field] for field in GROUP_FIELDS]
+    return (
+        select(
+            *group_columns,
+            func.count().label("count"),
+            func.count().filter(source.c.in_shelter).label("in_shelter"),
+            func.avg(source.c.stay).label("mean_days"),
+            *percentiles,
+            func.min(source.c.stay).label("min_days"),
+            func.max(source.c.stay).label("max_days"),
+            *_bucket_columns(source.c.stay),
+        )
+        .group_by(*group_columns)
+        .order_by(*group_columns)
+    )
+
+
+def _histogram(values: Any) -> List[Dict[str, Any]]:
+    """Zamienia kolumny bucket_* wiersza na listę przedziałów histogramu."""
+    return [
+        {
+            "min_days": lower,
+            "max_days": STAY_BUCKETS[index + 1] - 1 if index + 1 < len(STAY_BUCKETS) else None,
+            "count": values[f"bucket_{index}"],
+        }
+        for index, lower in enumerate(STAY_BUCKETS)
+    ]
+
+
+def _days(value: Any) -> Optional[float]:
+    """Zaokrągla liczbę dni (Decimal/float z bazy danych) do dwóch miejsc po przecinku."""
+    return None if value is None else round(float(value), 2)
+
+
+def get_stay_stats(db: Session, filters: Optional[AnimalFilter] = None, today: Optional[date] = None) -> Dict[str, Any]:
+    """Zwraca rozkłady długości pobytu psów i kotów wyznaczone w bazie danych.
+
+    Długość pobytu to liczba dni od admitted_date do released_date, a dla
+    zwierząt wciąż przebywających w schronisku - do dzisiaj. Statystyki
+    grupowane są po gatunku, rozmiarze i sterylizacji; średnia, percentyle
+    i histogram liczone są jednym zapytaniem SQL (percentile_cont na PostgreSQL,
+    funkcje okna na SQLite).
+
+    Args:
+        db: Sesja bazy danych.
+        filters: Filtry (te same co dla listy całego schroniska, opcjonalne).
+        today: Dzień, do którego liczone są trwające pobyty (domyślnie dzisiaj).
+
+    Returns:
+        Słownik {"as_of": dzień, "groups": [...]} ze statystykami każdej grupy
+        (count, in_shelter, mean_days, median_days, p90_days, p99_days,
+        min_days, max_days, histogram). Grupy uporządkowane są po gatunku,
+        rozmiarze (jako napis) i sterylizacji (False przed True), więc koty
+        ("cats") poprzedzają psy ("dogs").
+
+    Note:
+        Wynik zapamiętywany jest w stay_stats_cache do następnego zapisu psów
+        lub kotów (i do zmiany dnia, który jest częścią klucza).
+    """
+    today = today or date.today()
+    key = f"{today.isoformat()}:{filters.model_dump_json(exclude_none=True) if filters is not None else ''}"
+    cached = stay_stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    versions = stay_stats_cache.versions()
+    stmt = _stay_stats_select(db.get_bind().dialect.name, filters, today)
+    groups = [
+        {
+            **{field: values[field] for field in GROUP_FIELDS},
+            "count": values["count"],
+            "in_shelter": values["in_shelter"],
+            **{name: _days(values[name]) for name in ("mean_days", *PERCENTILES)},
+            "min_days": values["min_days"],
+            "max_days": values["max_days"],
+            "histogram": _histogram(values),
+        }
+        for values in db.execute(stmt).mappings()
+    ]
+    result = {"as_of": today, "groups": groups}
+    stay_stats_cache.set(key, result, versions)
+    return result
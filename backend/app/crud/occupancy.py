@@ -0,0 +1,172 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Date, Integer, bindparam, case, func, literal, select, true, update
+from sqlalchemy.dialects import postgresql as postgresql_dialect, sqlite as sqlite_dialect
+from sqlalchemy.orm import Session, aliased
+from ..models.occupancy import OccupancyDaily
+
+# Pobyt zwierzęcia w schronisku: (admitted_date, released_date)
+Stay = Tuple[date, Optional[date]]
+
+# Gatunki w zestawieniu dziennym (nazwy tabel)
+SPECIES = ("dogs", "cats")
+
+# Maksymalna długość zakresu historii zajętości w dniach
+MAX_HISTORY_DAYS: int = 3660
+
+# Klucz blokady doradczej PostgreSQL zmian zestawienia (drugą częścią klucza jest indeks gatunku w SPECIES)
+OCCUPANCY_LOCK_ID: int = 4004
+
+
+def stay_of(animal: Any) -> Stay:
+    """Zwraca pobyt zwierzęcia (daty przyjęcia i wypuszczenia) z obiektu ORM lub schematu."""
+    return animal.admitted_date, animal.released_date
+
+
+def record_stay_changes(
+    db: Session,
+    species: str,
+    changes: Iterable[Tuple[Optional[Stay], Optional[Stay]]],
+) -> None:
+    """Aktualizuje dzienne zestawienie zajętości o zmiany pobytów zwierząt.
+
+    Każda zmiana odejmuje poprzedni pobyt i dodaje nowy: przyjęcie zwiększa
+    licznik admitted w dniu przyjęcia, a wypuszczenie licznik released
+    w dniu wypuszczenia. Zmiany całej partii sumowane są po dniach
+    i zapisywane jedną instrukcją INSERT ... ON CONFLICT DO UPDATE (nowy
+    wiersz dostaje stan z poprzedniego dnia), a suma narastająca occupancy
+    dni od pierwszej zmiany poprawiana jest jedną instrukcją UPDATE.
+
+    Args:
+        db: Sesja bazy danych z otwartą transakcją (zestawienie zatwierdzane
+            jest razem ze zmianą zwierząt).
+        species: Gatunek ("dogs" lub "cats").
+        changes: Pary (poprzedni pobyt, nowy pobyt); None dla nowego lub usuniętego zwierzęcia.
+
+    Note:
+        Na PostgreSQL zmiany zestawienia jednego gatunku są serializowane
+        blokadą doradczą transakcji - współbieżna transakcja nie widziałaby
+        wierszy wstawionych przez inną, więc suma narastająca mogłaby się rozjechać.
+    """
+    deltas: Dict[date, List[int]] = defaultdict(lambda: [0, 0])
+    for old, new in changes:
+        if old == new:
+            continue
+        for stay, sign in ((old, -1), (new, 1)):
+            if stay is None:
+                continue
+            admitted_date, released_date = stay
+            deltas[admitted_date][0] += sign
+            if released_date is not None:
+                deltas[released_date][1] += sign
+
+    # stała kolejność dni - współbieżne transakcje blokują wiersze w tej samej kolejności
+    rows = [
+        {"day": day, "admitted": admitted, "released": released}
+        for day, (admitted, released) in sorted(deltas.items())
+        if admitted or released
+    ]
+    if not rows:
+        return
+    postgresql = db.get_bind().dialect.name == "postgresql"
+    if postgresql:
+        db.execute(select(func.pg_advisory_xact_lock(OCCUPANCY_LOCK_ID, SPECIES.index(species))))
+
+    # nowy wiersz dnia zaczyna od stanu na koniec poprzedniego dnia z wierszem
+    earlier = aliased(OccupancyDaily)
+    previous = (
+        select(earlier.occupancy)
+        .where(earlier.species == species, earlier.day < bindparam("day"))
+        .order_by(earlier.day.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    dialect = postgresql_dialect if postgresql else sqlite_dialect
+    stmt = dialect.insert(OccupancyDaily.__table__).from_select(
+        ["species", "day", "admitted", "released", "occupancy"],
+        select(
+            literal(species),
+            bindparam("day", type_=Date),
+            bindparam("admitted", type_=Integer),
+            bindparam("released", type_=Integer),
+            func.coalesce(previous, 0),
+        # WHERE wymagane przez SQLite w INSERT ... SELECT ... ON CONFLICT
+        ).where(true()),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[OccupancyDaily.species, OccupancyDaily.day],
+        set_={
+            "admitted": OccupancyDaily.admitted + stmt.excluded.admitted,
+            "released": OccupancyDaily.released + stmt.excluded.released,
+        },
+    )
+    db.execute(stmt, rows)
+
+    # dzień D zmienia sumę narastającą o zmiany wszystkich dni partii do D włącznie
+    running, increments = 0, []
+    for row in rows:
+        running += row["admitted"] - row["released"]
+        increments.append((OccupancyDaily.day >= row["day"], running))
+    db.execute(
+        update(OccupancyDaily)
+        .where(OccupancyDaily.species == species, OccupancyDaily.day >= rows[0]["day"])
+        .values(occupancy=OccupancyDaily.occupancy + case(*reversed(increments), else_=0))
+    )
+
+
+def get_occupancy_history(db: Session, date_from: date, date_to: date) -> List[Dict[str, Any]]:
+    """Zwraca liczbę psów i kotów w schronisku w kolejnych dniach zakresu.
+
+    Zwierzę jest w schronisku w dniu D, jeśli admitted_date <= D
+    i (released_date jest puste lub released_date > D).
+    Odczytuje tylko dzienne zestawienie (nie tabele zwierząt): stan na początek
+    zakresu to suma narastająca ostatniego wcześniejszego wiersza gatunku
+    (jeden wiersz z indeksu klucza głównego), a dni zakresu bez zmian
+    zachowują stan z poprzedniego dnia.
+
+    Args:
+        db: Sesja bazy danych.
+        date_from: Pierwszy dzień zakresu.
+        date_to: Ostatni dzień zakresu (włącznie).
+
+    Returns:
+        Lista {"day", "dogs", "cats", "total"} dla każdego dnia zakresu.
+
+    Raises:
+        ValueError: Jeśli zakres jest pusty lub dłuższy niż MAX_HISTORY_DAYS.
+    """
+    days = (date_to - date_from).days + 1
+    if days < 1:
+        raise ValueError("date_from must not be after date_to")
+    if days > MAX_HISTORY_DAYS:
+        raise ValueError(f"Date range must not exceed {MAX_HISTORY_DAYS} days")
+
+    before = db.execute(select(*(
+        select(OccupancyDaily.occupancy)
+        .where(OccupancyDaily.species == species, OccupancyDaily.day < date_from)
+        .order_by(OccupancyDaily.day.desc())
+        .limit(1)
+        .scalar_subquery()
+        for species in SPECIES
+    ))).one()
+    current = {species: int(occupancy or 0) for species, occupancy in zip(SPECIES, before)}
+
+    in_range: Dict[date, Dict[str, int]] = defaultdict(dict)
+    for species, day, occupancy in db.execute(
+        select(OccupancyDaily.species, OccupancyDaily.day, OccupancyDaily.occupancy)
+        .where(OccupancyDaily.day.between(date_from, date_to))
+    ):
+        in_range[day][species] = occupancy
+
+    history = []
+    for offset in range(days):
+        day = date_from + timedelta(days=offset)
+        current.update(in_range.get(day, {}))
+        history.append({
+            "day": day,
+            "dogs": current["dogs"],
+            "cats": current["cats"],
+            "total": current["dogs"] + current["cats"],
+        })
+    return history
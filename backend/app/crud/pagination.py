@@ -0,0 +1,170 @@
+import base64
+from datetime import date
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import ColumnElement, Row, Select, and_, or_
+from sqlalchemy.orm import Query, Session
+
+
+def encode_cursor(admitted_date: date, item_id: int) -> str:
+    """Koduje pozycję ostatniego elementu strony do nieprzezroczystego kursora.
+
+    Args:
+        admitted_date: Data przyjęcia ostatniego zwróconego zwierzęcia.
+        item_id: Identyfikator ostatniego zwróconego zwierzęcia.
+
+    Returns:
+        Kursor w postaci napisu base64 (bezpieczny w URL).
+    """
+    raw = f"{admitted_date.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Dekoduje kursor utworzony przez encode_cursor.
+
+    Args:
+        cursor: Kursor otrzymany od klienta.
+
+    Returns:
+        Krotka (admitted_date, id) ostatniego elementu poprzedniej strony.
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        admitted, item_id = raw.split("|")
+        return date.fromisoformat(admitted), int(item_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+
+def encode_animal_cursor(admitted_date: date, species: str, item_id: int) -> str:
+    """Koduje pozycję ostatniego elementu strony listy całego schroniska.
+
+    Identyfikatory psów i kotów mogą się powtarzać, więc kursor zawiera też gatunek.
+
+    Args:
+        admitted_date: Data przyjęcia ostatniego zwróconego zwierzęcia.
+        species: Gatunek ostatniego zwróconego zwierzęcia ("dogs" lub "cats").
+        item_id: Identyfikator ostatniego zwróconego zwierzęcia.
+
+    Returns:
+        Kursor w postaci napisu base64 (bezpieczny w URL).
+    """
+    raw = f"{admitted_date.isoformat()}|{species}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_animal_cursor(cursor: str) -> Tuple[date, str, int]:
+    """Dekoduje kursor utworzony przez encode_animal_cursor.
+
+    Args:
+        cursor: Kursor otrzymany od klienta.
+
+    Returns:
+        Krotka (admitted_date, gatunek, id) ostatniego elementu poprzedniej strony.
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        admitted, species, item_id = raw.split("|")
+        return date.fromisoformat(admitted), species, int(item_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+def after_cursor(model: Any, cursor: str) -> ColumnElement[bool]:
+    """Zwraca warunek wybierający elementy za pozycją zapisaną w kursorze.
+
+    Args:
+        model: Model ORM (Dog lub Cat) posiadający kolumny id i admitted_date.
+        cursor: Kursor z poprzedniej strony.
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    last_date, last_id = decode_cursor(cursor)
+    return or_(
+        model.admitted_date > last_date,
+        and_(model.admitted_date == last_date, model.id > last_id),
+    )
+
+
+def paginate(query: Query, model: Any, limit: Optional[int], cursor: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+    """Stosuje paginację keyset (admitted_date, id) do zapytania.
+
+    Zamiast OFFSET zapytanie zaczyna się bezpośrednio za ostatnim elementem
+    poprzedniej strony, więc koszt pobrania strony nie rośnie wraz z jej numerem.
+
+    Args:
+        query: Zapytanie z już nałożonymi filtrami.
+        model: Model ORM (Dog lub Cat) posiadający kolumny id i admitted_date.
+        limit: Maksymalna liczba elementów na stronie (None - bez limitu).
+        cursor: Kursor z poprzedniej strony (opcjonalne).
+
+    Returns:
+        Krotka (lista obiektów, kursor następnej strony lub None).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    if cursor:
+        query = query.filter(after_cursor(model, cursor))
+
+    query = query.order_by(model.admitted_date, model.id)
+
+    if limit is None:
+        return query.all(), None
+
+    # pobieramy jeden element więcej, żeby wiedzieć czy istnieje następna strona
+    items = query.limit(limit + 1).all()
+    return _page(items, limit)
+
+
+def paginate_rows(
+    db: Session,
+    stmt: Select,
+    model: Any,
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Tuple[List[Row], Optional[str]]:
+    """Paginacja keyset dla zapytań Core (wiersze zamiast obiektów ORM).
+
+    Args:
+        db: Sesja bazy danych.
+        stmt: Zapytanie select z już nałożonymi filtrami; musi zawierać kolumny id i admitted_date.
+        model: Model ORM (Dog lub Cat), którego kolumny wyznaczają kolejność.
+        limit: Maksymalna liczba wierszy na stronie (None - bez limitu).
+        cursor: Kursor z poprzedniej strony (opcjonalne).
+
+    Returns:
+        Krotka (lista wierszy, kursor następnej strony lub None).
+
+    Raises:
+        ValueError: Jeśli kursor jest nieprawidłowy.
+    """
+    if cursor:
+        stmt = stmt.where(after_cursor(model, cursor))
+
+    stmt = stmt.order_by(model.admitted_date, model.id)
+
+    if limit is None:
+        return list(db.execute(stmt).all()), None
+
+    rows = list(db.execute(stmt.limit(limit + 1)).all())
+    return _page(rows, limit)
+
+
+def _page(items: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Obcina wynik pobrany z limitem limit + 1 i wyznacza kursor następnej strony."""
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(last.admitted_date, last.id)
@@ -0,0 +1,151 @@
+import re
+from typing import Any, List, Sequence, Set, Type
+from sqlalchemy import ColumnElement, Row, and_, column, event, func, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+from ..database import Base
+from ..models.search import fts_table_name
+
+# Minimalne podobieństwo trigramowe dopasowania z literówką (domyślny próg pg_trgm)
+SIMILARITY_THRESHOLD: float = 0.3
+# Zapytania krótsze niż trigram wyszukiwane są tylko po prefiksie
+MIN_TRIGRAM_QUERY: int = 3
+
+
+def trigrams(text: str) -> Set[str]:
+    """Zwraca trigramy napisu tak jak pg_trgm (słowa małymi literami, dopełnione spacjami).
+
+    Args:
+        text: Napis (np. imię zwierzęcia).
+
+    Returns:
+        Zbiór trigramów, np. {"  r", " re", "rex", "ex "} dla "Rex".
+    """
+    grams: Set[str] = set()
+    for word in re.findall(r"\w+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(left: str, right: str) -> float:
+    """Podobieństwo trigramowe dwóch napisów (odpowiednik similarity z pg_trgm).
+
+    Returns:
+        Liczba wspólnych trigramów podzielona przez liczbę wszystkich trigramów (0.0 - 1.0).
+    """
+    left_grams, right_grams = trigrams(left), trigrams(right)
+    if not left_grams or not right_grams:
+        return 0.0
+    return len(left_grams & right_grams) / len(left_grams | right_grams)
+
+
+@event.listens_for(Pool, "connect")
+def _register_similarity(dbapi_connection: Any, connection_record: Any) -> None:
+    """Rejestruje funkcję SQL similarity w połączeniach SQLite.
+
+    Dzięki niej dopasowanie z literówką i ranking wyników na SQLite
+    wykonywane są w zapytaniu, tak jak similarity z pg_trgm na PostgreSQL.
+    """
+    # create_function mają tylko połączenia SQLite (sqlite3, aiosqlite)
+    if hasattr(dbapi_connection, "create_function"):
+        dbapi_connection.create_function("similarity", 2, similarity, deterministic=True)
+
+
+def prefix_range_end(prefix: str) -> str:
+    """Zwraca górną granicę zakresu napisów zaczynających się od prefiksu (porównanie binarne)."""
+    return prefix + chr(0x10FFFF)
+
+
+def fts_query(q: str) -> str:
+    """Buduje zapytanie FTS5 dopasowujące dowolny trigram szukanego napisu.
+
+    Imiona zawierające szukany napis mają wszystkie jego trigramy, a imiona
+    z literówką część z nich, więc ranking bm25 ustawia je wyżej niż
+    imiona z pojedynczym wspólnym trigramem.
+
+    Args:
+        q: Szukany napis (co najmniej 3 znaki).
+
+    Returns:
+        Wyrażenie MATCH, np. '"bur" OR "ure" OR "rek"'.
+    """
+    grams = dict.fromkeys(q[i:i + 3] for i in range(len(q) - 2))
+    return " OR ".join('"' + gram.replace('"', '""') + '"' for gram in grams)
+
+
+def search_rows(
+    db: Session,
+    model: Type[Base],
+    q: str,
+    limit: int,
+    fields: Sequence[str],
+) -> List[Row]:
+    """Wyszukuje zwierzęta po imieniu (prefiks, podciąg, literówki).
+
+    Wyniki uporządkowane są według trafności: najpierw imiona zaczynające
+    się od szukanego napisu, potem zawierające go, a na końcu podobne
+    (podobieństwo trigramowe co najmniej SIMILARITY_THRESHOLD).
+    Wielkość liter nie ma znaczenia.
+
+    Na PostgreSQL dopasowanie korzysta z indeksu GIN gin_trgm_ops (LIKE
+    i operator %), a na SQLite z indeksu FTS5 (dowolny wspólny trigram),
+    po czym podobieństwo (similarity) i ranking liczone są w zapytaniu dla
+    wszystkich dopasowanych imion. Zapytania krótsze niż trzy znaki
+    dopasowywane są tylko po prefiksie z użyciem indeksu lower(name).
+
+    Args:
+        db: Sesja bazy danych.
+        model: Model zwierzęcia (Dog lub Cat).
+        q: Szukany napis.
+        limit: Maksymalna liczba wyników.
+        fields: Pola schematu odpowiedzi w kolejności schematu.
+
+    Returns:
+        Lista wierszy zaczynających się od kolumn fields (na końcu kolumny
+        imienia i ID, jeśli nie zostały wybrane).
+    """
+    q = q.strip().lower()
+    columns = [model.__table__.c[field] for field in fields]
+    # imię i ID potrzebne do rankingu wyników
+    columns += [model.__table__.c[field] for field in ("name", "id") if field not in fields]
+    name: ColumnElement[str] = func.lower(model.name)
+    postgresql = db.get_bind().dialect.name == "postgresql"
+
+    if len(q) < MIN_TRIGRAM_QUERY:
+        if postgresql:
+            # LIKE 'prefiks%' - indeks lower(name) text_pattern_ops
+            prefix = name.startswith(q, autoescape=True)
+        else:
+            # SQLite nie używa indeksu wyrażenia dla LIKE, ale używa go dla zakresu
+            prefix = and_(name >= q, name < prefix_range_end(q))
+        stmt = (
+            select(*columns)
+            .where(prefix)
+            .order_by(name, model.id)
+            .limit(limit)
+        )
+        return list(db.execute(stmt))
+
+    if postgresql:
+        matched = or_(name.contains(q, autoescape=True), name.op("%")(q))
+    else:
+        fts = table(fts_table_name(model.__tablename__), column("rowid"))
+        candidates = select(fts.c.rowid).where(literal_column(fts.name).match(fts_query(q)))
+        matched = and_(
+            model.id.in_(candidates),
+            or_(name.contains(q, autoescape=True), func.similarity(name, q) >= SIMILARITY_THRESHOLD),
+        )
+    stmt = (
+        select(*columns)
+        .where(matched)
+        .order_by(
+            name.startswith(q, autoescape=True).desc(),
+            name.contains(q, autoescape=True).desc(),
+            func.similarity(name, q).desc(),
+            name,
+            model.id,
+        )
+        .limit(limit)
+    )
+    return list(db.execute(stmt))
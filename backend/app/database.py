@@ -1,13 +1,97 @@
 from .config import settings
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from .pool_metrics import async_pool_metrics, instrumented_pool_class, sync_pool_metrics
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Generator, Iterator, Optional
 
-# Tworzenie silnika bazy danych z URL z konfiguracji
-engine = create_engine(settings.DATABASE_URL)
+# Sterowniki asynchroniczne dla obsługiwanych baz danych
+ASYNC_DRIVERS: Dict[str, str] = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
 
-# Fabryka sesji bazy danych
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def to_async_url(url: str) -> str:
+    """Zamienia adres bazy danych na adres dla sterownika asynchronicznego.
+
+    Args:
+        url: Adres bazy danych (np. postgresql://... lub sqlite:///...).
+
+    Returns:
+        Ten sam adres ze sterownikiem asyncpg (PostgreSQL) lub aiosqlite (SQLite).
+
+    Raises:
+        ValueError: Jeśli baza danych nie ma obsługiwanego sterownika asynchronicznego.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def pool_options() -> Dict[str, Any]:
+    """Zwraca parametry puli połączeń z konfiguracji (wspólne dla obu silników)."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+# Silniki bazy danych - tworzone przez init_db() w lifespan aplikacji, a nie przy imporcie
+engine: Optional[Engine] = None
+async_engine: Optional[AsyncEngine] = None
+
+# Fabryka sesji bazy danych (wiązana z silnikiem w init_db)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Fabryka sesji asynchronicznych; obiekty nie są wygaszane po commicie,
+# bo leniwe ładowanie atrybutów poza sesją nie jest możliwe w asyncio
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def init_db() -> None:
+    """Tworzy silniki bazy danych (synchroniczny i asynchroniczny) i wiąże z nimi fabryki sesji.
+
+    Wywoływana przy starcie aplikacji (lifespan) lub przez skrypty, np. komendę
+    importu. Kolejne wywołania nie tworzą nowych silników. Silniki nie otwierają
+    połączeń - pula wypełniana jest przy pierwszych zapytaniach lub rozgrzewce.
+    """
+    global engine, async_engine
+    if engine is not None:
+        return
+
+    engine = create_engine(
+        settings.DATABASE_URL,
+        poolclass=instrumented_pool_class(QueuePool, sync_pool_metrics),
+        **pool_options(),
+    )
+    sync_pool_metrics.attach(engine)
+    SessionLocal.configure(bind=engine)
+
+    # silnik asynchroniczny (endpointy działające w pętli zdarzeń)
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL),
+        poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics),
+        **pool_options(),
+    )
+    async_pool_metrics.attach(async_engine.sync_engine)
+    AsyncSessionLocal.configure(bind=async_engine)
+
+
+async def dispose_db() -> None:
+    """Zamyka połączenia obu silników (przy zatrzymaniu aplikacji)."""
+    global engine, async_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
+    engine = None
+    async_engine = None
 
 # Klasa bazowa dla modeli ORM
 Base = declarative_base()
@@ -23,4 +107,57 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def session_scope(app: Optional[Any] = None) -> Iterator[Session]:
+    """Otwiera krótkotrwałą sesję bazy danych poza cyklem życia requestu.
+
+    Używana przez WebSockety i zadania w tle, które nie powinny trzymać
+    połączenia z puli przez cały czas działania. Jeśli aplikacja nadpisuje
+    zależność get_db (app.dependency_overrides), sesja pochodzi z nadpisanego
+    generatora.
+
+    Args:
+        app: Aplikacja FastAPI, której nadpisania zależności mają być użyte (opcjonalne).
+
+    Yields:
+        Session: Sesja bazy danych SQLAlchemy, zamykana po wyjściu z bloku.
+    """
+    provider = get_db
+    if app is not None:
+        provider = app.dependency_overrides.get(get_db, get_db)
+    sessions = provider()
+    try:
+        yield next(sessions)
+    finally:
+        sessions.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Generator asynchronicznej sesji bazy danych dla dependency injection FastAPI.
+    Yields:
+        AsyncSession: Asynchroniczna sesja bazy danych SQLAlchemy.
+    Note:
+        Sesja jest automatycznie zamykana po zakończeniu requestu.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@asynccontextmanager
+async def async_session_scope(app: Optional[Any] = None) -> AsyncIterator[AsyncSession]:
+    """Asynchroniczny odpowiednik session_scope (uwzględnia nadpisania get_async_db).
+
+    Args:
+        app: Aplikacja FastAPI, której nadpisania zależności mają być użyte (opcjonalne).
+
+    Yields:
+        AsyncSession: Sesja asynchroniczna, zamykana po wyjściu z bloku.
+    """
+    provider = get_async_db
+    if app is not None:
+        provider = app.dependency_overrides.get(get_async_db, get_async_db)
+    sessions = provider()
+    try:
+        yield await sessions.__anext__()
+    finally:
+        await sessions.aclose()
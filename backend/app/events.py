@@ -0,0 +1,411 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, ClassVar, Dict, List, Optional, Tuple, Type
+from sqlalchemy import delete, insert, inspect, or_, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from .config import settings
+from .database import session_scope
+from .models.outbox import OutboxEvent
+from .versions import mark_table_changed
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AnimalEvent:
+    """Bazowe zdarzenie domenowe dotyczące zwierzęcia.
+
+    Attributes:
+        species: Gatunek zwierzęcia ("dogs" lub "cats").
+        animal_id: Identyfikator zwierzęcia (None dla zdarzeń dotyczących wielu zwierząt).
+        payload: Dane zdarzenia (wartości kolumn w formacie JSON).
+        id: Identyfikator zdarzenia w tabeli outbox (None przed zapisaniem).
+    """
+    event_type: ClassVar[str] = "AnimalEvent"
+
+    species: str
+    animal_id: Optional[int]
+    payload: Dict[str, Any] = field(default_factory=dict)
+    id: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class AnimalCreated(AnimalEvent):
+    """Zdarzenie utworzenia zwierzęcia (payload: wartości wszystkich kolumn)."""
+    event_type: ClassVar[str] = "AnimalCreated"
+
+
+@dataclass(frozen=True)
+class AnimalUpdated(AnimalEvent):
+    """Zdarzenie aktualizacji zwierzęcia (payload: {"old": {...}, "new": {...}} zmienionych kolumn)."""
+    event_type: ClassVar[str] = "AnimalUpdated"
+
+
+@dataclass(frozen=True)
+class AnimalDeleted(AnimalEvent):
+    """Zdarzenie usunięcia zwierzęcia (payload: wartości kolumn przed usunięciem)."""
+    event_type: ClassVar[str] = "AnimalDeleted"
+
+
+@dataclass(frozen=True)
+class AnimalsImported(AnimalEvent):
+    """Zdarzenie masowego importu zwierząt (payload: {"count": liczba wierszy}, animal_id: None)."""
+    event_type: ClassVar[str] = "AnimalsImported"
+
+
+EVENT_TYPES: Dict[str, Type[AnimalEvent]] = {
+    cls.event_type: cls for cls in (AnimalCreated, AnimalUpdated, AnimalDeleted, AnimalsImported)
+}
+
+EventConsumer = Callable[[List[AnimalEvent]], Awaitable[None]]
+
+
+def _to_json(value: Any) -> Any:
+    """Zamienia wartość kolumny na wartość zapisywalną w JSON."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def snapshot_animal(animal: Any) -> Dict[str, Any]:
+    """Zwraca wartości wszystkich kolumn zwierzęcia w formacie JSON.
+
+    Args:
+        animal: Obiekt ORM (Dog lub Cat).
+    """
+    return {
+        column.key: _to_json(getattr(animal, column.key))
+        for column in inspect(animal).mapper.column_attrs
+    }
+
+
+def _transaction_id(db: Session) -> str:
+    """Zwraca identyfikator bieżącej transakcji sesji (wspólny dla jej zdarzeń w outboxie)."""
+    db.connection()
+    transaction = db.get_transaction()
+    current = db.info.get("outbox_transaction")
+    if current is None or current[0] is not transaction:
+        current = (transaction, uuid.uuid4().hex)
+        db.info["outbox_transaction"] = current
+    return current[1]
+
+
+def record_event(db: Session, event: AnimalEvent) -> None:
+    """Zapisuje zdarzenie w tabeli outbox w bieżącej transakcji.
+
+    Zdarzenie zostanie zatwierdzone (lub wycofane) razem ze zmianą danych,
+    więc po commicie nie może zostać utracone. Tabela zdarzenia oznaczana
+    jest jako zmieniona - jej wspólna wersja (ETag) zwiększy się przy commicie.
+
+    Args:
+        db: Sesja bazy danych z otwartą transakcją.
+        event: Zdarzenie do zapisania.
+    """
+    mark_table_changed(db, event.species)
+    db.add(OutboxEvent(
+        event_type=event.event_type,
+        species=event.species,
+        animal_id=event.animal_id,
+        payload=event.payload,
+        transaction_id=_transaction_id(db),
+    ))
+
+
+def record_events(db: Session, events: List[AnimalEvent]) -> None:
+    """Zapisuje wiele zdarzeń w tabeli outbox jedną instrukcją INSERT.
+
+    Używana przez operacje masowe; podobnie jak record_event działa
+    w bieżącej transakcji.
+
+    Args:
+        db: Sesja bazy danych z otwartą transakcją.
+        events: Zdarzenia do zapisania.
+    """
+    if not events:
+        return
+    for species in {event.species for event in events}:
+        mark_table_changed(db, species)
+    transaction_id = _transaction_id(db)
+    db.execute(insert(OutboxEvent), [
+        {
+            "event_type": event.event_type,
+            "species": event.species,
+            "animal_id": event.animal_id,
+            "payload": event.payload,
+            "transaction_id": transaction_id,
+        }
+        for event in events
+    ])
+
+
+class OutboxDispatcher:
+    """Dispatcher przekazujący zdarzenia z tabeli outbox do konsumentów.
+
+    Pojedyncze zadanie asynchroniczne odczytuje zdarzenia partiami (w kolejności
+    zapisu); zdarzenia jednej transakcji (np. operacji masowej) trafiają do
+    jednej partii, nawet jeśli jest ona większa niż batch_size. Odczyt partii to krótka, od razu zatwierdzana transakcja, która
+    zwiększa licznik prób i oznacza zdarzenia jako niedostępne na retry_delay
+    sekund; konsumenci wywoływani są poza transakcją, a po ich zakończeniu
+    partia jest usuwana. Zdarzenia, których któryś konsument nie przyjął
+    (lub odczytane przez worker, który uległ awarii), są przekazywane ponownie
+    wszystkim konsumentom po retry_delay - dostarczenie jest co najmniej
+    jednokrotne, a zdarzenie usuwane jest dopiero po max_attempts próbach.
+
+    Attributes:
+        batch_size: Liczba zdarzeń w jednej partii (bez dzielenia transakcji).
+        poll_interval: Odstęp między sprawdzeniami tabeli w sekundach.
+        retry_delay: Czas do ponownego odczytu nieprzekazanej partii w sekundach.
+        max_attempts: Liczba prób przekazania, po której zdarzenie jest porzucane.
+        app: Aplikacja FastAPI, której nadpisania get_db są używane (ustawiana przy starcie).
+        dispatched_events: Liczba przekazanych zdarzeń.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        retry_delay: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ) -> None:
+        """Inicjalizuje dispatcher bez konsumentów.
+
+        Args:
+            batch_size: Maksymalna liczba zdarzeń w jednej partii
+                (domyślnie OUTBOX_BATCH_SIZE z ustawień).
+            poll_interval: Odstęp między sprawdzeniami tabeli w sekundach
+                (domyślnie OUTBOX_POLL_INTERVAL z ustawień).
+            retry_delay: Czas do ponownego odczytu nieprzekazanej partii w sekundach
+                (domyślnie OUTBOX_RETRY_DELAY z ustawień).
+            max_attempts: Liczba prób przekazania zdarzenia
+                (domyślnie OUTBOX_MAX_ATTEMPTS z ustawień).
+        """
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._retry_delay = retry_delay
+        self._max_attempts = max_attempts
+        self.app: Optional[Any] = None
+        self.dispatched_events: int = 0
+        self._consumers: List[EventConsumer] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def batch_size(self) -> int:
+        """Maksymalna liczba zdarzeń w jednej partii."""
+        return self._batch_size if self._batch_size is not None else settings.OUTBOX_BATCH_SIZE
+
+    @property
+    def poll_interval(self) -> float:
+        """Odstęp między sprawdzeniami tabeli w sekundach."""
+        return self._poll_interval if self._poll_interval is not None else settings.OUTBOX_POLL_INTERVAL
+
+    @property
+    def retry_delay(self) -> float:
+        """Czas do ponownego odczytu nieprzekazanej partii w sekundach."""
+        return self._retry_delay if self._retry_delay is not None else settings.OUTBOX_RETRY_DELAY
+
+    @property
+    def max_attempts(self) -> int:
+        """Liczba prób przekazania, po której zdarzenie jest porzucane."""
+        return self._max_attempts if self._max_attempts is not None else settings.OUTBOX_MAX_ATTEMPTS
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Pętla zdarzeń, w której działa dispatcher (None przed startem)."""
+        return self._loop
+
+    def subscribe(self, consumer: EventConsumer) -> None:
+        """Rejestruje konsumenta otrzymującego partie zdarzeń.
+
+        Args:
+            consumer: Funkcja asynchroniczna przyjmująca listę zdarzeń.
+        """
+        if consumer not in self._consumers:
+            self._consumers.append(consumer)
+
+    def start(self, app: Optional[Any] = None) -> None:
+        """Uruchamia zadanie dispatchera w bieżącej pętli zdarzeń.
+
+        Args:
+            app: Aplikacja FastAPI (do tworzenia sesji z uwzględnieniem nadpisań).
+        """
+        self.app = app
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._running = asyncio.Lock()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Zatrzymuje zadanie dispatchera."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._loop = None
+        self._running = None
+
+    async def pause(self) -> None:
+        """Przekazuje oczekujące zdarzenia i wstrzymuje dispatcher do wywołania resume.
+
+        Po powrocie żadna partia nie jest w trakcie przekazywania, a dispatcher
+        nie odczytuje outboxa (np. na czas odtwarzania tabel w testach).
+        """
+        if self._running is None:
+            return
+        await self._running.acquire()
+        try:
+            while await self.dispatch_batch():
+                pass
+        except Exception:
+            logger.exception("Outbox dispatch failed")
+
+    def resume(self) -> None:
+        """Wznawia dispatcher wstrzymany przez pause (wywoływana w pętli dispatchera)."""
+        if self._running is not None and self._running.locked():
+            self._running.release()
+            self.notify()
+
+    def notify(self) -> None:
+        """Budzi dispatcher po zatwierdzeniu nowych zdarzeń.
+
+        Może być wywołana z dowolnego wątku (np. z synchronicznego endpointu).
+        """
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wakeup.set()
+        else:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    async def _run(self) -> None:
+        """Pętla dispatchera: opróżnia outbox, a następnie czeka na powiadomienie."""
+        while True:
+            try:
+                async with self._running:
+                    while await self.dispatch_batch():
+                        pass
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def dispatch_batch(self) -> int:
+        """Przekazuje konsumentom jedną partię zdarzeń i usuwa ją z outboxa.
+
+        Returns:
+            Liczba odczytanych zdarzeń (0, jeśli outbox nie ma dostępnych zdarzeń).
+
+        Note:
+            Jeśli któryś konsument zgłosi wyjątek, partia pozostaje w outboxie
+            i zostanie przekazana ponownie po retry_delay (z wyjątkiem zdarzeń,
+            które wyczerpały max_attempts prób).
+        """
+        claimed = await run_in_threadpool(self._claim_batch)
+        if not claimed:
+            return 0
+        events = [event for event, _ in claimed]
+        failed = False
+        for consumer in self._consumers:
+            try:
+                await consumer(events)
+            except Exception:
+                failed = True
+                logger.exception("Outbox consumer %r failed", consumer)
+
+        if failed:
+            done = [event.id for event, attempts in claimed if attempts >= self.max_attempts]
+            if done:
+                logger.error("Dropping %d outbox events after %d attempts", len(done), self.max_attempts)
+        else:
+            done = [event.id for event in events]
+            self.dispatched_events += len(events)
+        if done:
+            await run_in_threadpool(self._delete_batch, done)
+        return len(events)
+
+    def _claim_batch(self) -> List[Tuple[AnimalEvent, int]]:
+        """Odczytuje partię dostępnych zdarzeń i oznacza ją jako przekazywaną.
+
+        Wiersze blokowane są przed innymi workerami (FOR UPDATE SKIP LOCKED)
+        tylko na czas tej krótkiej transakcji.
+
+        Returns:
+            Lista par (zdarzenie, numer bieżącej próby przekazania).
+        """
+        now = _utcnow()
+        with session_scope(self.app) as db:
+            rows: List[OutboxEvent] = db.execute(
+                select(OutboxEvent)
+                .where(or_(OutboxEvent.available_at.is_(None), OutboxEvent.available_at <= now))
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not rows:
+                return []
+            if len(rows) == self.batch_size and rows[-1].transaction_id is not None:
+                # partia nie dzieli zdarzeń jednej transakcji (np. operacji masowej)
+                rows += db.execute(
+                    select(OutboxEvent)
+                    .where(
+                        OutboxEvent.transaction_id == rows[-1].transaction_id,
+                        OutboxEvent.id > rows[-1].id,
+                        or_(OutboxEvent.available_at.is_(None), OutboxEvent.available_at <= now),
+                    )
+                    .order_by(OutboxEvent.id)
+                    .with_for_update(skip_locked=True)
+                ).scalars().all()
+            claimed = [
+                (
+                    EVENT_TYPES[row.event_type](
+                        species=row.species,
+                        animal_id=row.animal_id,
+                        payload=row.payload,
+                        id=row.id,
+                    ),
+                    row.attempts + 1,
+                )
+                for row in rows
+            ]
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_([row.id for row in rows]))
+                .values(attempts=OutboxEvent.attempts + 1, available_at=now + timedelta(seconds=self.retry_delay))
+            )
+            db.commit()
+        return claimed
+
+    def _delete_batch(self, ids: List[int]) -> None:
+        """Usuwa przekazane zdarzenia w osobnej, krótkiej transakcji."""
+        with session_scope(self.app) as db:
+            db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+            db.commit()
+
+
+def _utcnow() -> datetime:
+    """Zwraca bieżący czas UTC bez strefy (format kolumn DateTime outboxa)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Globalna instancja dispatchera zdarzeń
+dispatcher: OutboxDispatcher = OutboxDispatcher()
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, List, Literal
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping
+from sqlalchemy.orm import Session
+from .database import session_scope
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _export_value(value: Any) -> Any:
+    """Zamienia wartość kolumny na wartość eksportowaną (enum -> wartość, data -> ISO 8601)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(batches: Iterable[List[RowMapping]]) -> Iterator[bytes]:
+    """Koduje partie wierszy jako NDJSON (jeden obiekt JSON w linii).
+
+    Args:
+        batches: Partie wierszy (mapowania kolumna -> wartość).
+
+    Yields:
+        Jeden fragment odpowiedzi na partię wierszy.
+    """
+    for batch in batches:
+        yield "".join(
+            json.dumps({key: _export_value(value) for key, value in row.items()}, ensure_ascii=False) + "\n"
+            for row in batch
+        ).encode()
+
+
+def encode_csv(batches: Iterable[List[RowMapping]], columns: List[str]) -> Iterator[bytes]:
+    """Koduje partie wierszy jako CSV z nagłówkiem.
+
+    Args:
+        batches: Partie wierszy (mapowania kolumna -> wartość).
+        columns: Nazwy kolumn w kolejności nagłówka.
+
+    Yields:
+        Nagłówek, a następnie jeden fragment odpowiedzi na partię wierszy.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_export_value(row[column]) for column in columns] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    app: Any,
+    model: Any,
+    load_batches: Callable[[Session], Iterable[List[RowMapping]]],
+    export_format: ExportFormat,
+) -> StreamingResponse:
+    """Tworzy strumieniową odpowiedź z eksportem tabeli zwierząt.
+
+    Sesja bazy danych otwierana jest dopiero przy wysyłaniu odpowiedzi i zamykana
+    po wysłaniu ostatniego fragmentu, więc w pamięci znajduje się co najwyżej
+    jedna partia wierszy.
+
+    Args:
+        app: Aplikacja FastAPI (do tworzenia sesji z uwzględnieniem nadpisań get_db).
+        model: Model ORM eksportowanej tabeli (Dog lub Cat).
+        load_batches: Funkcja zwracająca partie wierszy dla podanej sesji.
+        export_format: Format eksportu ("ndjson" lub "csv").
+
+    Returns:
+        Odpowiedź StreamingResponse z nagłówkiem Content-Disposition.
+    """
+    columns = [column.key for column in model.__table__.columns]
+
+    def body() -> Iterator[bytes]:
+        with session_scope(app) as db:
+            batches = load_batches(db)
+            if export_format == "csv":
+                yield from encode_csv(batches, columns)
+            else:
+                yield from encode_ndjson(batches)
+
+    filename = f"{model.__tablename__}.{export_format}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
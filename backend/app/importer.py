@@ -0,0 +1,272 @@
+import argparse
+import csv
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Type
+from fastapi import Request
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from .config import settings
+from .crud.occupancy import record_stay_changes, stay_of
+from .database import SessionLocal, init_db, session_scope
+from .events import AnimalsImported, dispatcher, record_event
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# Rozmiar treści żądania (w bajtach) trzymanej w pamięci przed zapisem do pliku tymczasowego
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+class ImportValidationError(ValueError):
+    """Błąd walidacji wiersza importowanego pliku.
+
+    Attributes:
+        line: Numer linii pliku, w której wystąpił błąd.
+        errors: Lista błędów walidacji (format błędów Pydantic).
+    """
+
+    def __init__(self, line: int, errors: List[Dict[str, Any]]) -> None:
+        super().__init__(f"Invalid record at line {line}")
+        self.line = line
+        self.errors = errors
+
+
+def read_records(lines: Iterable[str], import_format: ImportFormat) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Odczytuje kolejne rekordy pliku CSV (z nagłówkiem) lub NDJSON.
+
+    Puste pola CSV są traktowane jako brak wartości (None).
+
+    Args:
+        lines: Linie pliku (np. otwarty plik tekstowy).
+        import_format: Format pliku ("ndjson" lub "csv").
+
+    Yields:
+        Krotki (numer linii, rekord).
+
+    Raises:
+        ImportValidationError: Jeśli linia NDJSON nie jest obiektem JSON.
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, {key: value if value != "" else None for key, value in record.items()}
+        return
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ImportValidationError(line_no, [{"type": "json_invalid", "msg": "Invalid JSON"}])
+        if not isinstance(record, dict):
+            raise ImportValidationError(line_no, [{"type": "model_type", "msg": "Expected a JSON object"}])
+        yield line_no, record
+
+
+def validate_chunks(
+    records: Iterable[Tuple[int, Dict[str, Any]]],
+    schema: Type[BaseModel],
+    chunk_size: int,
+) -> Iterator[List[BaseModel]]:
+    """Waliduje rekordy schematem Pydantic i grupuje je w partie.
+
+    Args:
+        records: Krotki (numer linii, rekord) z read_records.
+        schema: Schemat tworzenia zwierzęcia (DogCreate lub CatCreate).
+        chunk_size: Maksymalna liczba rekordów w partii.
+
+    Yields:
+        Partie zwalidowanych obiektów schematu.
+
+    Raises:
+        ImportValidationError: Przy pierwszym niepoprawnym rekordzie.
+    """
+    chunk: List[BaseModel] = []
+    for line_no, record in records:
+        try:
+            chunk.append(schema.model_validate(record))
+        except ValidationError as exc:
+            raise ImportValidationError(line_no, exc.errors(include_url=False, include_context=False))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy_field(value: Any) -> str:
+    """Koduje wartość pola CSV dla COPY: None jako niecytowane puste pole (NULL), napisy zawsze cytowane."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+def _copy_rows(db: Session, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """Zapisuje partię wierszy poleceniem COPY FROM STDIN (PostgreSQL, psycopg2)."""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    # napisy są cytowane, więc tylko niecytowane puste pola (None) oznaczają NULL;
+    # csv.QUOTE_NONNUMERIC cytowałby też None jako "" (pusty napis zamiast NULL)
+    for row in rows:
+        buffer.write(",".join(_copy_field(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    statement = f"COPY {quote(table.name)} ({', '.join(quote(column) for column in columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
+
+
+def import_animals(
+    db: Session,
+    model: Any,
+    schema: Type[BaseModel],
+    lines: Iterable[str],
+    import_format: ImportFormat,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """Importuje zwierzęta z pliku CSV lub NDJSON w jednej transakcji.
+
+    Rekordy są walidowane partiami (te same reguły co przy POST), a każda
+    partia zapisywana jest przez COPY FROM STDIN na PostgreSQL lub jedną
+    wielowierszową instrukcją INSERT na pozostałych bazach danych.
+    Pierwszy niepoprawny rekord wycofuje cały import.
+
+    Args:
+        db: Sesja bazy danych.
+        model: Model ORM tabeli docelowej (Dog lub Cat).
+        schema: Schemat walidacji rekordów (DogCreate lub CatCreate).
+        lines: Linie importowanego pliku.
+        import_format: Format pliku ("ndjson" lub "csv").
+        chunk_size: Liczba rekordów w partii (domyślnie IMPORT_CHUNK_SIZE).
+
+    Returns:
+        Liczba zaimportowanych zwierząt.
+
+    Raises:
+        ImportValidationError: Jeśli któryś rekord jest niepoprawny.
+
+    Note:
+        Zamiast zdarzenia dla każdego wiersza w outboxie zapisywane jest jedno
+        zdarzenie AnimalsImported; liczniki zajętości są po nim uzgadniane z bazą.
+        Dzienne zestawienie zajętości aktualizowane jest w tej samej transakcji.
+    """
+    use_copy = db.get_bind().dialect.name == "postgresql"
+    chunks = validate_chunks(read_records(lines, import_format), schema, chunk_size or settings.IMPORT_CHUNK_SIZE)
+    imported = 0
+    try:
+        for chunk in chunks:
+            if use_copy:
+                _copy_rows(db, model.__table__, [item.model_dump(mode="json") for item in chunk])
+            else:
+                db.execute(insert(model).values([item.model_dump() for item in chunk]))
+            record_stay_changes(db, model.__tablename__, [(None, stay_of(item)) for item in chunk])
+            imported += len(chunk)
+        if imported:
+            record_event(db, AnimalsImported(model.__tablename__, None, {"count": imported}))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if imported:
+        dispatcher.notify()
+    return imported
+
+
+def _import_file(app: Any, model: Any, schema: Type[BaseModel], spool: Any, import_format: ImportFormat) -> int:
+    """Importuje buforowaną treść żądania w krótkotrwałej sesji bazy danych."""
+    lines = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+    try:
+        with session_scope(app) as db:
+            return import_animals(db, model, schema, lines, import_format)
+    finally:
+        lines.detach()
+
+
+async def import_from_request(
+    request: Request,
+    model: Any,
+    schema: Type[BaseModel],
+    import_format: ImportFormat,
+) -> int:
+    """Importuje zwierzęta z treści żądania HTTP.
+
+    Treść jest odbierana strumieniowo do pliku tymczasowego (w pamięci do
+    SPOOL_MAX_SIZE), a następnie importowana w wątku roboczym.
+
+    Args:
+        request: Żądanie HTTP z plikiem CSV lub NDJSON w treści.
+        model: Model ORM tabeli docelowej (Dog lub Cat).
+        schema: Schemat walidacji rekordów (DogCreate lub CatCreate).
+        import_format: Format pliku ("ndjson" lub "csv").
+
+    Returns:
+        Liczba zaimportowanych zwierząt.
+
+    Raises:
+        ImportValidationError: Jeśli któryś rekord jest niepoprawny.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+b") as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        return await run_in_threadpool(_import_file, request.app, model, schema, spool, import_format)
+
+
+def detect_format(path: Path) -> ImportFormat:
+    """Rozpoznaje format pliku po rozszerzeniu (.csv lub NDJSON dla pozostałych)."""
+    return "csv" if path.suffix.lower() == ".csv" else "ndjson"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Importuje plik z linii poleceń: python -m app.importer {dogs,cats} PLIK.
+
+    Args:
+        argv: Argumenty linii poleceń (domyślnie sys.argv).
+
+    Returns:
+        Kod wyjścia procesu.
+    """
+    from .models import Cat, Dog
+    from .schemas.cat import CatCreate
+    from .schemas.dog import DogCreate
+
+    targets = {"dogs": (Dog, DogCreate), "cats": (Cat, CatCreate)}
+    parser = argparse.ArgumentParser(description="Import zwierząt z pliku CSV lub NDJSON")
+    parser.add_argument("species", choices=sorted(targets))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    model, schema = targets[args.species]
+    import_format = args.format or detect_format(args.path)
+    init_db()
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as lines:
+            count = import_animals(db, model, schema, lines, import_format, args.chunk_size)
+    except ImportValidationError as exc:
+        print(f"{exc}: {exc.errors}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    print(f"Imported {count} {args.species}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
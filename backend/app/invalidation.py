@@ -0,0 +1,59 @@
+from typing import Dict, List, Set, Tuple
+from starlette.concurrency import run_in_threadpool
+from .cache import entity_cache
+from .database import session_scope
+from .events import AnimalDeleted, AnimalEvent, AnimalUpdated, dispatcher
+from .versions import read_table_versions, table_versions
+from .websocket_manager import manager
+
+# Temat kanału (backplane) z informacjami o zapisach do tabel; nie ma subskrybentów WebSocket
+INVALIDATION_TOPIC = "table_changes"
+
+
+async def publish_table_changes(events: List[AnimalEvent]) -> None:
+    """Konsument zdarzeń domenowych rozsyłający zapisy do tabel wszystkim workerom.
+
+    Znane wersje tabel (ETag) i pamięci podręczne są lokalne dla procesu,
+    więc zapis wykonany w jednym workerze musi je unieważnić w pozostałych.
+    Dla każdej tabeli z partii zdarzeń publikowana jest jedna wiadomość
+    z identyfikatorami zmienionych lub usuniętych zwierząt i wspólną wersją
+    tabeli odczytaną z bazy danych (po commicie zapisów z partii).
+
+    Args:
+        events: Partia zdarzeń z outboxa.
+    """
+    changes: Dict[str, Set[int]] = {}
+    for event in events:
+        changed = changes.setdefault(event.species, set())
+        if isinstance(event, (AnimalUpdated, AnimalDeleted)) and event.animal_id is not None:
+            changed.add(event.animal_id)
+    versions = await run_in_threadpool(_read_versions)
+    for table, ids in changes.items():
+        await manager.broadcast(INVALIDATION_TOPIC, {
+            "table": table,
+            "ids": sorted(ids),
+            "version": versions.get(table, 0),
+        })
+
+
+def _read_versions() -> Dict[str, int]:
+    """Odczytuje wspólne wersje tabel w osobnej, krótkotrwałej sesji."""
+    with session_scope(dispatcher.app) as db:
+        return read_table_versions(db)
+
+
+def apply_table_changes(topic: str, message: dict) -> List[Tuple[str, dict]]:
+    """Hook menedżera WebSocket unieważniający lokalne wersje tabel i pamięć podręczną.
+
+    Ustawia wspólną wersję tabeli z wiadomości (nowy ETag, unieważnienie
+    stay_stats_cache) i usuwa z entity_cache wpisy zmienionych zwierząt.
+    Worker, który wykonał zapis, zna już tę wersję - wiadomość jej nie zmienia.
+
+    Args:
+        topic: Temat dostarczonej wiadomości.
+        message: Wiadomość {"table": nazwa tabeli, "ids": [...], "version": wersja tabeli}.
+    """
+    if topic == INVALIDATION_TOPIC:
+        table_versions.advance(message["table"], message["version"])
+        entity_cache.invalidate(message["table"], message["ids"])
+    return []
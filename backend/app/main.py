@@ -1,17 +1,116 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, List
 from fastapi import FastAPI
-from .routers import dog, cat, ws
+from starlette.concurrency import run_in_threadpool
+from .routers import dog, cat, animal, ws, metrics
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .models import dog as dog_model, cat as cat_model
+from .config import get_settings, settings
+from .database import dispose_db, init_db, session_scope
+from .crud.animal import refresh_occupancy
+from .occupancy import reconcile_periodically
+from .events import AnimalEvent, AnimalsImported, dispatcher
+from .schema import verify_schema_revision
+from .backplane import create_backplane
+from .invalidation import apply_table_changes, publish_table_changes
+from .versions import refresh_table_versions
+from .websocket_manager import manager
+from .startup import boot_metrics, warm_up
+
+logger = logging.getLogger(__name__)
+
+
+def _verify_schema() -> None:
+    """Sprawdza rewizję schematu bazy danych (migracje Alembic)."""
+    with session_scope(app) as db:
+        verify_schema_revision(db.connection())
+
+
+def _refresh_occupancy() -> None:
+    """Wczytuje liczniki zajętości i wersje tabel (ETag) w osobnej, krótkotrwałej sesji."""
+    with session_scope(app) as db:
+        refresh_occupancy(db)
+        refresh_table_versions(db)
+
+
+async def _refresh_occupancy_after_import(events: List[AnimalEvent]) -> None:
+    """Konsument zdarzeń uzgadniający liczniki zajętości po masowym imporcie.
+
+    Import nie zapisuje zdarzeń dla pojedynczych wierszy, więc liczniki
+    są wczytywane ponownie z bazy danych (przed wysyłką statystyk).
+    """
+    if any(isinstance(event, AnimalsImported) for event in events):
+        await run_in_threadpool(_refresh_occupancy)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Obsługuje start i zatrzymanie aplikacji.
+
+    Przy starcie wczytuje konfigurację, tworzy silniki bazy danych,
+    sprawdza rewizję schematu (bez tworzenia tabel), wczytuje liczniki
+    zajętości schroniska jednym zapytaniem i wspólne wersje tabel (ETag), opcjonalnie rozgrzewa pule
+    połączeń (STARTUP_WARMUP), uruchamia kanał rozsyłania wiadomości
+    WebSocket między workerami (WS_BACKPLANE), okresowe uzgadnianie liczników
+    i wersji tabel z bazą danych oraz dispatcher zdarzeń z outboxa, który przekazuje zmiany
+    do WebSocketów (a przy kilku workerach - także unieważnienia wersji tabel
+    i pamięci podręcznych). Czas startu zapisywany jest w boot_metrics.
+
+    Args:
+        app: Instancja aplikacji FastAPI.
+    """
+    with boot_metrics.phase("init_db"):
+        get_settings()
+        init_db()
+
+    with boot_metrics.phase("schema_check"):
+        await run_in_threadpool(_verify_schema)
+
+    with boot_metrics.phase("occupancy"):
+        try:
+            await run_in_threadpool(_refresh_occupancy)
+        except Exception:
+            # liczniki zostaną wczytane przy pierwszym odczycie
+            logger.exception("Could not prime occupancy counters at startup")
+
+    if settings.STARTUP_WARMUP:
+        with boot_metrics.phase("warmup"):
+            await warm_up(app)
+
+    with boot_metrics.phase("backplane"):
+        await manager.use_backplane(create_backplane())
+
+    reconcile_task = asyncio.create_task(
+        reconcile_periodically(_refresh_occupancy, settings.OCCUPANCY_RECONCILE_INTERVAL)
+    )
+    dispatcher.subscribe(_refresh_occupancy_after_import)
+    dispatcher.subscribe(ws.publish_stats)
+    manager.add_delivery_hook(ws.stats_deltas)
+    if settings.WS_BACKPLANE != "memory":
+        # znane wersje tabel, pamięci podręczne i liczniki są lokalne - zapisy innych workerów przychodzą z kanału
+        dispatcher.subscribe(publish_table_changes)
+        manager.add_delivery_hook(apply_table_changes)
+        manager.add_delivery_hook(ws.sync_counters)
+    dispatcher.start(app)
+    logger.info("Application ready in %.3f s", boot_metrics.ready())
+    try:
+        yield
+    finally:
+        await dispatcher.stop()
+        await manager.close_backplane()
+        reconcile_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await reconcile_task
+        await dispose_db()
 
-# konfiguracja i inicjalizacja bazy danych
-Base.metadata.create_all(bind=engine)
 
 # Inicjalizacja aplikacji FastAPI
 app = FastAPI(
     title="Animal Shelter Manager API",
     description="REST API do zarządzania psami i kotami w schronisku",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Lista dozwolonych origins dla CORS
@@ -29,10 +128,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Rejestracja routerów
 app.include_router(dog.router)
 app.include_router(cat.router)
+app.include_router(animal.router)
 app.include_router(ws.router)
+app.include_router(metrics.router)
 
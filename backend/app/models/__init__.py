@@ -1,2 +1,5 @@
 from .dog import Dog, DogStatus, DogSize
 from .cat import Cat, CatStatus, CatSize
+from .outbox import OutboxEvent
+from .occupancy import OccupancyDaily
+from .table_version import TableVersion
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Date, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Date, Enum, Boolean, Index, text
 from ..database import Base
+from .search import register_name_search
 import enum
 
 
@@ -45,6 +46,18 @@ class Cat(Base):
         indoor_only: Czy kot jest przeznaczony tylko do życia w domu (wymagane, domyślnie False).
     """
     __tablename__ = "cats"
+    __table_args__ = (
+        # filtry zakresu dat przyjęcia i paginacja keyset (admitted_date, id)
+        Index("ix_cats_admitted_date_id", "admitted_date", "id"),
+        # zwierzęta obecnie w schronisku (częściowy indeks, tylko status arrived)
+        Index(
+            "ix_cats_in_shelter",
+            "admitted_date",
+            "id",
+            postgresql_where=text("status = 'arrived'"),
+            sqlite_where=text("status = 'arrived'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -53,6 +66,10 @@ class Cat(Base):
     sex = Column(String(10))
     neutered = Column(Boolean, nullable=False, default=False)
     admitted_date = Column(Date, nullable=False)
-    released_date = Column(Date)
-    status = Column(Enum(CatStatus), nullable=False, default=CatStatus.arrived)
+    released_date = Column(Date, index=True)
+    status = Column(Enum(CatStatus), nullable=False, default=CatStatus.arrived, index=True)
     indoor_only = Column(Boolean, nullable=False, default=False)
+
+
+# indeks wyszukiwania imion (FTS5 na SQLite, trigramy pg_trgm na PostgreSQL)
+register_name_search(Cat.__table__)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Date, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Date, Enum, Boolean, Index, text
 from ..database import Base
+from .search import register_name_search
 import enum
 
 class DogSize(str, enum.Enum):
@@ -41,6 +42,18 @@ class Dog(Base):
         status: Aktualny status psa (wymagane, domyślnie 'arrived').
     """
     __tablename__ = "dogs"
+    __table_args__ = (
+        # filtry zakresu dat przyjęcia i paginacja keyset (admitted_date, id)
+        Index("ix_dogs_admitted_date_id", "admitted_date", "id"),
+        # zwierzęta obecnie w schronisku (częściowy indeks, tylko status arrived)
+        Index(
+            "ix_dogs_in_shelter",
+            "admitted_date",
+            "id",
+            postgresql_where=text("status = 'arrived'"),
+            sqlite_where=text("status = 'arrived'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -49,6 +62,9 @@ class Dog(Base):
     sex = Column(String(10))
     neutered = Column(Boolean, nullable=False, default=False)
     admitted_date = Column(Date, nullable=False)
-    released_date = Column(Date)
-    status = Column(Enum(DogStatus), nullable=False, default=DogStatus.arrived)
+    released_date = Column(Date, index=True)
+    status = Column(Enum(DogStatus), nullable=False, default=DogStatus.arrived, index=True)
 
+
+# indeks wyszukiwania imion (FTS5 na SQLite, trigramy pg_trgm na PostgreSQL)
+register_name_search(Dog.__table__)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Date, Integer, String
+from ..database import Base
+
+
+class OccupancyDaily(Base):
+    """Model ORM dziennego zestawienia przyjęć i wypuszczeń zwierząt.
+
+    Tabela przechowuje zmiany liczby zwierząt w schronisku w danym dniu
+    oraz liczbę zwierząt na koniec dnia (occupancy) - sumę (admitted - released)
+    wszystkich dni do tego dnia włącznie. Wiersze aktualizowane są przyrostowo
+    w tej samej transakcji co zmiana dat przyjęcia/wypuszczenia zwierzęcia.
+
+    Attributes:
+        species: Gatunek zwierząt ("dogs" lub "cats", część klucza głównego).
+        day: Dzień (część klucza głównego).
+        admitted: Liczba zwierząt przyjętych w tym dniu.
+        released: Liczba zwierząt wypuszczonych w tym dniu (nie ma ich już w schronisku na koniec dnia).
+        occupancy: Liczba zwierząt w schronisku na koniec dnia (suma narastająca).
+    """
+    __tablename__ = "occupancy_daily"
+
+    species = Column(String(10), primary_key=True)
+    day = Column(Date, primary_key=True)
+    admitted = Column(Integer, nullable=False, default=0)
+    released = Column(Integer, nullable=False, default=0)
+    occupancy = Column(Integer, nullable=False, default=0, server_default="0")
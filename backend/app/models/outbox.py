@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, func
+from ..database import Base
+
+
+class OutboxEvent(Base):
+    """Model ORM reprezentujący zdarzenie domenowe w tabeli outbox.
+
+    Zdarzenia zapisywane są w tej samej transakcji co zmiana danych zwierzęcia
+    i usuwane po przekazaniu ich do konsumentów przez dispatcher. Odczytane
+    zdarzenie jest niedostępne dla dispatcherów do available_at, więc
+    zdarzenia nieprzyjęte przez konsumenta (lub odczytane przez worker, który
+    uległ awarii) są przekazywane ponownie.
+
+    Attributes:
+        id: Unikalny identyfikator zdarzenia (klucz główny, wyznacza kolejność).
+        event_type: Typ zdarzenia (AnimalCreated, AnimalUpdated, AnimalDeleted, AnimalsImported).
+        species: Gatunek zwierzęcia ("dogs" lub "cats").
+        animal_id: Identyfikator zwierzęcia, którego dotyczy zdarzenie (pusty dla importu).
+        payload: Dane zdarzenia w formacie JSON.
+        created_at: Czas zapisania zdarzenia.
+        transaction_id: Identyfikator transakcji, w której zapisano zdarzenie (wspólny dla operacji masowej).
+        attempts: Liczba dotychczasowych prób przekazania zdarzenia.
+        available_at: Czas (UTC), od którego zdarzenie może zostać odczytane ponownie (pusty - od razu).
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String(50), nullable=False)
+    species = Column(String(10), nullable=False)
+    animal_id = Column(Integer)
+    payload = Column(JSON, nullable=False, default=dict)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    transaction_id = Column(String(32))
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    available_at = Column(DateTime)
@@ -0,0 +1,104 @@
+from typing import List
+from sqlalchemy import DDL, Table, event
+
+
+def fts_table_name(table: str) -> str:
+    """Zwraca nazwę tabeli FTS5 z imionami zwierząt (SQLite), np. dogs_name_fts."""
+    return f"{table}_name_fts"
+
+
+def trigram_index_name(table: str) -> str:
+    """Zwraca nazwę indeksu trigramowego GIN imion zwierząt (PostgreSQL), np. ix_dogs_name_trgm."""
+    return f"ix_{table}_name_trgm"
+
+
+def prefix_index_name(table: str) -> str:
+    """Zwraca nazwę indeksu lower(name) dla wyszukiwania po prefiksie, np. ix_dogs_name_lower."""
+    return f"ix_{table}_name_lower"
+
+
+def sqlite_search_ddl(table: str) -> List[str]:
+    """Instrukcje tworzące indeks wyszukiwania imion na SQLite.
+
+    Tabela FTS5 z tokenizerem trigram (wyszukiwanie podciągów bez względu
+    na wielkość liter) indeksuje kolumnę name tabeli zwierząt (external
+    content), a wyzwalacze aktualizują ją przy każdym zapisie - również
+    przy operacjach masowych i imporcie. Indeks wyrażenia lower(name)
+    obsługuje zapytania krótsze niż trigram (zakres lower(name) >= prefiks).
+
+    Args:
+        table: Nazwa tabeli zwierząt ("dogs" lub "cats").
+
+    Returns:
+        Lista instrukcji SQL.
+    """
+    fts = fts_table_name(table)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"name, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name); END",
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, name) VALUES ('delete', old.id, old.name); END",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF name ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, name) VALUES ('delete', old.id, old.name); "
+        f"INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name); END",
+        f"CREATE INDEX {prefix_index_name(table)} ON {table} (lower(name))",
+    ]
+
+
+def postgresql_search_ddl(table: str) -> List[str]:
+    """Instrukcje tworzące indeks wyszukiwania imion na PostgreSQL.
+
+    Indeks GIN z gin_trgm_ops (rozszerzenie pg_trgm) na lower(name) obsługuje
+    zarówno LIKE '%...%', jak i operator podobieństwa %. Zapytania krótsze
+    niż trigram (LIKE 'prefiks%') korzystają z indeksu B-tree na lower(name)
+    z text_pattern_ops (porównanie bajtowe niezależne od collation bazy).
+
+    Args:
+        table: Nazwa tabeli zwierząt ("dogs" lub "cats").
+
+    Returns:
+        Lista instrukcji SQL.
+    """
+    return [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE INDEX {trigram_index_name(table)} ON {table} USING gin (lower(name) gin_trgm_ops)",
+        f"CREATE INDEX {prefix_index_name(table)} ON {table} (lower(name) text_pattern_ops)",
+    ]
+
+
+def register_name_search(table: Table) -> None:
+    """Dołącza indeks wyszukiwania imion do tworzenia i usuwania tabeli (create_all/drop_all).
+
+    Obiekty wyszukiwania nie są częścią metadanych (tabela wirtualna
+    i wyzwalacze SQLite, indeksy wyrażeń z klasami operatorów), więc tworzone
+    są zdarzeniami DDL dla odpowiedniego dialektu, a w bazach zarządzanych
+    migracjami - przez rewizje 0003 i 0008.
+
+    Args:
+        table: Tabela zwierząt z kolumnami id i name.
+    """
+    for statement in sqlite_search_ddl(table.name):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in postgresql_search_ddl(table.name):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    # wyzwalacze SQLite i indeks PostgreSQL usuwane są razem z tabelą
+    event.listen(
+        table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts_table_name(table.name)}").execute_if(dialect="sqlite"),
+    )
+
+
+def is_search_object(name: str) -> bool:
+    """Sprawdza, czy obiekt bazy danych należy do indeksu wyszukiwania imion.
+
+    Używane przez Alembic (include_name), żeby porównanie schematu z modelami
+    pomijało tabele FTS5 (wraz z tabelami pomocniczymi), indeksy trigramowe
+    i indeksy lower(name).
+    """
+    return any(
+        name.startswith(fts_table_name(table)) or name in (trigram_index_name(table), prefix_index_name(table))
+        for table in ("dogs", "cats")
+    )
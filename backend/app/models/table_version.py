@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, String
+from ..database import Base
+
+
+class TableVersion(Base):
+    """Model ORM wspólnej wersji tabeli (ETag) odczytywanej przez wszystkie workery.
+
+    Wersja zwiększana jest w tej samej transakcji co zapis do tabeli
+    (razem ze zdarzeniem w outboxie), więc jej wartość po commicie jest
+    taka sama dla każdego workera i przetrwa restart aplikacji.
+
+    Attributes:
+        table_name: Nazwa tabeli ("dogs" lub "cats", klucz główny).
+        version: Numer wersji tabeli.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
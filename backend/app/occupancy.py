@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from enum import Enum
+from threading import Lock
+from typing import Callable, Dict, Optional, Union
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Statusy zliczane dla każdego gatunku (wspólne dla DogStatus i CatStatus)
+STATUSES = ("arrived", "adopted", "returned")
+
+
+class OccupancyCounters:
+    """Liczniki zwierząt w schronisku utrzymywane w pamięci.
+
+    Dla każdego gatunku przechowuje liczbę zwierząt w danym statusie.
+    Liczniki są wczytywane jednym zapytaniem agregującym, a następnie
+    aktualizowane przyrostowo przez operacje CRUD, więc odczyt statystyk
+    nie wymaga zapytań do bazy danych.
+
+    Attributes:
+        primed: Czy liczniki zostały wczytane z bazy danych.
+    """
+
+    def __init__(self) -> None:
+        """Inicjalizuje puste, niewczytane liczniki."""
+        self._lock = Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self.primed: bool = False
+
+    def load(self, stats: Dict[str, Dict[str, int]]) -> None:
+        """Nadpisuje liczniki wynikiem zapytania agregującego.
+
+        Args:
+            stats: Statystyki w formacie get_shelter_stats ({"dogs": {...}, "cats": {...}}).
+        """
+        counts = {
+            species: {
+                "arrived": values["current_in_shelter"],
+                "adopted": values["adopted_total"],
+                "returned": values["returned_total"],
+            }
+            for species, values in stats.items()
+        }
+        with self._lock:
+            self._counts = counts
+            self.primed = True
+
+    def load_species(self, species: str, values: Dict[str, int]) -> None:
+        """Nadpisuje liczniki jednego gatunku statystykami z innego workera.
+
+        Args:
+            species: Gatunek ("dogs" lub "cats").
+            values: Statystyki w formacie get_dog_stats / get_cat_stats.
+
+        Note:
+            Przed wczytaniem wszystkich liczników z bazy danych statystyki są
+            pomijane - pozostałe gatunki nie miałyby poprawnych wartości.
+        """
+        with self._lock:
+            if not self.primed:
+                return
+            self._counts[species] = {
+                "arrived": values["current_in_shelter"],
+                "adopted": values["adopted_total"],
+                "returned": values["returned_total"],
+            }
+
+    def reset(self) -> None:
+        """Oznacza liczniki jako niewczytane (kolejny odczyt wczyta je z bazy)."""
+        with self._lock:
+            self._counts = {}
+            self.primed = False
+
+    def apply(
+        self,
+        species: str,
+        old_status: Optional[Union[str, Enum]],
+        new_status: Optional[Union[str, Enum]],
+    ) -> None:
+        """Aktualizuje liczniki o zmianę statusu jednego zwierzęcia.
+
+        Args:
+            species: Gatunek ("dogs" lub "cats").
+            old_status: Poprzedni status (None dla nowo utworzonego zwierzęcia).
+            new_status: Nowy status (None dla usuniętego zwierzęcia).
+
+        Note:
+            Zmiany przed wczytaniem liczników są pomijane - wczytanie i tak
+            odczyta aktualny stan bazy danych.
+        """
+        old_key = _status_key(old_status)
+        new_key = _status_key(new_status)
+        if old_key == new_key:
+            return
+        with self._lock:
+            if not self.primed:
+                return
+            counts = self._counts.setdefault(species, dict.fromkeys(STATUSES, 0))
+            if old_key is not None:
+                counts[old_key] = counts.get(old_key, 0) - 1
+            if new_key is not None:
+                counts[new_key] = counts.get(new_key, 0) + 1
+
+    def snapshot(self, species: str) -> Optional[Dict[str, int]]:
+        """Zwraca statystyki gatunku w formacie get_dog_stats / get_cat_stats.
+
+        Args:
+            species: Gatunek ("dogs" lub "cats").
+
+        Returns:
+            Słownik statystyk lub None, jeśli liczniki nie zostały jeszcze wczytane.
+        """
+        with self._lock:
+            if not self.primed:
+                return None
+            counts = dict(self._counts.get(species, {}))
+        return {
+            "current_in_shelter": counts.get("arrived", 0),
+            "adopted_total": counts.get("adopted", 0),
+            "returned_total": counts.get("returned", 0),
+            f"all_{species}_total": sum(counts.values()),
+        }
+
+
+def _status_key(status: Optional[Union[str, Enum]]) -> Optional[str]:
+    """Zamienia status (enum lub napis) na klucz liczników."""
+    if status is None:
+        return None
+    return status.value if isinstance(status, Enum) else str(status)
+
+
+async def reconcile_periodically(refresh: Callable[[], None], interval: float) -> None:
+    """Okresowo uzgadnia liczniki ze stanem bazy danych.
+
+    Koryguje ewentualny dryf liczników (np. zmiany wykonane poza aplikacją).
+    Synchroniczne odświeżenie wykonywane jest w puli wątków, żeby nie
+    blokować pętli zdarzeń.
+
+    Args:
+        refresh: Funkcja wczytująca liczniki z bazy danych.
+        interval: Odstęp między uzgodnieniami w sekundach.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(refresh)
+        except Exception:
+            logger.exception("Occupancy counters reconciliation failed")
+
+
+# Globalna instancja liczników zajętości schroniska
+counters: OccupancyCounters = OccupancyCounters()
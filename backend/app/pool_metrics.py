@@ -0,0 +1,145 @@
+import time
+from threading import Lock
+from typing import Any, Dict, Optional, Type
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """Liczniki działania puli połączeń z bazą danych.
+
+    Liczniki aktualizowane są przez zdarzenia puli SQLAlchemy (checkout,
+    checkin, connect), a czas oczekiwania na połączenie mierzy klasa puli
+    utworzona przez instrumented_pool_class.
+
+    Attributes:
+        checkouts: Liczba pobrań połączenia z puli.
+        checkins: Liczba zwrotów połączenia do puli.
+        connections_created: Liczba nowych połączeń z bazą danych.
+        overflow_events: Liczba połączeń utworzonych ponad pool_size (max_overflow).
+        timeouts: Liczba pobrań zakończonych przekroczeniem pool_timeout.
+        wait_time_total: Łączny czas oczekiwania na połączenie w sekundach.
+        wait_time_max: Najdłuższe oczekiwanie na połączenie w sekundach.
+    """
+
+    def __init__(self) -> None:
+        """Inicjalizuje wyzerowane liczniki (bez podłączonego silnika)."""
+        self._lock = Lock()
+        self._engine: Optional[Engine] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Zeruje liczniki."""
+        with self._lock:
+            self.checkouts: int = 0
+            self.checkins: int = 0
+            self.connections_created: int = 0
+            self.overflow_events: int = 0
+            self.timeouts: int = 0
+            self.wait_time_total: float = 0.0
+            self.wait_time_max: float = 0.0
+
+    def attach(self, engine: Engine) -> None:
+        """Rejestruje nasłuchiwanie zdarzeń puli silnika.
+
+        Zdarzenia rejestrowane są na silniku, więc obejmują także pulę
+        utworzoną ponownie po engine.dispose().
+
+        Args:
+            engine: Silnik synchroniczny (dla AsyncEngine - async_engine.sync_engine).
+        """
+        self._engine = engine
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+
+    def _on_checkout(self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        pool = self._engine.pool if self._engine is not None else None
+        overflow = getattr(pool, "overflow", None)
+        with self._lock:
+            self.connections_created += 1
+            # nowe połączenie przy pełnej puli pochodzi z max_overflow
+            if overflow is not None and overflow() > 0:
+                self.overflow_events += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Zapisuje czas oczekiwania na połączenie z puli.
+
+        Args:
+            seconds: Czas oczekiwania w sekundach.
+            timed_out: Czy oczekiwanie zakończyło się przekroczeniem pool_timeout.
+        """
+        with self._lock:
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Zwraca liczniki i bieżący stan puli.
+
+        Returns:
+            Słownik z licznikami, czasami oczekiwania (w ms) oraz liczbą
+            połączeń w użyciu i ponad pool_size.
+        """
+        pool = self._engine.pool if self._engine is not None else None
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            stats: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connections_created": self.connections_created,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_time_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+        stats["pool_size"] = pool.size() if hasattr(pool, "size") else None
+        stats["in_use"] = pool.checkedout() if hasattr(pool, "checkedout") else None
+        stats["overflow"] = max(pool.overflow(), 0) if hasattr(pool, "overflow") else None
+        return stats
+
+
+class _TimedCheckout:
+    """Domieszka puli mierząca czas oczekiwania na połączenie."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def instrumented_pool_class(pool_class: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """Tworzy klasę puli zapisującą czas oczekiwania na połączenie.
+
+    Args:
+        pool_class: Bazowa klasa puli (np. QueuePool, AsyncAdaptedQueuePool).
+        metrics: Liczniki, do których zapisywane są pomiary.
+
+    Returns:
+        Podklasa pool_class do przekazania jako poolclass w create_engine.
+    """
+    return type(f"Instrumented{pool_class.__name__}", (_TimedCheckout, pool_class), {"metrics": metrics})
+
+
+# Liczniki pul silników aplikacji
+sync_pool_metrics: PoolMetrics = PoolMetrics()
+async_pool_metrics: PoolMetrics = PoolMetrics()
@@ -0,0 +1,150 @@
+from datetime import date, timedelta
+from typing import Any, List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..crud import animal as crud, async_animal as async_crud
+from ..serialization import encode_rows, json_bytes_response, select_fields
+from ..versions import not_modified
+from ..schemas.animal import Animal, AnimalFilter, LengthOfStay, OccupancyDay
+
+router = APIRouter(prefix="/animals", tags=["animals"])
+
+# Domyślna długość historii zajętości (dni do dzisiaj włącznie)
+DEFAULT_HISTORY_DAYS = 30
+
+@router.get("/", response_model=List[Animal])
+async def list_animals(
+    request: Request,
+    response: Response,
+    filters: AnimalFilter = Depends(),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Pola odpowiedzi oddzielone przecinkami, np. species,id,name"),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[Animal]:
+    """Pobiera listę psów i kotów (widok całego schroniska).
+
+    Args:
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówków ETag i kursora).
+        filters: Filtry listy (gatunek, status, rozmiar, sterylizacja, zakresy dat).
+        limit: Maksymalna liczba zwierząt na stronie (bez limitu, jeśli nie podano).
+        cursor: Kursor następnej strony z nagłówka X-Next-Cursor.
+        fields: Pola odpowiedzi oddzielone przecinkami (domyślnie wszystkie).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Lista zwierząt w kolejności daty przyjęcia, gatunku i ID.
+
+    Raises:
+        HTTPException: 400 jeśli kursor jest nieprawidłowy,
+            422 jeśli fields zawiera pole spoza schematu.
+
+    Note:
+        Obie tabele odczytywane są jednym zapytaniem UNION ALL, a gatunek
+        zwracany jest w polu species. ETag łączy wersje tabel psów i kotów.
+    """
+    try:
+        selected = select_fields(fields, crud.ANIMAL_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    cached = not_modified(request, response, "dogs", "cats")
+    if cached is not None:
+        return cached
+    try:
+        rows, next_cursor = await async_crud.get_animal_rows(db, filters, limit, cursor, selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_bytes_response(encode_rows(rows, selected), response)
+
+@router.get("/stats")
+async def animal_stats(
+    request: Request,
+    response: Response,
+    filters: AnimalFilter = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Dict[str, int]]:
+    """Zwraca statystyki psów i kotów spełniających filtry.
+
+    Args:
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówka ETag).
+        filters: Filtry (te same co dla listy zwierząt).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Słownik {"dogs": ..., "cats": ..., "animals": ...} ze statystykami
+        gatunków i sumą dla całego schroniska.
+
+    Note:
+        Statystyki liczone są jednym zapytaniem agregującym UNION ALL obu tabel.
+    """
+    cached = not_modified(request, response, "dogs", "cats")
+    if cached is not None:
+        return cached
+    return await async_crud.get_animal_stats(db, filters)
+
+@router.get("/occupancy", response_model=List[OccupancyDay])
+async def occupancy_history(
+    request: Request,
+    response: Response,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> List[Dict[str, Any]]:
+    """Zwraca liczbę psów i kotów w schronisku w kolejnych dniach.
+
+    Args:
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówka ETag).
+        date_from: Pierwszy dzień (domyślnie DEFAULT_HISTORY_DAYS dni przed date_to).
+        date_to: Ostatni dzień, włącznie (domyślnie dzisiaj).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Lista {"day", "dogs", "cats", "total"} dla każdego dnia zakresu.
+
+    Raises:
+        HTTPException: 422 jeśli zakres jest pusty lub dłuższy niż 3660 dni.
+
+    Note:
+        Historia odczytywana jest z dziennego zestawienia aktualizowanego przy
+        zapisach, więc koszt zapytania zależy od liczby dni, a nie zwierząt.
+        ETag zwracany jest tylko dla jawnie podanego date_to - domyślny
+        zakres przesuwa się wraz z bieżącą datą.
+    """
+    if date_to is not None:
+        cached = not_modified(request, response, "dogs", "cats")
+        if cached is not None:
+            return cached
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_HISTORY_DAYS - 1)
+    try:
+        return await async_crud.get_occupancy_history(db, date_from, date_to)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+@router.get("/length-of-stay", response_model=LengthOfStay)
+async def length_of_stay(
+    filters: AnimalFilter = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """Zwraca rozkłady długości pobytu psów i kotów.
+
+    Args:
+        filters: Filtry (te same co dla listy zwierząt).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Statystyki (średnia, mediana, p90, p99, histogram) dla każdej grupy
+        gatunku, rozmiaru i sterylizacji.
+
+    Note:
+        Statystyki liczone są w bazie danych i zapamiętywane do następnego
+        zapisu psów lub kotów. ETag nie jest zwracany - trwające pobyty
+        wydłużają się wraz z bieżącą datą.
+    """
+    return await async_crud.get_stay_stats(db, filters)
@@ -1,87 +1,328 @@
-from typing import List, Dict
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..crud import cat as crud
-from ..schemas.cat import CatCreate, CatUpdate, Cat
-from ..websocket_manager import manager
+from typing import List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import settings
+from ..database import get_async_db
+from ..export import ExportFormat, export_response
+from ..importer import ImportFormat, ImportValidationError, import_from_request
+from ..crud import cat as crud, async_cat as async_crud
+from ..models.cat import Cat as CatModel
+from ..serialization import encode_json, encode_rows, json_bytes_response, select_fields
+from ..versions import not_modified
+from ..schemas.cat import CatCreate, CatUpdate, Cat, CatFilter, CatBulkUpdate, CatBulkDelete, CatBulkResult
 
 router = APIRouter(prefix="/cats", tags=["cats"])
 
+# Parametr wyboru pól odpowiedzi (sparse fieldsets)
+FIELDS_QUERY = Query(None, description="Pola odpowiedzi oddzielone przecinkami, np. id,name,status")
 
-async def broadcast_cat_stats(db: Session) -> None:
-    """Pobiera i rozsyła statystyki kotów przez WebSocket.
-    
-    Funkcja pomocnicza wykonywana w tle po operacjach CRUD.
-    
-    Args:
-        db: Sesja bazy danych.
+def _selected_fields(fields: Optional[str]) -> List[str]:
+    """Waliduje parametr fields względem pól schematu Cat.
+
+    Raises:
+        HTTPException: 422 jeśli podano pole spoza schematu.
     """
-    stats = crud.get_cat_stats(db)
-    await manager.broadcast({"type": "cat_stats", **stats})
+    try:
+        return select_fields(fields, crud.CAT_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
 
 
 @router.get("/", response_model=List[Cat])
-def list_cats(db: Session = Depends(get_db)) -> List[Cat]:
+async def list_cats(
+    request: Request,
+    response: Response,
+    filters: CatFilter = Depends(),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+) -> List[Cat]:
     """Pobiera listę kotów.
     
     Args:
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówków ETag i kursora).
+        filters: Filtry listy (status, rozmiar, sterylizacja, indoor_only, zakresy dat).
+        limit: Maksymalna liczba kotów na stronie (bez limitu, jeśli nie podano).
+        cursor: Kursor następnej strony z nagłówka X-Next-Cursor.
+        fields: Pola odpowiedzi oddzielone przecinkami (domyślnie wszystkie).
         db: Sesja bazy danych (dependency injection).
         
     Returns:
-        Lista kotów ze schroniska.
+        Lista kotów spełniających filtry ze schroniska.
+
+    Raises:
+        HTTPException: 400 jeśli kursor jest nieprawidłowy,
+            422 jeśli fields zawiera pole spoza schematu.
+
+    Note:
+        Jeśli istnieje następna strona, jej kursor zwracany jest w nagłówku X-Next-Cursor.
+        ETag odpowiada wersji tabeli; przy zgodnym If-None-Match zwracane jest
+        304 Not Modified bez zapytania do bazy danych.
+        Wiersze kodowane są do JSON bezpośrednio z zapytania Core (bez obiektów ORM
+        i walidacji Pydantic), w kształcie zgodnym z response_model.
+        Parametr fields zawęża zarówno kolumny zapytania SQL, jak i odpowiedź.
+    """
+    selected = _selected_fields(fields)
+    cached = not_modified(request, response, CatModel.__tablename__)
+    if cached is not None:
+        return cached
+    try:
+        rows, next_cursor = await async_crud.get_cat_rows(db, filters, limit, cursor, selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_bytes_response(encode_rows(rows, selected), response)
+
+
+@router.get("/search", response_model=List[Cat])
+async def search_cats(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100, description="Szukane imię lub jego fragment"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+) -> List[Cat]:
+    """Wyszukuje koty po imieniu.
+
+    Args:
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówka ETag).
+        q: Szukane imię lub jego fragment (wielkość liter nie ma znaczenia).
+        limit: Maksymalna liczba wyników (domyślnie 20).
+        fields: Pola odpowiedzi oddzielone przecinkami (domyślnie wszystkie).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Lista kotów uporządkowana według trafności: imiona zaczynające się od q,
+        zawierające q, a następnie podobne do q (literówki).
+
+    Raises:
+        HTTPException: 422 jeśli fields zawiera pole spoza schematu.
+
+    Note:
+        Wyszukiwanie korzysta z indeksu trigramowego (pg_trgm na PostgreSQL,
+        FTS5 na SQLite), więc czas odpowiedzi nie rośnie z liczbą kotów.
+    """
+    selected = _selected_fields(fields)
+    cached = not_modified(request, response, CatModel.__tablename__)
+    if cached is not None:
+        return cached
+    rows = await async_crud.search_cat_rows(db, q, limit, selected)
+    return json_bytes_response(encode_rows(rows, selected), response)
+
+@router.get("/export", response_class=StreamingResponse)
+def export_cats(
+    request: Request,
+    filters: CatFilter = Depends(),
+    format: ExportFormat = "ndjson",
+) -> StreamingResponse:
+    """Eksportuje rejestr kotów jako strumień NDJSON lub CSV.
+
+    Args:
+        request: Żądanie HTTP (do utworzenia sesji bazy danych).
+        filters: Filtry eksportu (te same co dla listy kotów).
+        format: Format eksportu ("ndjson" lub "csv").
+
+    Returns:
+        Odpowiedź strumieniowa z kotami w kolejności daty przyjęcia i ID.
+
+    Note:
+        Wiersze odczytywane są kursorem po stronie serwera i wysyłane partiami,
+        więc zużycie pamięci nie zależy od rozmiaru tabeli.
+    """
+    return export_response(request.app, CatModel, lambda db: crud.iter_cat_batches(db, filters), format)
+
+@router.post("/import")
+async def import_cats(request: Request, format: ImportFormat = "ndjson") -> Dict[str, int]:
+    """Importuje koty z pliku CSV (z nagłówkiem) lub NDJSON przesłanego w treści żądania.
+
+    Args:
+        request: Żądanie HTTP z plikiem w treści.
+        format: Format pliku ("ndjson" lub "csv").
+
+    Returns:
+        Słownik z liczbą zaimportowanych kotów.
+
+    Raises:
+        HTTPException: 422 z numerem linii, jeśli któryś rekord jest niepoprawny
+            (cały import jest wtedy wycofywany).
+
+    Note:
+        Rekordy walidowane są tymi samymi regułami co przy tworzeniu pojedynczego kota.
+        Na PostgreSQL dane zapisywane są przez COPY FROM STDIN.
+    """
+    try:
+        imported = await import_from_request(request, CatModel, CatCreate, format)
+    except ImportValidationError as exc:
+        raise HTTPException(status_code=422, detail={"line": exc.line, "errors": exc.errors})
+    return {"imported": imported}
+
+async def _check_bulk_size(request: Request) -> None:
+    """Odrzuca partie większe niż BULK_MAX_ITEMS przed walidacją danych.
+
+    Raises:
+        HTTPException: 413 jeśli partia jest zbyt duża.
+    """
+    try:
+        payload = await request.json()
+    except ValueError:
+        # niepoprawny JSON zostanie zgłoszony przez walidację FastAPI
+        return
+    items = payload.get("ids", []) if isinstance(payload, dict) else payload
+    if isinstance(items, list) and len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Too many items (max {settings.BULK_MAX_ITEMS})")
+
+@router.post("/bulk", response_model=List[CatBulkResult])
+async def create_cats(
+    cats: List[CatCreate],
+    db: AsyncSession = Depends(get_async_db),
+    _: None = Depends(_check_bulk_size),
+) -> List[CatBulkResult]:
+    """Tworzy wiele kotów w jednej transakcji.
+
+    Args:
+        cats: Dane nowych kotów (cała partia jest walidowana przed zapisem).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Wyniki operacji w kolejności danych wejściowych.
+
+    Raises:
+        HTTPException: 413 jeśli partia przekracza BULK_MAX_ITEMS.
+
+    Note:
+        Niezależnie od wielkości partii statystyki wysyłane są przez WebSocket jeden raz.
     """
-    return crud.get_cats(db)
+    created = await async_crud.create_cats(db, cats)
+    return [CatBulkResult(id=db_cat.id, status="created", cat=db_cat) for db_cat in created]
 
+@router.patch("/bulk", response_model=List[CatBulkResult])
+async def update_cats(
+    cats: List[CatBulkUpdate],
+    db: AsyncSession = Depends(get_async_db),
+    _: None = Depends(_check_bulk_size),
+) -> List[CatBulkResult]:
+    """Aktualizuje wiele kotów w jednej transakcji.
+
+    Args:
+        cats: Dane do aktualizacji z identyfikatorami kotów (tylko wypełnione pola zostaną zmienione).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Wyniki operacji w kolejności danych wejściowych
+        (status not_found dla nieistniejących kotów).
+
+    Raises:
+        HTTPException: 413 jeśli partia przekracza BULK_MAX_ITEMS.
+
+    Note:
+        Niezależnie od wielkości partii statystyki wysyłane są przez WebSocket jeden raz.
+    """
+    updated = await async_crud.update_cats(db, cats)
+    return [
+        CatBulkResult(id=cat.id, status="updated", cat=updated[cat.id])
+        if cat.id in updated else CatBulkResult(id=cat.id, status="not_found")
+        for cat in cats
+    ]
+
+@router.delete("/bulk", response_model=List[CatBulkResult])
+async def delete_cats(
+    request: CatBulkDelete,
+    db: AsyncSession = Depends(get_async_db),
+    _: None = Depends(_check_bulk_size),
+) -> List[CatBulkResult]:
+    """Usuwa wiele kotów w jednej transakcji.
+
+    Args:
+        request: Identyfikatory kotów do usunięcia.
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Wyniki operacji w kolejności identyfikatorów
+        (status not_found dla nieistniejących kotów).
+
+    Raises:
+        HTTPException: 413 jeśli partia przekracza BULK_MAX_ITEMS.
+
+    Note:
+        Niezależnie od wielkości partii statystyki wysyłane są przez WebSocket jeden raz.
+    """
+    deleted = set(await async_crud.delete_cats(db, request.ids))
+    return [
+        CatBulkResult(id=cat_id, status="deleted" if cat_id in deleted else "not_found")
+        for cat_id in request.ids
+    ]
 
 @router.get("/{cat_id}", response_model=Cat)
-def get_one_cat(cat_id: int, db: Session = Depends(get_db)) -> Cat:
+async def get_one_cat(
+    cat_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+) -> Cat:
     """Pobiera pojedynczego kota po ID.
     
     Args:
         cat_id: Identyfikator kota.
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówka ETag).
+        fields: Pola odpowiedzi oddzielone przecinkami (domyślnie wszystkie).
         db: Sesja bazy danych (dependency injection).
         
     Returns:
         Dane kota.
         
     Raises:
-        HTTPException: 404 jeśli kot nie został znaleziony.
+        HTTPException: 404 jeśli kot nie został znaleziony,
+            422 jeśli fields zawiera pole spoza schematu.
+
+    Note:
+        ETag odpowiada wersji tabeli kotów; przy zgodnym If-None-Match zwracane
+        jest 304 Not Modified bez zapytania do bazy danych.
+        Dane kota pochodzą z pamięci podręcznej (pełny rekord), a fields
+        zawęża odpowiedź.
     """
-    cat = crud.get_cat(db, cat_id)
+    selected = _selected_fields(fields)
+    cached = not_modified(request, response, CatModel.__tablename__)
+    if cached is not None:
+        return cached
+    cat = await async_crud.get_cat_data(db, cat_id)
     if cat is None:
         raise HTTPException(status_code=404, detail="Cat not found")
-    return cat
+    return json_bytes_response(encode_json({field: cat[field] for field in selected}), response)
 
 
 @router.post("/", response_model=Cat)
-def create_one_cat(cat: CatCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Cat:
+async def create_one_cat(cat: CatCreate, db: AsyncSession = Depends(get_async_db)) -> Cat:
     """Tworzy nowego kota w systemie.
     
     Args:
         cat: Dane nowego kota.
-        background_tasks: Zadania w tle FastAPI.
         db: Sesja bazy danych (dependency injection).
         
     Returns:
         Utworzony kot z przypisanym ID.
         
     Note:
-        Po utworzeniu wysyła zaktualizowane statystyki przez WebSocket.
+        Zaktualizowane statystyki wysyłane są przez WebSocket przez dispatcher zdarzeń.
     """
-    new_cat = crud.create_cat(db, cat)
-    background_tasks.add_task(broadcast_cat_stats, db)
+    new_cat = await async_crud.create_cat(db, cat)
     return new_cat
 
 
 @router.put("/{cat_id}", response_model=Cat)
-def update_cat(cat_id: int, cat: CatUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Cat:
+async def update_cat(cat_id: int, cat: CatUpdate, db: AsyncSession = Depends(get_async_db)) -> Cat:
     """Aktualizuje dane istniejącego kota.
     
     Args:
         cat_id: Identyfikator kota do aktualizacji.
         cat: Dane do aktualizacji (tylko wypełnione pola zostaną zmienione).
-        background_tasks: Zadania w tle FastAPI.
         db: Sesja bazy danych (dependency injection).
         
     Returns:
@@ -91,22 +332,20 @@ def update_cat(cat_id: int, cat: CatUpdate, background_tasks: BackgroundTasks, d
         HTTPException: 404 jeśli kot nie został znaleziony.
         
     Note:
-        Po aktualizacji wysyła zaktualizowane statystyki przez WebSocket.
+        Zaktualizowane statystyki wysyłane są przez WebSocket przez dispatcher zdarzeń.
     """
-    updated_cat = crud.update_cat(db, cat_id, cat)
+    updated_cat = await async_crud.update_cat(db, cat_id, cat)
     if not updated_cat:
         raise HTTPException(status_code=404, detail="Cat not found")
-    background_tasks.add_task(broadcast_cat_stats, db)
     return updated_cat
 
 
 @router.delete("/{cat_id}")
-def delete_one_cat(cat_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def delete_one_cat(cat_id: int, db: AsyncSession = Depends(get_async_db)) -> Dict[str, str]:
     """Usuwa kota z systemu.
     
     Args:
         cat_id: Identyfikator kota do usunięcia.
-        background_tasks: Zadania w tle FastAPI.
         db: Sesja bazy danych (dependency injection).
         
     Returns:
@@ -116,10 +355,9 @@ def delete_one_cat(cat_id: int, background_tasks: BackgroundTasks, db: Session =
         HTTPException: 404 jeśli kot nie został znaleziony.
         
     Note:
-        Po usunięciu wysyła zaktualizowane statystyki przez WebSocket.
+        Zaktualizowane statystyki wysyłane są przez WebSocket przez dispatcher zdarzeń.
     """
-    success = crud.delete_cat(db, cat_id)
+    success = await async_crud.delete_cat(db, cat_id)
     if not success:
         raise HTTPException(status_code=404, detail="Cat not found")
-    background_tasks.add_task(broadcast_cat_stats, db)
     return {"status": "deleted"}
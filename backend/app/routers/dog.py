@@ -1,84 +1,324 @@
-from typing import List, Dict
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..crud import dog as crud
-from ..schemas.dog import DogCreate, DogUpdate, Dog
-from ..websocket_manager import manager
+from typing import List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import settings
+from ..database import get_async_db
+from ..export import ExportFormat, export_response
+from ..importer import ImportFormat, ImportValidationError, import_from_request
+from ..crud import dog as crud, async_dog as async_crud
+from ..models.dog import Dog as DogModel
+from ..serialization import encode_json, encode_rows, json_bytes_response, select_fields
+from ..versions import not_modified
+from ..schemas.dog import DogCreate, DogUpdate, Dog, DogFilter, DogBulkUpdate, DogBulkDelete, DogBulkResult
 
 router = APIRouter(prefix="/dogs", tags=["dogs"])
 
-async def broadcast_stats(db: Session) -> None:
-    """Pobiera i rosyła statystyki psów przez WebSocket.
-    
-    Funkcja pomocnicza wykonywana w tle po operacjach CRUD.
-    
-    Args:
-        db: Sesja bazy danych.
+# Parametr wyboru pól odpowiedzi (sparse fieldsets)
+FIELDS_QUERY = Query(None, description="Pola odpowiedzi oddzielone przecinkami, np. id,name,status")
+
+def _selected_fields(fields: Optional[str]) -> List[str]:
+    """Waliduje parametr fields względem pól schematu Dog.
+
+    Raises:
+        HTTPException: 422 jeśli podano pole spoza schematu.
     """
-    stats = crud.get_dog_stats(db)
-    await manager.broadcast({"type": "dog_stats", **stats})
+    try:
+        return select_fields(fields, crud.DOG_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
 
 @router.get("/", response_model=List[Dog])
-def list_dogs(
-    db: Session = Depends(get_db)
+async def list_dogs(
+    request: Request,
+    response: Response,
+    filters: DogFilter = Depends(),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ) -> List[Dog]:
     """Pobiera listę psów.
     
     Args:
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówków ETag i kursora).
+        filters: Filtry listy (status, rozmiar, sterylizacja, zakresy dat).
+        limit: Maksymalna liczba psów na stronie (bez limitu, jeśli nie podano).
+        cursor: Kursor następnej strony z nagłówka X-Next-Cursor.
+        fields: Pola odpowiedzi oddzielone przecinkami (domyślnie wszystkie).
         db: Sesja bazy danych (dependency injection).
         
     Returns:
-        Lista psów spełniających ze schroniska.
+        Lista psów spełniających filtry ze schroniska.
+
+    Raises:
+        HTTPException: 400 jeśli kursor jest nieprawidłowy,
+            422 jeśli fields zawiera pole spoza schematu.
+
+    Note:
+        Jeśli istnieje następna strona, jej kursor zwracany jest w nagłówku X-Next-Cursor.
+        ETag odpowiada wersji tabeli; przy zgodnym If-None-Match zwracane jest
+        304 Not Modified bez zapytania do bazy danych.
+        Wiersze kodowane są do JSON bezpośrednio z zapytania Core (bez obiektów ORM
+        i walidacji Pydantic), w kształcie zgodnym z response_model.
+        Parametr fields zawęża zarówno kolumny zapytania SQL, jak i odpowiedź.
+    """
+    selected = _selected_fields(fields)
+    cached = not_modified(request, response, DogModel.__tablename__)
+    if cached is not None:
+        return cached
+    try:
+        rows, next_cursor = await async_crud.get_dog_rows(db, filters, limit, cursor, selected)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_bytes_response(encode_rows(rows, selected), response)
+
+@router.get("/search", response_model=List[Dog])
+async def search_dogs(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100, description="Szukane imię lub jego fragment"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+) -> List[Dog]:
+    """Wyszukuje psy po imieniu.
+
+    Args:
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówka ETag).
+        q: Szukane imię lub jego fragment (wielkość liter nie ma znaczenia).
+        limit: Maksymalna liczba wyników (domyślnie 20).
+        fields: Pola odpowiedzi oddzielone przecinkami (domyślnie wszystkie).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Lista psów uporządkowana według trafności: imiona zaczynające się od q,
+        zawierające q, a następnie podobne do q (literówki).
+
+    Raises:
+        HTTPException: 422 jeśli fields zawiera pole spoza schematu.
+
+    Note:
+        Wyszukiwanie korzysta z indeksu trigramowego (pg_trgm na PostgreSQL,
+        FTS5 na SQLite), więc czas odpowiedzi nie rośnie z liczbą psów.
+    """
+    selected = _selected_fields(fields)
+    cached = not_modified(request, response, DogModel.__tablename__)
+    if cached is not None:
+        return cached
+    rows = await async_crud.search_dog_rows(db, q, limit, selected)
+    return json_bytes_response(encode_rows(rows, selected), response)
+
+@router.get("/export", response_class=StreamingResponse)
+def export_dogs(
+    request: Request,
+    filters: DogFilter = Depends(),
+    format: ExportFormat = "ndjson",
+) -> StreamingResponse:
+    """Eksportuje rejestr psów jako strumień NDJSON lub CSV.
+
+    Args:
+        request: Żądanie HTTP (do utworzenia sesji bazy danych).
+        filters: Filtry eksportu (te same co dla listy psów).
+        format: Format eksportu ("ndjson" lub "csv").
+
+    Returns:
+        Odpowiedź strumieniowa z psami w kolejności daty przyjęcia i ID.
+
+    Note:
+        Wiersze odczytywane są kursorem po stronie serwera i wysyłane partiami,
+        więc zużycie pamięci nie zależy od rozmiaru tabeli.
+    """
+    return export_response(request.app, DogModel, lambda db: crud.iter_dog_batches(db, filters), format)
+
+@router.post("/import")
+async def import_dogs(request: Request, format: ImportFormat = "ndjson") -> Dict[str, int]:
+    """Importuje psy z pliku CSV (z nagłówkiem) lub NDJSON przesłanego w treści żądania.
+
+    Args:
+        request: Żądanie HTTP z plikiem w treści.
+        format: Format pliku ("ndjson" lub "csv").
+
+    Returns:
+        Słownik z liczbą zaimportowanych psów.
+
+    Raises:
+        HTTPException: 422 z numerem linii, jeśli któryś rekord jest niepoprawny
+            (cały import jest wtedy wycofywany).
+
+    Note:
+        Rekordy walidowane są tymi samymi regułami co przy tworzeniu pojedynczego psa.
+        Na PostgreSQL dane zapisywane są przez COPY FROM STDIN.
+    """
+    try:
+        imported = await import_from_request(request, DogModel, DogCreate, format)
+    except ImportValidationError as exc:
+        raise HTTPException(status_code=422, detail={"line": exc.line, "errors": exc.errors})
+    return {"imported": imported}
+
+async def _check_bulk_size(request: Request) -> None:
+    """Odrzuca partie większe niż BULK_MAX_ITEMS przed walidacją danych.
+
+    Raises:
+        HTTPException: 413 jeśli partia jest zbyt duża.
+    """
+    try:
+        payload = await request.json()
+    except ValueError:
+        # niepoprawny JSON zostanie zgłoszony przez walidację FastAPI
+        return
+    items = payload.get("ids", []) if isinstance(payload, dict) else payload
+    if isinstance(items, list) and len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Too many items (max {settings.BULK_MAX_ITEMS})")
+
+@router.post("/bulk", response_model=List[DogBulkResult])
+async def create_dogs(
+    dogs: List[DogCreate],
+    db: AsyncSession = Depends(get_async_db),
+    _: None = Depends(_check_bulk_size),
+) -> List[DogBulkResult]:
+    """Tworzy wiele psów w jednej transakcji.
+
+    Args:
+        dogs: Dane nowych psów (cała partia jest walidowana przed zapisem).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Wyniki operacji w kolejności danych wejściowych.
+
+    Raises:
+        HTTPException: 413 jeśli partia przekracza BULK_MAX_ITEMS.
+
+    Note:
+        Niezależnie od wielkości partii statystyki wysyłane są przez WebSocket jeden raz.
+    """
+    created = await async_crud.create_dogs(db, dogs)
+    return [DogBulkResult(id=db_dog.id, status="created", dog=db_dog) for db_dog in created]
+
+@router.patch("/bulk", response_model=List[DogBulkResult])
+async def update_dogs(
+    dogs: List[DogBulkUpdate],
+    db: AsyncSession = Depends(get_async_db),
+    _: None = Depends(_check_bulk_size),
+) -> List[DogBulkResult]:
+    """Aktualizuje wiele psów w jednej transakcji.
+
+    Args:
+        dogs: Dane do aktualizacji z identyfikatorami psów (tylko wypełnione pola zostaną zmienione).
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Wyniki operacji w kolejności danych wejściowych
+        (status not_found dla nieistniejących psów).
+
+    Raises:
+        HTTPException: 413 jeśli partia przekracza BULK_MAX_ITEMS.
+
+    Note:
+        Niezależnie od wielkości partii statystyki wysyłane są przez WebSocket jeden raz.
+    """
+    updated = await async_crud.update_dogs(db, dogs)
+    return [
+        DogBulkResult(id=dog.id, status="updated", dog=updated[dog.id])
+        if dog.id in updated else DogBulkResult(id=dog.id, status="not_found")
+        for dog in dogs
+    ]
+
+@router.delete("/bulk", response_model=List[DogBulkResult])
+async def delete_dogs(
+    request: DogBulkDelete,
+    db: AsyncSession = Depends(get_async_db),
+    _: None = Depends(_check_bulk_size),
+) -> List[DogBulkResult]:
+    """Usuwa wiele psów w jednej transakcji.
+
+    Args:
+        request: Identyfikatory psów do usunięcia.
+        db: Sesja bazy danych (dependency injection).
+
+    Returns:
+        Wyniki operacji w kolejności identyfikatorów
+        (status not_found dla nieistniejących psów).
+
+    Raises:
+        HTTPException: 413 jeśli partia przekracza BULK_MAX_ITEMS.
+
+    Note:
+        Niezależnie od wielkości partii statystyki wysyłane są przez WebSocket jeden raz.
     """
-    return crud.get_dogs(db)
+    deleted = set(await async_crud.delete_dogs(db, request.ids))
+    return [
+        DogBulkResult(id=dog_id, status="deleted" if dog_id in deleted else "not_found")
+        for dog_id in request.ids
+    ]
 
 @router.get("/{dog_id}", response_model=Dog)
-def get_one_dog(dog_id: int, db: Session = Depends(get_db)) -> Dog:
+async def get_one_dog(
+    dog_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+) -> Dog:
     """Pobiera pojedynczego psa po ID.
     
     Args:
         dog_id: Identyfikator psa.
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź HTTP (do ustawienia nagłówka ETag).
+        fields: Pola odpowiedzi oddzielone przecinkami (domyślnie wszystkie).
         db: Sesja bazy danych (dependency injection).
         
     Returns:
         Dane psa.
         
     Raises:
-        HTTPException: 404 jeśli pies nie został znaleziony.
+        HTTPException: 404 jeśli pies nie został znaleziony,
+            422 jeśli fields zawiera pole spoza schematu.
+
+    Note:
+        ETag odpowiada wersji tabeli psów; przy zgodnym If-None-Match zwracane
+        jest 304 Not Modified bez zapytania do bazy danych.
+        Dane psa pochodzą z pamięci podręcznej (pełny rekord), a fields
+        zawęża odpowiedź.
     """
-    dog = crud.get_dog(db, dog_id)
+    selected = _selected_fields(fields)
+    cached = not_modified(request, response, DogModel.__tablename__)
+    if cached is not None:
+        return cached
+    dog = await async_crud.get_dog_data(db, dog_id)
     if dog is None:
         raise HTTPException(status_code=404, detail="Dog not found")
-    return dog
+    return json_bytes_response(encode_json({field: dog[field] for field in selected}), response)
 
 @router.post("/", response_model=Dog)
-def create_one_dog(dog: DogCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Dog:
+async def create_one_dog(dog: DogCreate, db: AsyncSession = Depends(get_async_db)) -> Dog:
     """Tworzy nowego psa w systemie.
     
     Args:
         dog: Dane nowego psa.
-        background_tasks: Zadania w tle FastAPI.
         db: Sesja bazy danych (dependency injection).
         
     Returns:
         Utworzony pies z przypisanym ID.
         
     Note:
-        Po utworzeniu wysyła zaktualizowane statystyki przez WebSocket.
+        Zaktualizowane statystyki wysyłane są przez WebSocket przez dispatcher zdarzeń.
     """
-    new_dog = crud.create_dog(db, dog)
-    background_tasks.add_task(broadcast_stats, db)
+    new_dog = await async_crud.create_dog(db, dog)
     return new_dog
 
 @router.put("/{dog_id}", response_model=Dog)
-def update_dog(dog_id: int, dog: DogUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Dog:
+async def update_dog(dog_id: int, dog: DogUpdate, db: AsyncSession = Depends(get_async_db)) -> Dog:
     """Aktualizuje dane istniejącego psa.
     
     Args:
         dog_id: Identyfikator psa do aktualizacji.
         dog: Dane do aktualizacji (tylko wypełnione pola zostaną zmienione).
-        background_tasks: Zadania w tle FastAPI.
         db: Sesja bazy danych (dependency injection).
         
     Returns:
@@ -88,21 +328,19 @@ def update_dog(dog_id: int, dog: DogUpdate, background_tasks: BackgroundTasks, d
         HTTPException: 404 jeśli pies nie został znaleziony.
         
     Note:
-        Po aktualizacji wysyła zaktualizowane statystyki przez WebSocket.
+        Zaktualizowane statystyki wysyłane są przez WebSocket przez dispatcher zdarzeń.
     """
-    updated_dog = crud.update_dog(db, dog_id, dog)
+    updated_dog = await async_crud.update_dog(db, dog_id, dog)
     if not updated_dog:
         raise HTTPException(status_code=404, detail="Dog not found")
-    background_tasks.add_task(broadcast_stats, db)
     return updated_dog
 
 @router.delete("/{dog_id}")
-def delete_one_dog(dog_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def delete_one_dog(dog_id: int, db: AsyncSession = Depends(get_async_db)) -> Dict[str, str]:
     """Usuwa psa z systemu.
     
     Args:
         dog_id: Identyfikator psa do usunięcia.
-        background_tasks: Zadania w tle FastAPI.
         db: Sesja bazy danych (dependency injection).
         
     Returns:
@@ -112,12 +350,11 @@ def delete_one_dog(dog_id: int, background_tasks: BackgroundTasks, db: Session =
         HTTPException: 404 jeśli pies nie został znaleziony.
         
     Note:
-        Po usunięciu wysyła zaktualizowane statystyki przez WebSocket.
+        Zaktualizowane statystyki wysyłane są przez WebSocket przez dispatcher zdarzeń.
     """
-    success = crud.delete_dog(db, dog_id)
+    success = await async_crud.delete_dog(db, dog_id)
     if not success:
         raise HTTPException(status_code=404, detail="Dog not found")
-    background_tasks.add_task(broadcast_stats, db)
     return {"status": "deleted"}
 
 
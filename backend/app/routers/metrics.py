@@ -0,0 +1,52 @@
+from typing import Any, Dict
+from fastapi import APIRouter
+from ..broadcaster import stats_broadcaster
+from ..cache import entity_cache
+from ..pool_metrics import async_pool_metrics, sync_pool_metrics
+from ..startup import boot_metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/pool")
+async def pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Zwraca liczniki pul połączeń z bazą danych.
+
+    Returns:
+        Słownik {"sync": ..., "async": ...} z liczbą pobrań i zwrotów połączeń,
+        czasem oczekiwania na połączenie (średnim i maksymalnym, w ms),
+        liczbą połączeń w użyciu, połączeń ponad pool_size i przekroczeń pool_timeout.
+
+    Note:
+        Długie oczekiwanie przy wszystkich połączeniach w użyciu wskazuje na
+        wyczerpanie puli, a nie na wolne zapytania.
+    """
+    return {"sync": sync_pool_metrics.snapshot(), "async": async_pool_metrics.snapshot()}
+
+@router.get("/startup")
+async def startup_metrics() -> Dict[str, Any]:
+    """Zwraca czas startu aplikacji.
+
+    Returns:
+        Słownik z czasem do gotowości aplikacji (boot_seconds) oraz czasami
+        etapów startu w ms (phases_ms: init_db, schema_check, occupancy, warmup).
+    """
+    return boot_metrics.snapshot()
+
+@router.get("/cache")
+async def cache_metrics() -> Dict[str, Any]:
+    """Zwraca liczniki pamięci podręcznej odczytów pojedynczych zwierząt.
+
+    Returns:
+        Słownik z liczbą wpisów, trafień, chybień, wyrzuceń (LRU) i wygaśnięć (TTL).
+    """
+    return entity_cache.stats()
+
+@router.get("/broadcast")
+async def broadcast_metrics() -> Dict[str, int]:
+    """Zwraca liczniki łączenia (coalescing) aktualizacji statystyk WebSocket.
+
+    Returns:
+        Słownik z liczbą wysłanych aktualizacji (sent_updates) i żądań
+        połączonych z inną aktualizacją w oknie STATS_BROADCAST_WINDOW_MS (merged_updates).
+    """
+    return stats_broadcaster.get_metrics()
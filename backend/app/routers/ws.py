@@ -1,15 +1,203 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from sqlalchemy.orm import Session
+import asyncio
+import json
+from typing import Dict, List, Set, Tuple
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 from ..websocket_manager import manager
-from ..database import get_db
-from ..crud.dog import get_dog_stats
-from ..crud.cat import get_cat_stats
+from ..broadcaster import stats_broadcaster
+from ..database import async_session_scope
+from ..config import settings
+from ..crud.async_animal import get_occupancy_stats, refresh_occupancy
+from ..events import AnimalEvent, dispatcher
+from ..occupancy import counters
+from ..stats_stream import stats_stream
 
 router = APIRouter()
 
+# Typy wiadomości ze statystykami dla poszczególnych tematów
+STATS_MESSAGE_TYPES: Dict[str, str] = {"dogs": "dog_stats", "cats": "cat_stats"}
+
+# Referencje do zaplanowanych wysyłek statystyk (chronią zadania przed usunięciem przez GC)
+_scheduled_broadcasts: Set[asyncio.Task] = set()
+
+
+async def _stats_message(species: str) -> dict:
+    """Buduje wiadomość ze statystykami gatunku z liczników w pamięci.
+
+    Przy kilku workerach (WS_BACKPLANE inny niż memory) zdarzenie z outboxa
+    mógł zapisać inny worker, który zaktualizował tylko własne liczniki,
+    więc przed wysyłką liczniki wczytywane są z bazy danych (jedno zapytanie
+    na połączoną aktualizację).
+
+    Args:
+        species: Gatunek ("dogs" lub "cats").
+    """
+    if settings.WS_BACKPLANE != "memory":
+        async with async_session_scope(dispatcher.app) as db:
+            await refresh_occupancy(db)
+    stats = counters.snapshot(species)
+    if stats is None:
+        async with async_session_scope(dispatcher.app) as db:
+            stats = await get_occupancy_stats(db, species)
+    return {"type": STATS_MESSAGE_TYPES[species], **stats}
+
+
+async def publish_stats(events: List[AnimalEvent]) -> None:
+    """Konsument zdarzeń domenowych wysyłający statystyki przez WebSocket.
+
+    Dla każdego gatunku, którego dotyczy partia zdarzeń, zgłasza jedną
+    aktualizację statystyk do broadcastera (który dodatkowo łączy aktualizacje
+    w oknie czasowym). Przy jednym workerze nie wykonuje zapytań do bazy danych.
+
+    Args:
+        events: Partia zdarzeń z outboxa.
+    """
+    for species in {event.species for event in events}:
+        if species not in STATS_MESSAGE_TYPES:
+            continue
+        task = asyncio.create_task(
+            stats_broadcaster.request(species, lambda species=species: _stats_message(species))
+        )
+        _scheduled_broadcasts.add(task)
+        task.add_done_callback(_scheduled_broadcasts.discard)
+
+
+async def wait_for_broadcasts() -> None:
+    """Czeka na zakończenie zaplanowanych przez publish_stats wysyłek statystyk."""
+    if _scheduled_broadcasts:
+        await asyncio.gather(*_scheduled_broadcasts, return_exceptions=True)
+
+
+async def _initial_stats(websocket: WebSocket, species: str) -> Dict[str, int]:
+    """Zwraca początkowe statystyki gatunku dla nowego połączenia WebSocket.
+
+    Statystyki pochodzą z liczników w pamięci; krótkotrwała sesja asynchroniczna
+    otwierana jest tylko wtedy, gdy liczniki nie zostały jeszcze wczytane,
+    więc otwarty WebSocket nie trzyma połączenia z puli ani wątku.
+
+    Args:
+        websocket: Połączenie WebSocket z klientem.
+        species: Gatunek ("dogs" lub "cats").
+    """
+    stats = counters.snapshot(species)
+    if stats is None:
+        async with async_session_scope(websocket.app) as db:
+            stats = await get_occupancy_stats(db, species)
+    return stats
+
+
+def sync_counters(topic: str, message: dict) -> List[Tuple[str, dict]]:
+    """Hook menedżera WebSocket przepisujący statystyki z kanału do lokalnych liczników.
+
+    Statystyki publikowane przez worker obsługujący zdarzenie pochodzą
+    z bazy danych, więc pozostałe workery uzgadniają z nimi swoje liczniki
+    (początkowe statystyki nowych połączeń nie są nieaktualne).
+    Rejestrowany tylko przy kilku workerach (WS_BACKPLANE inny niż memory).
+
+    Args:
+        topic: Temat dostarczonej wiadomości.
+        message: Dostarczona wiadomość (pełny snapshot statystyk).
+    """
+    if topic in STATS_MESSAGE_TYPES:
+        counters.load_species(topic, message)
+    return []
+
+
+def delta_topic(species: str) -> str:
+    """Zwraca temat połączeń protokołu v2 gatunku (wiadomości ze zmienionymi polami)."""
+    return f"{species}:delta"
+
+
+def _delta_message(species: str, seq: int, changes: Dict[str, int]) -> dict:
+    """Buduje wiadomość protokołu v2 ze zmienionymi polami statystyk."""
+    return {"type": f"{STATS_MESSAGE_TYPES[species]}_delta", "seq": seq, **changes}
+
+
+def stats_deltas(topic: str, message: dict) -> List[Tuple[str, dict]]:
+    """Hook menedżera WebSocket wyznaczający różnice statystyk dla protokołu v2.
+
+    Dla każdej wiadomości ze statystykami gatunku zwiększa numer sekwencyjny
+    tematu (jeśli statystyki się zmieniły) i zwraca wiadomość ze zmienionymi
+    polami dla połączeń protokołu v2.
+
+    Args:
+        topic: Temat dostarczonej wiadomości.
+        message: Dostarczona wiadomość (pełny snapshot statystyk).
+    """
+    if topic not in STATS_MESSAGE_TYPES:
+        return []
+    advanced = stats_stream.advance(topic, {key: value for key, value in message.items() if key != "type"})
+    if advanced is None:
+        return []
+    return [(delta_topic(topic), _delta_message(topic, *advanced))]
+
+
+def _sequenced_snapshot(websocket: WebSocket, species: str, stats: Dict[str, int]) -> dict:
+    """Zwraca pełny snapshot protokołu v2 uzgodniony z bieżącymi statystykami.
+
+    Jeśli statystyki zmieniły się od ostatniej wiadomości (np. po uzgodnieniu
+    liczników z bazą danych), numer sekwencyjny jest zwiększany, a różnica
+    wysyłana pozostałym połączeniom v2, więc wszyscy klienci widzą tę samą
+    numerację. Połączenie otrzymujące snapshot nie dostaje tej różnicy
+    (snapshot ją zawiera, a różnica nie może go poprzedzać).
+
+    Args:
+        websocket: Połączenie, do którego trafi snapshot.
+        species: Gatunek ("dogs" lub "cats").
+        stats: Bieżące statystyki gatunku.
+    """
+    advanced = stats_stream.advance(species, stats)
+    if advanced is not None:
+        delta = _delta_message(species, *advanced)
+        for other in manager.subscribers(delta_topic(species)) - {websocket}:
+            manager.send(other, delta)
+    seq, snapshot = stats_stream.snapshot(species)
+    return {"type": STATS_MESSAGE_TYPES[species], "seq": seq, **snapshot}
+
+
+def _is_snapshot_request(text: str) -> bool:
+    """Sprawdza, czy wiadomość klienta to prośba o pełny snapshot ({"type": "snapshot"})."""
+    try:
+        request = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(request, dict) and request.get("type") == "snapshot"
+
+
+async def _stats_websocket(websocket: WebSocket, species: str, protocol: int) -> None:
+    """Obsługuje połączenie WebSocket ze statystykami gatunku.
+
+    Args:
+        websocket: Połączenie WebSocket z klientem.
+        species: Gatunek ("dogs" lub "cats").
+        protocol: Wersja protokołu (1 - pełne snapshoty, 2 - numer sekwencyjny i zmienione pola).
+    """
+    topic = species if protocol == 1 else delta_topic(species)
+    await manager.connect(websocket, topic)
+    # początkowe statystyki (z liczników w pamięci, bez zapytania do bazy)
+    stats = await _initial_stats(websocket, species)
+    if protocol == 1:
+        manager.send(websocket, {"type": STATS_MESSAGE_TYPES[species], **stats})
+    else:
+        manager.send(websocket, _sequenced_snapshot(websocket, species, stats))
+
+    try:
+        while True:
+            text = await websocket.receive_text()  # połączenie aktywne
+            if protocol == 2 and _is_snapshot_request(text):
+                # klient wykrył lukę w numeracji - wysyłamy pełny snapshot
+                stats = await _initial_stats(websocket, species)
+                manager.send(websocket, _sequenced_snapshot(websocket, species, stats))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(websocket, topic)
+
 
 @router.websocket("/ws/dogs")
-async def dogs_websocket(websocket: WebSocket, db: Session = Depends(get_db)) -> None:
+async def dogs_websocket(
+    websocket: WebSocket,
+    protocol: int = Query(1, ge=1, le=2),
+) -> None:
     """Endpoint WebSocket do wysyłania statystyk psów w schronisku w czasie rzeczywistym.
     
     Podłącza klienta do WebSocket i wysyła początkowe statystyki,
@@ -17,25 +205,25 @@ async def dogs_websocket(websocket: WebSocket, db: Session = Depends(get_db)) ->
     
     Args:
         websocket: Połączenie WebSocket z klientem.
-        db: Sesja bazy danych (dependency injection).
+        protocol: Wersja protokołu (?protocol=2 - numer sekwencyjny i tylko zmienione pola).
         
     Note:
         Połączenie jest automatycznie zamykane przy rozłączeniu klienta.
         Klient otrzymuje aktualizacje statystyk przy każdej operacji CRUD.
+        Otwarte połączenie nie trzyma sesji bazy danych.
+        W protokole v2 po snapshocie {"type": "dog_stats", "seq", ...} wysyłane są
+        wiadomości {"type": "dog_stats_delta", "seq", ...zmienione pola}; klient
+        pomija wiadomości z numerem nie większym niż znany i wysyła
+        {"type": "snapshot"}, gdy wykryje lukę w numeracji.
     """
-    await manager.connect(websocket)
-    # początkowe statystyki
-    await websocket.send_json({"type": "dog_stats", **get_dog_stats(db)})
-
-    try:
-        while True:
-            await websocket.receive_text()  # połączenie aktywne
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
+    await _stats_websocket(websocket, "dogs", protocol)
 
 
 @router.websocket("/ws/cats")
-async def cats_websocket(websocket: WebSocket, db: Session = Depends(get_db)) -> None:
+async def cats_websocket(
+    websocket: WebSocket,
+    protocol: int = Query(1, ge=1, le=2),
+) -> None:
     """Endpoint WebSocket do wysyłania statystyk kotów w schronisku w czasie rzeczywistym.
     
     Podłącza klienta do WebSocket i wysyła początkowe statystyki kotów,
@@ -43,21 +231,15 @@ async def cats_websocket(websocket: WebSocket, db: Session = Depends(get_db)) ->
     
     Args:
         websocket: Połączenie WebSocket z klientem.
-        db: Sesja bazy danych (dependency injection).
+        protocol: Wersja protokołu (?protocol=2 - numer sekwencyjny i tylko zmienione pola).
         
     Note:
         Połączenie jest automatycznie zamykane przy rozłączeniu klienta.
         Klient otrzymuje aktualizacje statystyk przy każdej operacji CRUD.
+        Otwarte połączenie nie trzyma sesji bazy danych.
+        Protokół v2 działa jak dla /ws/dogs (wiadomości cat_stats i cat_stats_delta).
     """
-    await manager.connect(websocket)
-    # początkowe statystyki kotów
-    await websocket.send_json({"type": "cat_stats", **get_cat_stats(db)})
-
-    try:
-        while True:
-            await websocket.receive_text()  # połączenie aktywne
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
+    await _stats_websocket(websocket, "cats", protocol)
 
 
 @router.websocket("/ws/status")
@@ -72,13 +254,15 @@ async def status_websocket(websocket: WebSocket) -> None:
     Note:
         Połączenie jest automatycznie zamykane przy rozłączeniu klienta.
     """
-    await manager.connect_status(websocket)
+    await manager.connect(websocket, "status")
     # początkowy status serwera
-    await websocket.send_json({"type": "server_status", **manager.get_status()})
+    manager.send(websocket, {"type": "server_status", **manager.get_status()})
 
     try:
         while True:
             await websocket.receive_text()  # połączenie aktywne
     except WebSocketDisconnect:
-        manager.disconnect_status(websocket)
+        pass
+    finally:
+        manager.disconnect(websocket, "status")
 
@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import Dict, Optional
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Connection
+from .models.search import is_search_object
+
+# Plik konfiguracyjny Alembic (katalog backend)
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+class SchemaRevisionError(RuntimeError):
+    """Schemat bazy danych nie jest w rewizji wymaganej przez aplikację."""
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """Tworzy konfigurację Alembic do użycia w kodzie aplikacji.
+
+    Args:
+        connection: Połączenie, na którym mają zostać wykonane migracje (opcjonalne;
+            domyślnie env.py łączy się z DATABASE_URL).
+
+    Returns:
+        Konfiguracja Alembic z katalogiem migracji backend/migrations.
+    """
+    config = Config(str(ALEMBIC_INI))
+    # nie nadpisujemy konfiguracji logowania aplikacji
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def include_name(name: Optional[str], type_: str, parent_names: Dict[str, Optional[str]]) -> bool:
+    """Filtr obiektów porównywanych przez Alembic (autogenerate, compare_metadata).
+
+    Pomija obiekty indeksu wyszukiwania imion tworzone poza metadanymi
+    (tabele FTS5 na SQLite, indeksy trigramowe na PostgreSQL).
+    """
+    return name is None or not is_search_object(name)
+
+
+def head_revision() -> Optional[str]:
+    """Zwraca najnowszą rewizję z katalogu migracji."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """Zwraca rewizję zapisaną w bazie danych (None, jeśli migracje nie były wykonywane)."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def verify_schema_revision(connection: Connection) -> None:
+    """Sprawdza, czy schemat bazy danych jest w najnowszej rewizji.
+
+    Aplikacja nie tworzy ani nie zmienia tabel - schemat zarządzany jest
+    migracjami (alembic upgrade head).
+
+    Args:
+        connection: Połączenie z bazą danych.
+
+    Raises:
+        SchemaRevisionError: Jeśli rewizja bazy danych różni się od najnowszej migracji.
+    """
+    current, head = current_revision(connection), head_revision()
+    if current != head:
+        raise SchemaRevisionError(
+            f"Database schema is at revision {current}, expected {head}; run 'alembic upgrade head'"
+        )
@@ -0,0 +1,133 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Literal, Optional
+
+# Gatunek zwierzęcia (nazwa tabeli, jak w licznikach zajętości i zdarzeniach)
+Species = Literal["dogs", "cats"]
+
+class Animal(BaseModel):
+    """Schemat Pydantic dla zwierzęcia z listy całego schroniska.
+
+    Łączy pola psa i kota; gatunek rozróżnia pole species.
+    Używany jako response model w GET /animals/.
+
+    Attributes:
+        species: Gatunek zwierzęcia ("dogs" lub "cats").
+        id: Identyfikator zwierzęcia (unikalny w obrębie gatunku).
+        name: Imię zwierzęcia.
+        size: Rozmiar zwierzęcia (small, medium, large).
+        birth_date: Data urodzenia (opcjonalne).
+        sex: Płeć (opcjonalne).
+        neutered: Czy zwierzę jest wysterylizowane/wykastrowane.
+        admitted_date: Data przyjęcia do schroniska.
+        released_date: Data wypuszczenia ze schroniska (opcjonalne).
+        status: Status zwierzęcia (arrived, adopted, returned).
+        indoor_only: Czy kot jest przeznaczony tylko do życia w domu (None dla psów).
+    """
+    species: Species
+    id: int
+    name: str
+    size: Literal["small", "medium", "large"]
+    birth_date: Optional[date]
+    sex: Optional[str]
+    neutered: bool
+    admitted_date: date
+    released_date: Optional[date]
+    status: Literal["arrived", "adopted", "returned"]
+    indoor_only: Optional[bool]
+
+class AnimalFilter(BaseModel):
+    """Schemat Pydantic dla filtrów listy i statystyk całego schroniska.
+
+    Wszystkie pola są opcjonalne, a podane filtry są łączone koniunkcją
+    i wykonywane po stronie bazy danych dla każdej tabeli.
+    Używany przy operacjach GET /animals/ i GET /animals/stats.
+
+    Attributes:
+        species: Gatunek (opcjonalne - domyślnie psy i koty).
+        status: Status zwierzęcia (opcjonalne).
+        size: Rozmiar zwierzęcia (opcjonalne).
+        neutered: Czy zwierzę jest wysterylizowane/wykastrowane (opcjonalne).
+        admitted_from: Najwcześniejsza data przyjęcia, włącznie (opcjonalne).
+        admitted_to: Najpóźniejsza data przyjęcia, włącznie (opcjonalne).
+        released_from: Najwcześniejsza data wypuszczenia, włącznie (opcjonalne).
+        released_to: Najpóźniejsza data wypuszczenia, włącznie (opcjonalne).
+    """
+    species: Optional[Species] = None
+    status: Optional[Literal["arrived", "adopted", "returned"]] = None
+    size: Optional[Literal["small", "medium", "large"]] = None
+    neutered: Optional[bool] = None
+    admitted_from: Optional[date] = None
+    admitted_to: Optional[date] = None
+    released_from: Optional[date] = None
+    released_to: Optional[date] = None
+
+class OccupancyDay(BaseModel):
+    """Schemat Pydantic dla liczby zwierząt w schronisku w danym dniu.
+
+    Używany jako response model w GET /animals/occupancy.
+
+    Attributes:
+        day: Dzień.
+        dogs: Liczba psów w schronisku na koniec dnia.
+        cats: Liczba kotów w schronisku na koniec dnia.
+        total: Łączna liczba zwierząt w schronisku na koniec dnia.
+    """
+    day: date
+    dogs: int
+    cats: int
+    total: int
+
+class StayBucket(BaseModel):
+    """Schemat Pydantic dla przedziału histogramu długości pobytu.
+
+    Attributes:
+        min_days: Dolna granica przedziału (w dniach, włącznie).
+        max_days: Górna granica przedziału (w dniach, włącznie; None dla ostatniego przedziału).
+        count: Liczba pobytów w przedziale.
+    """
+    min_days: int
+    max_days: Optional[int]
+    count: int
+
+class StayGroup(BaseModel):
+    """Schemat Pydantic dla rozkładu długości pobytu w grupie zwierząt.
+
+    Attributes:
+        species: Gatunek zwierząt ("dogs" lub "cats").
+        size: Rozmiar zwierząt (small, medium, large).
+        neutered: Czy zwierzęta są wysterylizowane/wykastrowane.
+        count: Liczba zwierząt w grupie.
+        in_shelter: Liczba zwierząt, których pobyt trwa (bez daty wypuszczenia).
+        mean_days: Średnia długość pobytu w dniach.
+        median_days: Mediana długości pobytu w dniach.
+        p90_days: 90. percentyl długości pobytu w dniach.
+        p99_days: 99. percentyl długości pobytu w dniach.
+        min_days: Najkrótszy pobyt w dniach.
+        max_days: Najdłuższy pobyt w dniach.
+        histogram: Liczba pobytów w kolejnych przedziałach długości.
+    """
+    species: Species
+    size: Literal["small", "medium", "large"]
+    neutered: bool
+    count: int
+    in_shelter: int
+    mean_days: float
+    median_days: float
+    p90_days: float
+    p99_days: float
+    min_days: int
+    max_days: int
+    histogram: List[StayBucket]
+
+class LengthOfStay(BaseModel):
+    """Schemat Pydantic dla statystyk długości pobytu.
+
+    Używany jako response model w GET /animals/length-of-stay.
+
+    Attributes:
+        as_of: Dzień, do którego liczone są trwające pobyty.
+        groups: Statystyki grup (gatunek, rozmiar, sterylizacja).
+    """
+    as_of: date
+    groups: List[StayGroup]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import date
-from typing import Optional
+from typing import List, Literal, Optional
 from ..models.cat import CatSize, CatStatus
 
 
@@ -101,3 +101,66 @@ class Cat(CatBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CatFilter(BaseModel):
+    """Schemat Pydantic dla filtrów listy kotów.
+
+    Wszystkie pola są opcjonalne, a podane filtry są łączone koniunkcją
+    i wykonywane po stronie bazy danych.
+    Używany przy operacji GET /cats/.
+
+    Attributes:
+        status: Status kota (opcjonalne).
+        size: Rozmiar kota (opcjonalne).
+        neutered: Czy kot jest wysterylizowany/wykastrowany (opcjonalne).
+        indoor_only: Czy kot jest przeznaczony tylko do życia w domu (opcjonalne).
+        admitted_from: Najwcześniejsza data przyjęcia, włącznie (opcjonalne).
+        admitted_to: Najpóźniejsza data przyjęcia, włącznie (opcjonalne).
+        released_from: Najwcześniejsza data wypuszczenia, włącznie (opcjonalne).
+        released_to: Najpóźniejsza data wypuszczenia, włącznie (opcjonalne).
+    """
+    status: Optional[CatStatus] = None
+    size: Optional[CatSize] = None
+    neutered: Optional[bool] = None
+    indoor_only: Optional[bool] = None
+    admitted_from: Optional[date] = None
+    admitted_to: Optional[date] = None
+    released_from: Optional[date] = None
+    released_to: Optional[date] = None
+
+
+class CatBulkUpdate(CatUpdate):
+    """Schemat Pydantic dla aktualizacji jednego kota w operacji masowej.
+
+    Rozszerza CatUpdate o identyfikator aktualizowanego kota.
+    Używany przy operacji PATCH /cats/bulk.
+
+    Attributes:
+        id: Identyfikator kota do aktualizacji.
+    """
+    id: int
+
+
+class CatBulkDelete(BaseModel):
+    """Schemat Pydantic dla masowego usuwania kotów.
+
+    Używany przy operacji DELETE /cats/bulk.
+
+    Attributes:
+        ids: Identyfikatory kotów do usunięcia.
+    """
+    ids: List[int]
+
+
+class CatBulkResult(BaseModel):
+    """Schemat Pydantic dla wyniku operacji masowej na jednym kocie.
+
+    Attributes:
+        id: Identyfikator kota.
+        status: Wynik operacji (created, updated, deleted, not_found).
+        cat: Aktualne dane kota (dla utworzonych i zaktualizowanych).
+    """
+    id: int
+    status: Literal["created", "updated", "deleted", "not_found"]
+    cat: Optional[Cat] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import date
-from typing import Optional
+from typing import List, Literal, Optional
 from ..models.dog import DogSize, DogStatus
 
 class DogBase(BaseModel):
@@ -93,3 +93,60 @@ class Dog(DogBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+class DogFilter(BaseModel):
+    """Schemat Pydantic dla filtrów listy psów.
+
+    Wszystkie pola są opcjonalne, a podane filtry są łączone koniunkcją
+    i wykonywane po stronie bazy danych.
+    Używany przy operacji GET /dogs/.
+
+    Attributes:
+        status: Status psa (opcjonalne).
+        size: Rozmiar psa (opcjonalne).
+        neutered: Czy pies jest wysterylizowany/wykastrowany (opcjonalne).
+        admitted_from: Najwcześniejsza data przyjęcia, włącznie (opcjonalne).
+        admitted_to: Najpóźniejsza data przyjęcia, włącznie (opcjonalne).
+        released_from: Najwcześniejsza data wypuszczenia, włącznie (opcjonalne).
+        released_to: Najpóźniejsza data wypuszczenia, włącznie (opcjonalne).
+    """
+    status: Optional[DogStatus] = None
+    size: Optional[DogSize] = None
+    neutered: Optional[bool] = None
+    admitted_from: Optional[date] = None
+    admitted_to: Optional[date] = None
+    released_from: Optional[date] = None
+    released_to: Optional[date] = None
+
+class DogBulkUpdate(DogUpdate):
+    """Schemat Pydantic dla aktualizacji jednego psa w operacji masowej.
+
+    Rozszerza DogUpdate o identyfikator aktualizowanego psa.
+    Używany przy operacji PATCH /dogs/bulk.
+
+    Attributes:
+        id: Identyfikator psa do aktualizacji.
+    """
+    id: int
+
+class DogBulkDelete(BaseModel):
+    """Schemat Pydantic dla masowego usuwania psów.
+
+    Używany przy operacji DELETE /dogs/bulk.
+
+    Attributes:
+        ids: Identyfikatory psów do usunięcia.
+    """
+    ids: List[int]
+
+class DogBulkResult(BaseModel):
+    """Schemat Pydantic dla wyniku operacji masowej na jednym psie.
+
+    Attributes:
+        id: Identyfikator psa.
+        status: Wynik operacji (created, updated, deleted, not_found).
+        dog: Aktualne dane psa (dla utworzonych i zaktualizowanych).
+    """
+    id: int
+    status: Literal["created", "updated", "deleted", "not_found"]
+    dog: Optional[Dog] = None
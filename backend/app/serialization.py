@@ -0,0 +1,91 @@
+import json
+from datetime import date
+from enum import Enum
+from typing import Any, Iterable, List, Optional, Sequence
+from fastapi import Response
+
+
+def _json_default(value: Any) -> Any:
+    """Koduje wartości kolumn nieobsługiwane przez json (daty jako ISO 8601, enumy jako wartość)."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """Koduje dane do JSON w tym samym formacie co JSONResponse FastAPI.
+
+    Args:
+        content: Dane zgodne z JSON (dopuszczalne są też daty i enumy).
+
+    Returns:
+        Dokument JSON w UTF-8.
+    """
+    return json.dumps(
+        content,
+        default=_json_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def encode_rows(rows: Iterable[Sequence[Any]], columns: Sequence[str]) -> bytes:
+    """Koduje wiersze zapytania Core bezpośrednio do tablicy JSON.
+
+    Pomija tworzenie obiektów ORM i walidację Pydantic dla każdego wiersza -
+    wiersze muszą zaczynać się od pól odpowiedzi w kolejności columns
+    (dodatkowe kolumny na końcu wiersza, np. kolumny kursora, są pomijane).
+
+    Args:
+        rows: Wiersze zapytania (krotki wartości kolumn).
+        columns: Nazwy pól odpowiedzi w kolejności kolumn wierszy.
+
+    Returns:
+        Dokument JSON (tablica obiektów) w UTF-8.
+    """
+    return encode_json([dict(zip(columns, row)) for row in rows])
+
+
+def select_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """Parsuje parametr fields (lista pól oddzielonych przecinkami).
+
+    Args:
+        fields: Wartość parametru, np. "id,name,status" (None - wszystkie pola).
+        allowed: Pola schematu odpowiedzi w kolejności schematu.
+
+    Returns:
+        Wybrane pola w kolejności schematu.
+
+    Raises:
+        ValueError: Jeśli podano pole spoza schematu lub nie wybrano żadnego pola.
+    """
+    if fields is None:
+        return list(allowed)
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if not requested:
+        raise ValueError("No fields selected")
+    return [field for field in allowed if field in requested]
+
+
+def json_bytes_response(content: bytes, response: Optional[Response] = None) -> Response:
+    """Tworzy odpowiedź z gotowym dokumentem JSON.
+
+    Args:
+        content: Zakodowany dokument JSON.
+        response: Odpowiedź endpointu - ustawione na niej nagłówki (np. ETag,
+            X-Next-Cursor) są przenoszone do zwracanej odpowiedzi.
+
+    Returns:
+        Odpowiedź application/json, której FastAPI nie waliduje ani nie koduje ponownie.
+    """
+    raw = Response(content=content, media_type="application/json")
+    if response is not None:
+        raw.headers.update(response.headers)
+    return raw
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+from . import database
+from .config import settings
+from .crud import async_animal, async_cat, async_dog
+
+
+class BootMetrics:
+    """Pomiary czasu startu aplikacji.
+
+    Czas startu liczony jest od importu modułu (start procesu aplikacji)
+    do zakończenia części startowej lifespan, czyli gotowości do przyjęcia ruchu.
+
+    Attributes:
+        started: Chwila importu modułu (time.perf_counter).
+        boot_seconds: Czas do gotowości aplikacji w sekundach (None przed zakończeniem startu).
+        phases: Czas trwania kolejnych etapów startu w ms.
+    """
+
+    def __init__(self) -> None:
+        """Inicjalizuje pomiary z początkiem w chwili utworzenia."""
+        self._lock = Lock()
+        self.started: float = time.perf_counter()
+        self.boot_seconds: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Mierzy czas trwania etapu startu.
+
+        Args:
+            name: Nazwa etapu (np. "init_db", "warmup").
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    def ready(self) -> float:
+        """Zapisuje gotowość aplikacji do przyjęcia ruchu.
+
+        Returns:
+            Czas startu w sekundach.
+        """
+        with self._lock:
+            self.boot_seconds = time.perf_counter() - self.started
+            return self.boot_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Zwraca czas startu i czasy poszczególnych etapów."""
+        with self._lock:
+            return {
+                "boot_seconds": round(self.boot_seconds, 6) if self.boot_seconds is not None else None,
+                "phases_ms": dict(self.phases),
+            }
+
+
+def open_pool(engine: Engine, size: int) -> int:
+    """Otwiera jednocześnie `size` połączeń, żeby zapełnić pulę silnika synchronicznego.
+
+    Każde połączenie wykonuje SELECT 1 i wraca do puli, więc pierwsze
+    żądania nie czekają na zestawienie połączenia z bazą danych.
+
+    Args:
+        engine: Silnik bazy danych.
+        size: Liczba połączeń do otwarcia (zwykle DB_POOL_SIZE).
+
+    Returns:
+        Liczba otwartych połączeń.
+    """
+    connections = []
+    try:
+        for _ in range(size):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+async def open_async_pool(engine: AsyncEngine, size: int) -> int:
+    """Asynchroniczna wersja open_pool (połączenia otwierane współbieżnie).
+
+    Args:
+        engine: Asynchroniczny silnik bazy danych.
+        size: Liczba połączeń do otwarcia (zwykle DB_POOL_SIZE).
+
+    Returns:
+        Liczba otwartych połączeń.
+    """
+
+    async def ping() -> Any:
+        connection = await engine.connect()
+        try:
+            await connection.exec_driver_sql("SELECT 1")
+        except BaseException:
+            await connection.close()
+            raise
+        return connection
+
+    results = await asyncio.gather(*(ping() for _ in range(size)), return_exceptions=True)
+    connections = [result for result in results if not isinstance(result, BaseException)]
+    # połączenia wracają do puli dopiero po otwarciu wszystkich
+    await asyncio.gather(*(connection.close() for connection in connections))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(connections)
+
+
+async def warm_up(app: Any) -> None:
+    """Rozgrzewa aplikację przed przyjęciem ruchu.
+
+    Otwiera pule połączeń obu silników do DB_POOL_SIZE i wykonuje raz
+    najczęstsze zapytania (pierwsza strona list psów i kotów, statystyki),
+    żeby skompilowane instrukcje trafiły do pamięci podręcznej SQLAlchemy.
+
+    Args:
+        app: Instancja aplikacji (uwzględnia nadpisane zależności bazy danych).
+    """
+    await run_in_threadpool(open_pool, database.engine, settings.DB_POOL_SIZE)
+    await open_async_pool(database.async_engine, settings.DB_POOL_SIZE)
+    async with database.async_session_scope(app) as db:
+        await async_dog.get_dog_rows(db, limit=1)
+        await async_cat.get_cat_rows(db, limit=1)
+        await async_animal.get_shelter_stats(db)
+
+
+# Pomiary startu aplikacji (początek w chwili importu)
+boot_metrics: BootMetrics = BootMetrics()
@@ -0,0 +1,59 @@
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+# Statystyki tematu bez pola type (np. {"current_in_shelter": 3, ...})
+Snapshot = Dict[str, Any]
+
+
+class StatsStream:
+    """Numery sekwencyjne i ostatnie snapshoty statystyk (protokół WebSocket v2).
+
+    Każdy temat ma własny, rosnący numer sekwencyjny zwiększany przy każdej
+    zmianie statystyk. Klient protokołu v2 dostaje pełny snapshot z numerem,
+    a dalej tylko zmienione pola z kolejnymi numerami; luka w numeracji
+    oznacza utraconą wiadomość i klient prosi o nowy snapshot.
+
+    Numeracja jest lokalna dla procesu - każdy worker liczy różnice ze
+    snapshotów otrzymanych z kanału (backplane), a klient pozostaje
+    połączony z jednym workerem.
+    """
+
+    def __init__(self) -> None:
+        """Inicjalizuje strumień bez żadnych tematów."""
+        self._lock = Lock()
+        self._state: Dict[str, Tuple[int, Snapshot]] = {}
+
+    def advance(self, topic: str, snapshot: Snapshot) -> Optional[Tuple[int, Snapshot]]:
+        """Zapisuje nowy snapshot tematu i zwraca zmienione pola.
+
+        Args:
+            topic: Nazwa tematu ("dogs" lub "cats").
+            snapshot: Aktualne statystyki tematu.
+
+        Returns:
+            Krotka (nowy numer sekwencyjny, zmienione pola) lub None,
+            jeśli statystyki się nie zmieniły (numer nie jest zwiększany).
+        """
+        with self._lock:
+            seq, previous = self._state.get(topic, (0, {}))
+            changes = {key: value for key, value in snapshot.items() if previous.get(key, object()) != value}
+            if not changes:
+                return None
+            seq += 1
+            self._state[topic] = (seq, dict(snapshot))
+            return seq, changes
+
+    def snapshot(self, topic: str) -> Optional[Tuple[int, Snapshot]]:
+        """Zwraca bieżący numer sekwencyjny i snapshot tematu (None, jeśli nieznany)."""
+        with self._lock:
+            state = self._state.get(topic)
+            return None if state is None else (state[0], dict(state[1]))
+
+    def reset(self) -> None:
+        """Usuwa numery i snapshoty wszystkich tematów."""
+        with self._lock:
+            self._state.clear()
+
+
+# Strumień statystyk współdzielony przez całą aplikację
+stats_stream: StatsStream = StatsStream()
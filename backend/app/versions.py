@@ -0,0 +1,170 @@
+from threading import Lock
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from .models.table_version import TableVersion
+
+# Klucze Session.info: tabele zmienione w bieżącej transakcji i ich zwiększone wersje
+_CHANGED_TABLES = "changed_tables"
+_PENDING_VERSIONS = "pending_table_versions"
+
+
+class TableVersions:
+    """Wersje tabel znane bieżącemu procesowi.
+
+    Wersja tabeli przechowywana jest w bazie danych (tabela table_versions)
+    i zwiększana w transakcji każdego zapisu (mark_table_changed), więc
+    wersja identyfikuje stan danych tabeli i służy jako ETag list
+    i pojedynczych zwierząt - taki sam w każdym workerze i po restarcie.
+    Proces trzyma ostatnią znaną wersję w pamięci, więc obsługa
+    If-None-Match nie wymaga zapytania do bazy danych. Po commicie zapisu
+    wersja jest aktualizowana od razu w procesie, który go wykonał,
+    a w pozostałych workerach - po dotarciu zdarzenia z outboxa przez kanał
+    (app.invalidation) lub przy okresowym uzgadnianiu z bazą danych.
+    """
+
+    def __init__(self) -> None:
+        """Inicjalizuje wersje wszystkich tabel na 0."""
+        self._lock = Lock()
+        self._versions: Dict[str, int] = {}
+
+    def advance(self, table: str, version: int) -> int:
+        """Ustawia wersję tabeli, jeśli jest nowsza od znanej.
+
+        Args:
+            table: Nazwa tabeli ("dogs" lub "cats").
+            version: Wersja tabeli odczytana z bazy danych.
+
+        Returns:
+            Bieżąca wersja tabeli.
+        """
+        with self._lock:
+            self._versions[table] = max(self._versions.get(table, 0), version)
+            return self._versions[table]
+
+    def load(self, versions: Dict[str, int]) -> None:
+        """Uzgadnia wersje z odczytanymi z bazy danych (wartości nie są cofane)."""
+        for table, version in versions.items():
+            self.advance(table, version)
+
+    def reset(self) -> None:
+        """Zeruje znane wersje (np. po odtworzeniu tabel bazy danych)."""
+        with self._lock:
+            self._versions.clear()
+
+    def get(self, table: str) -> int:
+        """Zwraca bieżącą wersję tabeli."""
+        with self._lock:
+            return self._versions.get(table, 0)
+
+    def etag(self, *tables: str) -> str:
+        """Zwraca słaby ETag bieżących wersji tabel (np. W/"dogs-7", W/"dogs+cats-7-3")."""
+        versions = "-".join(str(self.get(table)) for table in tables)
+        return f'W/"{"+".join(tables)}-{versions}"'
+
+
+def mark_table_changed(db: Session, table: str) -> None:
+    """Oznacza tabelę jako zmienioną w bieżącej transakcji.
+
+    Wspólna wersja tabeli zwiększana jest tuż przed commitem
+    (_bump_changed_tables), więc blokada wiersza wersji jest ostatnią
+    zakładaną przez transakcję i trzymana możliwie krótko.
+
+    Args:
+        db: Sesja bazy danych z otwartą transakcją zapisu.
+        table: Nazwa tabeli ("dogs" lub "cats").
+    """
+    db.info.setdefault(_CHANGED_TABLES, set()).add(table)
+
+
+def read_table_versions(db: Session) -> Dict[str, int]:
+    """Odczytuje wspólne wersje wszystkich tabel z bazy danych."""
+    return {table: version for table, version in db.execute(select(TableVersion.table_name, TableVersion.version))}
+
+
+def refresh_table_versions(db: Session) -> None:
+    """Uzgadnia wersje tabel procesu z bazą danych (start i okresowe uzgadnianie)."""
+    table_versions.load(read_table_versions(db))
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_changed_tables(session: Session) -> None:
+    """Zwiększa w transakcji wspólne wersje tabel zmienionych przez zapis.
+
+    Wersja zapisywana jest jedną instrukcją INSERT ... ON CONFLICT DO UPDATE
+    (wiersz tabeli tworzony przy pierwszym zapisie); w procesie ustawiana
+    jest dopiero po commicie transakcji. Tabele przetwarzane są w stałej
+    kolejności, żeby współbieżne transakcje blokowały wiersze tak samo.
+    """
+    tables = session.info.pop(_CHANGED_TABLES, None)
+    if not tables:
+        return
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    pending = session.info.setdefault(_PENDING_VERSIONS, {})
+    for table in sorted(tables):
+        stmt = dialect.insert(TableVersion).values(table_name=table, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TableVersion.table_name],
+            set_={"version": TableVersion.version + 1},
+        ).returning(TableVersion.version)
+        pending[table] = session.execute(stmt).scalar_one()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_versions(session: Session) -> None:
+    """Po commicie ustawia w procesie wersje tabel zwiększone w transakcji."""
+    for table, version in session.info.pop(_PENDING_VERSIONS, {}).items():
+        table_versions.advance(table, version)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_versions(session: Session, previous_transaction: Any) -> None:
+    """Po wycofaniu transakcji porzuca wersje tabel, które nie zostały zatwierdzone."""
+    session.info.pop(_CHANGED_TABLES, None)
+    session.info.pop(_PENDING_VERSIONS, None)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Sprawdza nagłówek If-None-Match (porównanie słabe, RFC 9110).
+
+    Args:
+        if_none_match: Wartość nagłówka If-None-Match (może zawierać listę ETagów lub *).
+        etag: Bieżący ETag zasobu.
+
+    Returns:
+        True, jeśli klient ma aktualną wersję zasobu.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, response: Response, *tables: str) -> Optional[Response]:
+    """Ustawia nagłówek ETag wersji tabel i obsługuje If-None-Match.
+
+    Wersja odczytywana jest przed zapytaniem do bazy danych, więc zapis
+    wykonany w trakcie zapytania zmieni ETag przy kolejnym żądaniu.
+
+    Args:
+        request: Żądanie HTTP (z nagłówkiem If-None-Match).
+        response: Odpowiedź endpointu (do ustawienia nagłówka ETag).
+        tables: Nazwy tabel, których wersje wyznaczają ETag.
+
+    Returns:
+        Odpowiedź 304 Not Modified, jeśli klient ma aktualną wersję,
+        w przeciwnym razie None (endpoint wykonuje zapytanie).
+    """
+    etag = table_versions.etag(*tables)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+
+# Wersje tabel współdzielone przez całą aplikację
+table_versions: TableVersions = TableVersions()
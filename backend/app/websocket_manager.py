@@ -1,26 +1,158 @@
-from typing import List
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, Literal, Optional, Set, Tuple
 from fastapi import WebSocket
 from datetime import datetime
 from threading import Lock
+from .backplane import Backplane, InProcessBackplane
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["drop_oldest", "disconnect"]
+
+# Funkcja wywoływana przy dostarczeniu wiadomości tematu; zwraca dodatkowe pary (temat, wiadomość) do rozesłania
+DeliveryHook = Callable[[str, dict], List[Tuple[str, dict]]]
+
+
+class _Connection:
+    """Połączenie WebSocket z własną, ograniczoną kolejką wiadomości wychodzących.
+
+    Kolejkę opróżnia osobne zadanie (writer), więc wolny klient opóźnia
+    wyłącznie własne wiadomości, a błąd wysyłki dotyczy tylko jego połączenia.
+
+    Attributes:
+        websocket: Obsługiwane połączenie WebSocket.
+        topics: Tematy subskrybowane przez połączenie.
+        closed: Czy połączenie zostało zamknięte lub usunięte.
+    """
+
+    def __init__(self, manager: "WebSocketManager", websocket: WebSocket) -> None:
+        """Tworzy kolejkę i uruchamia zadanie wysyłające wiadomości.
+
+        Args:
+            manager: Menedżer, do którego należy połączenie.
+            websocket: Zaakceptowane połączenie WebSocket.
+        """
+        self.manager = manager
+        self.websocket = websocket
+        self.topics: Set[str] = set()
+        self.closed: bool = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=manager.queue_size)
+        self._writer = self._loop.create_task(self._write())
+
+    def enqueue(self, message: dict) -> None:
+        """Dodaje wiadomość do kolejki połączenia bez czekania na wysyłkę.
+
+        Może być wywołana z innej pętli zdarzeń lub wątku - wtedy wiadomość
+        jest przekazywana do pętli, w której działa połączenie.
+
+        Args:
+            message: Słownik z danymi do wysłania jako JSON.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(message)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message: dict) -> None:
+        """Wstawia wiadomość do kolejki, stosując politykę przepełnienia."""
+        if self.closed:
+            return
+        if self._queue.full():
+            if self.manager.overflow_policy == "disconnect":
+                logger.warning("Disconnecting slow WebSocket consumer")
+                self.manager.evicted_connections += 1
+                self.close(code=1013)
+                return
+            # drop_oldest: najstarsza wiadomość ustępuje miejsca najnowszej
+            self._queue.get_nowait()
+            self.manager.dropped_messages += 1
+        self._queue.put_nowait(message)
+
+    async def _write(self) -> None:
+        """Wysyła kolejne wiadomości z kolejki aż do zamknięcia połączenia."""
+        try:
+            while True:
+                message = await self._queue.get()
+                await self.websocket.send_json(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # błąd wysyłki (np. zerwane połączenie) dotyczy tylko tego klienta
+            self.close()
+
+    def close(self, code: int | None = None) -> None:
+        """Zatrzymuje wysyłanie i wypisuje połączenie ze wszystkich tematów.
+
+        Args:
+            code: Kod zamknięcia WebSocket wysyłany klientowi (opcjonalne).
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.manager._forget(self)
+        if asyncio.current_task() is not self._writer:
+            self._writer.cancel()
+        if code is not None:
+            self._loop.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int) -> None:
+        """Zamyka gniazdo WebSocket, ignorując błędy już zerwanego połączenia."""
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
 
 
 class WebSocketManager:
     """Menedżer połączeń WebSocket.
-    
-    Zarządza aktywnymi połączeniami WebSocket i umożliwia wysyłanie wiadomości
-    broadcast do wszystkich podłączonych klientów.
-    
+
+    Zarządza aktywnymi połączeniami WebSocket pogrupowanymi w tematy
+    (np. "dogs", "cats", "status") i umożliwia wysyłanie wiadomości
+    broadcast tylko do subskrybentów danego tematu. Każde połączenie ma
+    własną ograniczoną kolejkę wiadomości, więc broadcast nie czeka na
+    wolnych klientów. Broadcast przechodzi przez kanał (backplane), który
+    dostarcza wiadomość do połączeń wszystkich workerów aplikacji.
+
     Attributes:
-        active_connections: Lista aktywnych połączeń WebSocket.
-        status_connections: Lista połączeń dla statusu serwera.
+        topics: Słownik temat -> zbiór połączeń WebSocket subskrybujących temat.
+        queue_size: Maksymalna liczba oczekujących wiadomości na połączenie.
+        overflow_policy: Zachowanie przy pełnej kolejce ("drop_oldest" lub "disconnect").
+        dropped_messages: Liczba wiadomości odrzuconych przez politykę drop_oldest.
+        evicted_connections: Liczba połączeń rozłączonych przez politykę disconnect.
+        backplane: Kanał rozsyłania wiadomości między workerami (domyślnie w procesie).
         started_at: Czas uruchomienia menedżera.
         last_activity: Czas ostatniej aktywności.
     """
-    
-    def __init__(self) -> None:
-        """Inicjalizuje menedżera z pustą listą połączeń."""
-        self.active_connections: List[WebSocket] = []
-        self.status_connections: List[WebSocket] = []
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        overflow_policy: Optional[OverflowPolicy] = None,
+    ) -> None:
+        """Inicjalizuje menedżera bez żadnych połączeń.
+
+        Args:
+            queue_size: Rozmiar kolejki wiadomości pojedynczego połączenia
+                (domyślnie WS_SEND_QUEUE_SIZE z ustawień).
+            overflow_policy: Polityka przepełnienia kolejki
+                (domyślnie WS_OVERFLOW_POLICY z ustawień).
+        """
+        self.topics: Dict[str, Set[WebSocket]] = defaultdict(set)
+        self._queue_size = queue_size
+        self._overflow_policy = overflow_policy
+        self.dropped_messages: int = 0
+        self.evicted_connections: int = 0
+        self._connections: Dict[WebSocket, _Connection] = {}
+        self.backplane: Backplane = InProcessBackplane(self.deliver)
+        self._delivery_hooks: List[DeliveryHook] = []
         self.started_at: str = datetime.now().isoformat()
         self.last_activity: str | None = None
         # Zmienna współdzielona server_status uzywana przez wszystkie requesty + blokada do synchronizacji
@@ -31,46 +163,134 @@ class WebSocketManager:
             "last_activity": self.last_activity,
         }
 
-    async def connect(self, websocket: WebSocket) -> None:
-        """Akceptuje i dodaje nowe połączenie WebSocket.
-        
+    @property
+    def queue_size(self) -> int:
+        """Rozmiar kolejki wiadomości pojedynczego połączenia."""
+        return self._queue_size if self._queue_size is not None else settings.WS_SEND_QUEUE_SIZE
+
+    @property
+    def overflow_policy(self) -> OverflowPolicy:
+        """Polityka przepełnienia kolejki połączenia."""
+        return self._overflow_policy if self._overflow_policy is not None else settings.WS_OVERFLOW_POLICY
+
+    async def connect(self, websocket: WebSocket, topic: str) -> None:
+        """Akceptuje nowe połączenie WebSocket i zapisuje je do tematu.
+
         Args:
             websocket: Obiekt WebSocket do podłączenia.
+            topic: Nazwa tematu, którego wiadomości ma otrzymywać połączenie.
         """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        connection = self._connections.get(websocket)
+        if connection is None:
+            connection = _Connection(self, websocket)
+            self._connections[websocket] = connection
+        connection.topics.add(topic)
+        self.topics[topic].add(websocket)
+
+    def disconnect(self, websocket: WebSocket, topic: str) -> None:
+        """Usuwa połączenie WebSocket z subskrybentów tematu.
+
+        Jeśli połączenie nie subskrybuje już żadnego tematu, zatrzymywane
+        jest jego zadanie wysyłające.
 
-    async def connect_status(self, websocket: WebSocket) -> None:
-        """Akceptuje i dodaje nowe połączenie WebSocket dla statusu.
-        
         Args:
-            websocket: Obiekt WebSocket do podłączenia.
+            websocket: Obiekt WebSocket do odłączenia.
+            topic: Nazwa tematu, z którego połączenie jest wypisywane.
         """
-        await websocket.accept()
-        self.status_connections.append(websocket)
+        self._unsubscribe(websocket, topic)
+        connection = self._connections.get(websocket)
+        if connection is not None:
+            connection.topics.discard(topic)
+            if not connection.topics:
+                connection.close()
+
+    def _unsubscribe(self, websocket: WebSocket, topic: str) -> None:
+        """Usuwa połączenie ze zbioru subskrybentów tematu."""
+        subscribers = self.topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self.topics[topic]
+
+    def _forget(self, connection: _Connection) -> None:
+        """Usuwa zamknięte połączenie ze wszystkich tematów."""
+        for topic in list(connection.topics):
+            self._unsubscribe(connection.websocket, topic)
+        self._connections.pop(connection.websocket, None)
+
+    def subscribers(self, topic: str) -> Set[WebSocket]:
+        """Zwraca kopię zbioru połączeń subskrybujących temat.
 
-    def disconnect(self, websocket: WebSocket) -> None:
-        """Usuwa połączenie WebSocket z listy aktywnych.
-        
         Args:
-            websocket: Obiekt WebSocket do odłączenia.
+            topic: Nazwa tematu.
         """
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        return set(self.topics.get(topic, ()))
+
+    def send(self, websocket: WebSocket, message: dict) -> None:
+        """Umieszcza wiadomość w kolejce pojedynczego połączenia.
+
+        Zachowuje kolejność względem wiadomości broadcast do tego połączenia.
 
-    def disconnect_status(self, websocket: WebSocket) -> None:
-        """Usuwa połączenie WebSocket z listy statusu.
-        
         Args:
-            websocket: Obiekt WebSocket do odłączenia.
+            websocket: Połączenie docelowe.
+            message: Słownik z danymi do wysłania jako JSON.
         """
-        if websocket in self.status_connections:
-            self.status_connections.remove(websocket)
+        connection = self._connections.get(websocket)
+        if connection is not None:
+            connection.enqueue(message)
+
+    def fan_out(self, topic: str, message: dict) -> None:
+        """Umieszcza wiadomość w kolejkach lokalnych subskrybentów tematu (z pominięciem kanału)."""
+        for websocket in self.subscribers(topic):
+            connection = self._connections.get(websocket)
+            if connection is not None:
+                connection.enqueue(message)
+
+    def add_delivery_hook(self, hook: DeliveryHook) -> None:
+        """Rejestruje funkcję wyznaczającą wiadomości pochodne (np. różnice statystyk).
 
-    async def broadcast(self, message: dict) -> None:
-        """Wysyła wiadomość JSON do wszystkich aktywnych połączeń.
-        
         Args:
+            hook: Funkcja przyjmująca temat i wiadomość dostarczone z kanału,
+                zwracająca listę par (temat, wiadomość) rozsyłanych lokalnie.
+        """
+        if hook not in self._delivery_hooks:
+            self._delivery_hooks.append(hook)
+
+    async def use_backplane(self, backplane: Backplane) -> None:
+        """Uruchamia kanał rozsyłania wiadomości i zatrzymuje poprzedni.
+
+        Args:
+            backplane: Kanał, przez który od teraz przechodzą wiadomości broadcast.
+        """
+        await backplane.start(self.deliver)
+        previous, self.backplane = self.backplane, backplane
+        await previous.stop()
+
+    async def close_backplane(self) -> None:
+        """Zatrzymuje kanał rozsyłania i wraca do dostarczania w obrębie procesu."""
+        await self.use_backplane(InProcessBackplane())
+
+    async def broadcast(self, topic: str, message: dict) -> None:
+        """Wysyła wiadomość JSON do wszystkich subskrybentów tematu.
+
+        Wiadomość publikowana jest w kanale (backplane), który dostarcza ją
+        (metodą deliver) do subskrybentów tematu w każdym workerze.
+
+        Args:
+            topic: Nazwa tematu (np. "dogs", "cats").
+            message: Słownik z danymi do wysłania jako JSON.
+        """
+        await self.backplane.publish(topic, message)
+
+    def deliver(self, topic: str, message: dict) -> None:
+        """Umieszcza wiadomość z kanału w kolejkach lokalnych subskrybentów tematu.
+
+        Wiadomości trafiają do kolejek połączeń - metoda kończy się po ich
+        zakolejkowaniu, niezależnie od szybkości klientów.
+
+        Args:
+            topic: Nazwa tematu (np. "dogs", "cats").
             message: Słownik z danymi do wysłania jako JSON.
         """
         # Aktualizuje współdzielony server_status z użyciem blokady
@@ -78,21 +298,22 @@ class WebSocketManager:
             self.last_activity = datetime.now().isoformat()
             self.server_status["last_activity"] = self.last_activity
 
-        # Wysyła główną wiadomość do wszystkich klientów statystyk
-        for connection in list(self.active_connections):
-            await connection.send_json(message)
+        # Wysyła wiadomość tylko do subskrybentów tematu
+        self.fan_out(topic, message)
+        for hook in self._delivery_hooks:
+            for derived_topic, derived_message in hook(topic, message):
+                self.fan_out(derived_topic, derived_message)
 
         # Po każdej zmianie wysyła aktualny status do klientów statusu
-        await self.broadcast_status()
+        self._fan_out_status()
 
     async def broadcast_status(self) -> None:
         """Wysyła aktualny status serwera do wszystkich połączeń statusowych."""
-        status_message = {"type": "server_status", **self.get_status()}
-        for connection in list(self.status_connections):
-            try:
-                await connection.send_json(status_message)
-            except Exception:
-                pass  # Ignoruj błędy wysylki
+        self._fan_out_status()
+
+    def _fan_out_status(self) -> None:
+        """Umieszcza aktualny status serwera w kolejkach połączeń statusowych."""
+        self.fan_out("status", {"type": "server_status", **self.get_status()})
 
     def get_status(self) -> dict:
         """Zwraca kopię aktualnego server_status z użyciem blokady."""
@@ -0,0 +1,81 @@
+"""Porównanie kosztu CPU listy psów: ścieżka ORM + Pydantic a wiersze Core kodowane do JSON.
+
+Uruchomienie (z katalogu backend):
+    python -m benchmarks.bench_list_serialization [--rows 5000] [--repeat 20]
+
+Baza SQLite w pamięci, więc wynik obejmuje głównie koszt po stronie Pythona:
+tworzenie obiektów ORM, walidację from_attributes i kodowanie JSON.
+"""
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from typing import Callable, List
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import models  # noqa: F401 - rejestracja tabel w Base.metadata
+from app.crud import dog as crud
+from app.database import Base
+from app.models.dog import Dog
+from app.schemas.dog import Dog as DogSchema
+from app.serialization import encode_rows
+
+DOG_LIST = TypeAdapter(List[DogSchema])
+
+
+def orm_path(db: Session) -> bytes:
+    """Dotychczasowa ścieżka: obiekty ORM, walidacja response_model i JSONResponse."""
+    dogs, _ = crud.get_dogs(db)
+    content = DOG_LIST.dump_python(DOG_LIST.validate_python(dogs, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def core_path(db: Session) -> bytes:
+    """Szybka ścieżka: wiersze Core kodowane bezpośrednio do JSON."""
+    rows, _ = crud.get_dog_rows(db)
+    return encode_rows(rows, crud.DOG_FIELDS)
+
+
+def measure(factory: Callable[[], Session], path: Callable[[Session], bytes], repeat: int) -> float:
+    """Zwraca najlepszy czas (w sekundach) z `repeat` wykonań w świeżej sesji."""
+    best = float("inf")
+    for _ in range(repeat):
+        with factory() as db:
+            started = time.perf_counter()
+            path(db)
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Dog), [
+            {"name": f"Pies {i}", "size": ("small", "medium", "large")[i % 3], "birth_date": date(2020, 1, 1),
+             "sex": "male", "neutered": i % 2 == 0, "admitted_date": date(2023, 1, 1) + timedelta(days=i % 365),
+             "released_date": None, "status": "arrived"}
+            for i in range(args.rows)
+        ])
+    factory = sessionmaker(bind=engine)
+
+    with factory() as db:
+        assert json.loads(orm_path(db)) == json.loads(core_path(db))
+
+    orm = measure(factory, orm_path, args.repeat)
+    core = measure(factory, core_path, args.repeat)
+    print(f"rows: {args.rows}")
+    print(f"ORM + Pydantic: {orm * 1e3:8.2f} ms  {orm / args.rows * 1e6:6.2f} us/row")
+    print(f"Core + JSON:    {core * 1e3:8.2f} ms  {core / args.rows * 1e6:6.2f} us/row")
+    print(f"speedup:        {orm / core:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from app.config import settings
+from app.database import Base
+from app import models  # noqa: F401 - rejestracja tabel w Base.metadata
+from app.schema import include_name
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    """Zwraca adres bazy danych: sqlalchemy.url z konfiguracji (np. w testach) lub DATABASE_URL."""
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """Generuje skrypt SQL migracji bez połączenia z bazą danych (alembic upgrade --sql)."""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Wykonuje migracje na bazie danych."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # połączenie przekazane programowo (np. z testów)
+        _run(connection)
+        return
+
+    connectable = create_engine(database_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        _run(connection)
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite nie obsługuje większości ALTER TABLE - zmiany wykonywane są przez kopię tabeli
+        render_as_batch=connection.dialect.name == "sqlite",
+        include_name=include_name,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,87 @@
+"""Schemat początkowy (tabele tworzone wcześniej przez create_all)
+
+Istniejące bazy danych utworzone przez create_all należy oznaczyć tą rewizją
+(alembic stamp 0001) przed wykonaniem alembic upgrade head.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENUMS = {
+    "dogsize": ("small", "medium", "large"),
+    "dogstatus": ("arrived", "adopted", "returned"),
+    "catsize": ("small", "medium", "large"),
+    "catstatus": ("arrived", "adopted", "returned"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "dogs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("size", sa.Enum(*ENUMS["dogsize"], name="dogsize"), nullable=False),
+        sa.Column("birth_date", sa.Date(), nullable=True),
+        sa.Column("sex", sa.String(length=10), nullable=True),
+        sa.Column("neutered", sa.Boolean(), nullable=False),
+        sa.Column("admitted_date", sa.Date(), nullable=False),
+        sa.Column("released_date", sa.Date(), nullable=True),
+        sa.Column("status", sa.Enum(*ENUMS["dogstatus"], name="dogstatus"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_dogs_id", "dogs", ["id"])
+
+    op.create_table(
+        "cats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("size", sa.Enum(*ENUMS["catsize"], name="catsize"), nullable=False),
+        sa.Column("birth_date", sa.Date(), nullable=True),
+        sa.Column("sex", sa.String(length=10), nullable=True),
+        sa.Column("neutered", sa.Boolean(), nullable=False),
+        sa.Column("admitted_date", sa.Date(), nullable=False),
+        sa.Column("released_date", sa.Date(), nullable=True),
+        sa.Column("status", sa.Enum(*ENUMS["catstatus"], name="catstatus"), nullable=False),
+        sa.Column("indoor_only", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_cats_id", "cats", ["id"])
+
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(length=50), nullable=False),
+        sa.Column("species", sa.String(length=10), nullable=False),
+        sa.Column("animal_id", sa.Integer(), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_outbox_events_id", "outbox_events", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_outbox_events_id", table_name="outbox_events")
+    op.drop_table("outbox_events")
+    op.drop_index("ix_cats_id", table_name="cats")
+    op.drop_table("cats")
+    op.drop_index("ix_dogs_id", table_name="dogs")
+    op.drop_table("dogs")
+    bind = op.get_bind()
+    for name in ENUMS:
+        sa.Enum(name=name).drop(bind, checkfirst=True)
@@ -0,0 +1,46 @@
+"""Indeksy dla filtrów statusu i zakresów dat oraz częściowy indeks zwierząt w schronisku
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("dogs", "cats")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(f"ix_{table}_status", table, ["status"])
+        op.create_index(f"ix_{table}_released_date", table, ["released_date"])
+        # filtry zakresu dat przyjęcia i paginacja keyset (admitted_date, id)
+        op.create_index(f"ix_{table}_admitted_date_id", table, ["admitted_date", "id"])
+        # zwierzęta obecnie w schronisku (status arrived)
+        op.create_index(
+            f"ix_{table}_in_shelter",
+            table,
+            ["admitted_date", "id"],
+            postgresql_where=sa.text("status = 'arrived'"),
+            sqlite_where=sa.text("status = 'arrived'"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_in_shelter", table_name=table)
+        op.drop_index(f"ix_{table}_admitted_date_id", table_name=table)
+        op.drop_index(f"ix_{table}_released_date", table_name=table)
+        op.drop_index(f"ix_{table}_status", table_name=table)
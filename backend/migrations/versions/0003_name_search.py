@@ -0,0 +1,63 @@
+"""Indeks wyszukiwania imion zwierząt (FTS5 na SQLite, trigramy pg_trgm na PostgreSQL)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("dogs", "cats")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in TABLES:
+        fts = f"{table}_name_fts"
+        if dialect == "postgresql":
+            op.execute(f"CREATE INDEX ix_{table}_name_trgm ON {table} USING gin (lower(name) gin_trgm_ops)")
+        elif dialect == "sqlite":
+            op.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                f"name, content='{table}', content_rowid='id', tokenize='trigram')"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, name) VALUES ('delete', old.id, old.name); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_update AFTER UPDATE OF name ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, name) VALUES ('delete', old.id, old.name); "
+                f"INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name); END"
+            )
+            # indeksowanie imion zwierząt zapisanych przed migracją
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table in TABLES:
+        fts = f"{table}_name_fts"
+        if dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_name_trgm")
+        elif dialect == "sqlite":
+            for trigger in ("insert", "delete", "update"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{trigger}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
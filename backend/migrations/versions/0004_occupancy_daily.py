@@ -0,0 +1,49 @@
+"""Dzienne zestawienie zajętości schroniska (occupancy_daily)
+
+Tabela wypełniana jest przyjęciami i wypuszczeniami istniejących zwierząt,
+a dalej aktualizowana przyrostowo przez operacje zapisu aplikacji.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("dogs", "cats")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "occupancy_daily",
+        sa.Column("species", sa.String(length=10), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("admitted", sa.Integer(), nullable=False),
+        sa.Column("released", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("species", "day"),
+    )
+    stays = " UNION ALL ".join(
+        f"SELECT '{table}' AS species, admitted_date AS day, 1 AS admitted, 0 AS released FROM {table} "
+        f"UNION ALL SELECT '{table}', released_date, 0, 1 FROM {table} WHERE released_date IS NOT NULL"
+        for table in TABLES
+    )
+    op.execute(
+        "INSERT INTO occupancy_daily (species, day, admitted, released) "
+        f"SELECT species, day, SUM(admitted), SUM(released) FROM ({stays}) AS stays GROUP BY species, day"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("occupancy_daily")
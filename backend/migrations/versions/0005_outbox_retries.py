@@ -0,0 +1,35 @@
+"""Ponawianie przekazania zdarzeń z outboxa (attempts, available_at)
+
+Dispatcher oznacza odczytaną partię jako niedostępną do available_at
+i zwiększa licznik prób; zdarzenia, których konsument nie przyjął, są
+odczytywane ponownie po tym czasie.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("outbox_events", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("outbox_events", sa.Column("available_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("outbox_events") as batch_op:
+        batch_op.drop_column("available_at")
+        batch_op.drop_column("attempts")
@@ -0,0 +1,32 @@
+"""Identyfikator transakcji zdarzeń w outboxie (transaction_id)
+
+Dispatcher nie dzieli zdarzeń jednej transakcji (np. operacji masowej)
+między partie, więc operacja masowa daje jedną aktualizację statystyk.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("outbox_events", sa.Column("transaction_id", sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("outbox_events") as batch_op:
+        batch_op.drop_column("transaction_id")
@@ -0,0 +1,36 @@
+"""Wspólne wersje tabel (table_versions) dla ETagów
+
+Wersje tabel psów i kotów przechowywane są w bazie danych, więc ETag
+jest taki sam we wszystkich workerach i po restarcie aplikacji.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("table_versions")
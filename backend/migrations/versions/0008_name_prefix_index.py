@@ -0,0 +1,39 @@
+"""Indeks lower(name) dla wyszukiwania imion po prefiksie
+
+Zapytania krótsze niż trigram nie mogą korzystać z indeksu trigramowego
+(GIN pg_trgm, FTS5), więc dopasowanie prefiksu obsługuje indeks B-tree
+na lower(name) - z text_pattern_ops na PostgreSQL (LIKE 'prefiks%').
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("dogs", "cats")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table in TABLES:
+        if dialect == "postgresql":
+            op.execute(f"CREATE INDEX ix_{table}_name_lower ON {table} (lower(name) text_pattern_ops)")
+        else:
+            op.execute(f"CREATE INDEX ix_{table}_name_lower ON {table} (lower(name))")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_name_lower")
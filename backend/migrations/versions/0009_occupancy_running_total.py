@@ -0,0 +1,37 @@
+"""Liczba zwierząt na koniec dnia w zestawieniu zajętości (occupancy_daily.occupancy)
+
+Suma narastająca zmian pozwala odczytać stan na początek zakresu historii
+z jednego wiersza zamiast sumowania wszystkich wcześniejszych dni.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("occupancy_daily", sa.Column("occupancy", sa.Integer(), nullable=False, server_default="0"))
+    op.execute(
+        "UPDATE occupancy_daily SET occupancy = ("
+        "SELECT SUM(earlier.admitted - earlier.released) FROM occupancy_daily AS earlier "
+        "WHERE earlier.species = occupancy_daily.species AND earlier.day <= occupancy_daily.day)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("occupancy_daily") as batch_op:
+        batch_op.drop_column("occupancy")
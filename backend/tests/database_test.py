@@ -1,12 +1,28 @@
-from typing import Generator
-from sqlalchemy import create_engine
+import asyncio
+from contextlib import contextmanager
+from typing import AsyncIterator, Generator, Iterator
+from alembic import command
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from app.database import Base
+from sqlalchemy.pool import NullPool
+from app import models  # noqa: F401 - rejestracja tabel w Base.metadata
+from app.database import Base, to_async_url
 from app.config import settings
+from app.cache import entity_cache, stay_stats_cache
+from app.events import dispatcher
+from app.occupancy import counters
+from app.routers import ws
+from app.versions import table_versions
+from app.schema import alembic_config
 
 engine = create_engine(settings.TEST_DATABASE_URL, echo=True)
 TestingSessionLocal = sessionmaker(bind=engine)
 
+# połączenia asynchroniczne nie są współdzielone między pętlami zdarzeń kolejnych modułów testów
+async_engine = create_async_engine(to_async_url(settings.TEST_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 def override_get_db() -> Generator[Session, None, None]:
     """Tworzy sesję bazy danych dla testów.
     Yields:
@@ -18,7 +34,62 @@ def override_get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def override_get_async_db() -> AsyncIterator[AsyncSession]:
+    """Tworzy asynchroniczną sesję bazy danych dla testów.
+    Yields:
+        AsyncSession: Asynchroniczna sesja bazy danych SQLAlchemy.
+    """
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+async def _pause_background() -> None:
+    """Wstrzymuje dispatcher zdarzeń i czeka na zaplanowane wysyłki statystyk."""
+    await dispatcher.pause()
+    await ws.wait_for_broadcasts()
+
+@contextmanager
+def background_paused() -> Iterator[None]:
+    """Wstrzymuje zadania w tle aplikacji uruchomionej przez TestClient.
+
+    Oczekujące zdarzenia z outboxa są przekazywane, a do wyjścia z bloku
+    dispatcher nie odczytuje outboxa i nie planuje wysyłek statystyk, więc
+    w tle nie są wykonywane zapytania do bazy danych.
+    """
+    loop = dispatcher.loop
+    if loop is None or loop.is_closed():
+        yield
+        return
+    asyncio.run_coroutine_threadsafe(_pause_background(), loop).result()
+    try:
+        yield
+    finally:
+        loop.call_soon_threadsafe(dispatcher.resume)
+
 def setup_test_db() -> None:
-    """Przygotowuje bazę danych do testów (drop & create)."""
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    """Przygotowuje bazę danych do testów (drop & create).
+
+    Resetuje również liczniki zajętości, żeby wczytały stan pustej bazy,
+    znane wersje tabel i pamięci podręczne odczytów zwierząt i statystyk
+    długości pobytu.
+    Zadania w tle aplikacji są na ten czas wstrzymane (background_paused).
+    """
+    with background_paused():
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        counters.reset()
+        table_versions.reset()
+        entity_cache.clear()
+        stay_stats_cache.clear()
+
+def migrate_test_db() -> None:
+    """Tworzy schemat testowej bazy danych od zera migracjami Alembic.
+
+    Kolejne wywołania setup_test_db odtwarzają tabele przez create_all,
+    ale zachowują tabelę alembic_version, więc aplikacja widzi aktualną rewizję.
+    """
+    with engine.begin() as connection:
+        Base.metadata.drop_all(bind=connection)
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        command.upgrade(alembic_config(connection), "head")
+
+migrate_test_db()
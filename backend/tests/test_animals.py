@@ -0,0 +1,262 @@
+import json
+from datetime import date
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app.database import get_db, get_async_db
+from tests.database_test import async_engine, background_paused, override_get_db, override_get_async_db, setup_test_db
+
+app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+client = TestClient(app)
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Uruchamia lifespan aplikacji (dispatcher zdarzeń, liczniki) na czas testów modułu."""
+    with client:
+        yield
+
+@pytest.fixture(autouse=True)
+def run_before_each_test():
+    setup_test_db()
+
+
+def _animal(name, admitted_date, **overrides):
+    animal = {"name": name, "size": "small", "birth_date": None, "sex": None, "neutered": False,
+              "admitted_date": admitted_date, "released_date": None, "status": "arrived"}
+    animal.update(overrides)
+    return animal
+
+
+def _create_animals():
+    client.post("/dogs/bulk", json=[
+        _animal("Rex", "2024-01-01"),
+        _animal("Luna", "2024-03-01", status="adopted", released_date="2024-04-01"),
+    ])
+    client.post("/cats/bulk", json=[
+        _animal("Mruczek", "2024-01-01", indoor_only=True),
+        _animal("Filemon", "2024-02-01", size="large"),
+    ])
+
+
+def _count_queries(request):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # zadania w tle (dispatcher zdarzeń, wysyłka statystyk) wstrzymane - liczone są tylko zapytania żądania
+    with background_paused():
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            return request(), statements
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+
+def test_list_animals_single_query():
+    """Test listy psów i kotów pobieranej jednym zapytaniem UNION ALL"""
+    _create_animals()
+    response, statements = _count_queries(lambda: client.get("/animals/"))
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert "UNION ALL" in statements[0]
+
+    body = response.json()
+    # kolejność: data przyjęcia, gatunek, ID
+    assert [(animal["species"], animal["name"]) for animal in body] == [
+        ("cats", "Mruczek"), ("dogs", "Rex"), ("cats", "Filemon"), ("dogs", "Luna"),
+    ]
+    assert body[0]["indoor_only"] is True
+    assert body[1]["indoor_only"] is None
+    assert body[1]["size"] == "small"
+
+
+def test_list_animals_filters():
+    """Test filtrów listy całego schroniska"""
+    _create_animals()
+    arrived = client.get("/animals/", params={"status": "arrived"}).json()
+    assert [animal["name"] for animal in arrived] == ["Mruczek", "Rex", "Filemon"]
+    cats = client.get("/animals/", params={"species": "cats", "size": "large"}).json()
+    assert [animal["name"] for animal in cats] == ["Filemon"]
+    assert client.get("/animals/", params={"species": "birds"}).status_code == 422
+
+
+def test_paginate_animals_across_species():
+    """Test paginacji kursorowej przez obie tabele (powtarzające się ID psów i kotów)"""
+    _create_animals()
+    names = []
+    cursor = None
+    while True:
+        params = {"limit": 1, "fields": "name"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/animals/", params=params)
+        names += [animal["name"] for animal in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert names == ["Mruczek", "Rex", "Filemon", "Luna"]
+    assert client.get("/animals/", params={"cursor": "invalid"}).status_code == 400
+
+
+def test_animal_stats():
+    """Test statystyk całego schroniska z filtrami"""
+    _create_animals()
+    response, statements = _count_queries(lambda: client.get("/animals/stats"))
+    assert len(statements) == 1
+    stats = response.json()
+    assert stats["dogs"] == {"current_in_shelter": 1, "adopted_total": 1, "returned_total": 0, "all_dogs_total": 2}
+    assert stats["cats"]["all_cats_total"] == 2
+    assert stats["animals"] == {"current_in_shelter": 3, "adopted_total": 1, "returned_total": 0, "all_animals_total": 4}
+
+    filtered = client.get("/animals/stats", params={"species": "cats", "size": "large"}).json()
+    assert set(filtered) == {"cats", "animals"}
+    assert filtered["animals"]["all_animals_total"] == 1
+
+
+def test_animals_etag_changes_on_either_table():
+    """Test ETagu łączącego wersje tabel psów i kotów"""
+    etag = client.get("/animals/").headers["etag"]
+    assert client.get("/animals/", headers={"If-None-Match": etag}).status_code == 304
+    client.post("/cats/bulk", json=[_animal("Mruczek", "2024-01-01")])
+    assert client.get("/animals/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def _occupancy(date_from, date_to):
+    response = client.get("/animals/occupancy", params={"date_from": date_from, "date_to": date_to})
+    assert response.status_code == 200
+    return [(day["day"], day["dogs"], day["cats"], day["total"]) for day in response.json()]
+
+
+def _ad_hoc_occupancy(days):
+    animals = client.get("/animals/").json()
+
+    def in_shelter(species, day):
+        return sum(
+            1 for animal in animals
+            if animal["species"] == species and animal["admitted_date"] <= day
+            and (animal["released_date"] is None or animal["released_date"] > day)
+        )
+
+    return [(day, in_shelter("dogs", day), in_shelter("cats", day), in_shelter("dogs", day) + in_shelter("cats", day))
+            for day in days]
+
+
+def test_occupancy_history():
+    """Test dziennej historii zajętości z zestawienia (bez odczytu tabel zwierząt)"""
+    client.post("/dogs/bulk", json=[
+        _animal("Rex", "2024-01-01"),
+        _animal("Luna", "2024-01-02", status="adopted", released_date="2024-01-04"),
+    ])
+    client.post("/cats/", json=_animal("Mruczek", "2024-01-03", indoor_only=True))
+
+    response, statements = _count_queries(lambda: _occupancy("2023-12-31", "2024-01-05"))
+    assert response == [
+        ("2023-12-31", 0, 0, 0),
+        ("2024-01-01", 1, 0, 1),
+        ("2024-01-02", 2, 0, 2),
+        ("2024-01-03", 2, 1, 3),
+        ("2024-01-04", 1, 1, 2),
+        ("2024-01-05", 1, 1, 2),
+    ]
+    assert statements and all("occupancy_daily" in statement and "dogs." not in statement for statement in statements)
+    # stan na początek zakresu odczytywany jest z sumy narastającej, bez sumowania wcześniejszych dni
+    assert not any("sum(" in statement.lower() for statement in statements)
+    # stan na początek zakresu uwzględnia wcześniejsze dni
+    assert _occupancy("2024-01-04", "2024-01-04") == [("2024-01-04", 1, 1, 2)]
+
+
+def test_occupancy_rollup_follows_writes():
+    """Test przyrostowej aktualizacji zestawienia przy zapisach, operacjach masowych i imporcie"""
+    days = [f"2024-01-{day:02d}" for day in range(1, 11)]
+    created = client.post("/dogs/bulk", json=[
+        _animal("Rex", "2024-01-01"),
+        _animal("Luna", "2024-01-02"),
+        _animal("Max", "2024-01-03", status="adopted", released_date="2024-01-06"),
+    ]).json()
+    rex_id, luna_id, max_id = [result["id"] for result in created]
+    cat_id = client.post("/cats/", json=_animal("Mruczek", "2024-01-04", indoor_only=True)).json()["id"]
+    assert _occupancy(days[0], days[-1]) == _ad_hoc_occupancy(days)
+
+    assert client.put(f"/dogs/{rex_id}", json={"status": "adopted", "released_date": "2024-01-05"}).status_code == 200
+    assert client.put(f"/cats/{cat_id}", json={"admitted_date": "2024-01-02"}).status_code == 200
+    assert client.patch("/dogs/bulk", json=[{"id": luna_id, "admitted_date": "2024-01-07"}, {"id": max_id, "released_date": None}]).status_code == 200
+    assert _occupancy(days[0], days[-1]) == _ad_hoc_occupancy(days)
+    # suma narastająca dni po zmianach wcześniejszych dat
+    assert _occupancy(days[5], days[-1]) == _ad_hoc_occupancy(days[5:])
+
+    assert client.delete(f"/dogs/{max_id}").status_code == 200
+    assert client.request("DELETE", "/dogs/bulk", json={"ids": [luna_id]}).status_code == 200
+    assert client.post("/cats/import", content=json.dumps(_animal("Filemon", "2024-01-08", indoor_only=False))).status_code == 200
+    assert _occupancy(days[0], days[-1]) == _ad_hoc_occupancy(days)
+    assert _occupancy(days[8], days[-1]) == _ad_hoc_occupancy(days[8:])
+
+
+def test_occupancy_range_validation_and_etag():
+    """Test walidacji zakresu dat i ETagu historii zajętości"""
+    assert client.get("/animals/occupancy", params={"date_from": "2024-01-02", "date_to": "2024-01-01"}).status_code == 422
+    assert client.get("/animals/occupancy", params={"date_from": "2000-01-01", "date_to": "2024-01-01"}).status_code == 422
+    # domyślnie ostatnie 30 dni
+    assert len(client.get("/animals/occupancy").json()) == 30
+
+    params = {"date_to": "2024-01-31"}
+    first = client.get("/animals/occupancy", params=params)
+    assert len(first.json()) == 30
+    etag = first.headers["etag"]
+    assert client.get("/animals/occupancy", params=params, headers={"If-None-Match": etag}).status_code == 304
+    client.post("/dogs/", json=_animal("Rex", "2024-01-15"))
+    assert client.get("/animals/occupancy", params=params, headers={"If-None-Match": etag}).status_code == 200
+
+
+def _released(name, admitted_date, released_date, **overrides):
+    return _animal(name, admitted_date, status="adopted", released_date=released_date, **overrides)
+
+
+def test_length_of_stay_stats():
+    """Test rozkładów długości pobytu liczonych w bazie danych (percentyle z interpolacją, histogram)"""
+    client.post("/dogs/bulk", json=[
+        _released("Rex", "2024-01-01", "2024-01-02"),
+        _released("Luna", "2024-01-01", "2024-01-03"),
+        _released("Max", "2024-01-01", "2024-01-04"),
+        _released("Burek", "2024-01-01", "2024-01-11"),
+    ])
+    client.post("/cats/", json=_animal("Mruczek", "2024-01-01", size="large", neutered=True, indoor_only=True))
+
+    response = client.get("/animals/length-of-stay")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["as_of"] == date.today().isoformat()
+    # grupy uporządkowane po gatunku, rozmiarze i sterylizacji
+    assert [group["species"] for group in body["groups"]] == ["cats", "dogs"]
+    groups = {group["species"]: group for group in body["groups"]}
+    dogs, cats = groups["dogs"], groups["cats"]
+    assert (dogs["species"], dogs["size"], dogs["neutered"]) == ("dogs", "small", False)
+    assert (dogs["count"], dogs["in_shelter"], dogs["min_days"], dogs["max_days"]) == (4, 0, 1, 10)
+    assert (dogs["mean_days"], dogs["median_days"], dogs["p90_days"], dogs["p99_days"]) == (4.0, 2.5, 7.9, 9.79)
+    assert [bucket["count"] for bucket in dogs["histogram"]] == [3, 1, 0, 0, 0, 0]
+    assert dogs["histogram"][-1] == {"min_days": 365, "max_days": None, "count": 0}
+
+    # trwający pobyt liczony jest do dzisiaj
+    open_stay = (date.today() - date(2024, 1, 1)).days
+    assert (cats["species"], cats["size"], cats["neutered"], cats["in_shelter"]) == ("cats", "large", True, 1)
+    assert cats["median_days"] == cats["p99_days"] == cats["max_days"] == open_stay
+
+    filtered = client.get("/animals/length-of-stay", params={"species": "cats"}).json()
+    assert [group["species"] for group in filtered["groups"]] == ["cats"]
+
+
+def test_length_of_stay_cached_until_write():
+    """Test zapamiętywania statystyk długości pobytu do następnego zapisu"""
+    client.post("/dogs/", json=_released("Rex", "2024-01-01", "2024-01-05"))
+    first = client.get("/animals/length-of-stay").json()
+
+    response, statements = _count_queries(lambda: client.get("/animals/length-of-stay"))
+    assert response.json() == first
+    assert statements == []
+
+    client.post("/dogs/", json=_released("Luna", "2024-01-01", "2024-01-03"))
+    response, statements = _count_queries(lambda: client.get("/animals/length-of-stay"))
+    assert response.json()["groups"][0]["count"] == 2
+    assert len(statements) == 1
@@ -0,0 +1,88 @@
+import asyncio
+from app.broadcaster import StatsBroadcaster
+
+
+class FakeManager:
+    """Atrapa menedżera WebSocket zapisująca wysłane wiadomości."""
+
+    def __init__(self) -> None:
+        self.sent = []
+
+    async def broadcast(self, topic: str, message: dict) -> None:
+        self.sent.append((topic, message))
+
+
+def test_updates_within_window_are_merged():
+    """Test łączenia aktualizacji zgłoszonych w jednym oknie"""
+    async def scenario():
+        fake = FakeManager()
+        broadcaster = StatsBroadcaster(fake, window=0.05, max_latency=1)
+        state = {"total": 0}
+
+        async def write():
+            state["total"] += 1
+            await broadcaster.request("dogs", lambda: {"all_dogs_total": state["total"]})
+
+        await asyncio.gather(*(write() for _ in range(10)))
+
+        # wysłany jest tylko najnowszy snapshot
+        assert fake.sent == [("dogs", {"all_dogs_total": 10})]
+        assert broadcaster.get_metrics() == {"sent_updates": 1, "merged_updates": 9}
+
+    asyncio.run(scenario())
+
+
+def test_topics_are_coalesced_separately():
+    """Test że tematy są łączone niezależnie"""
+    async def scenario():
+        fake = FakeManager()
+        broadcaster = StatsBroadcaster(fake, window=0.02, max_latency=1)
+
+        await asyncio.gather(
+            broadcaster.request("dogs", lambda: {"type": "dog_stats"}),
+            broadcaster.request("cats", lambda: {"type": "cat_stats"}),
+            broadcaster.request("dogs", lambda: {"type": "dog_stats"}),
+        )
+
+        assert sorted(topic for topic, _ in fake.sent) == ["cats", "dogs"]
+        assert broadcaster.merged_updates == 1
+
+    asyncio.run(scenario())
+
+
+def test_max_latency_bounds_continuous_updates():
+    """Test że ciągły napływ zmian nie opóźnia wysyłki ponad max_latency"""
+    async def scenario():
+        fake = FakeManager()
+        broadcaster = StatsBroadcaster(fake, window=0.05, max_latency=0.15)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first_sent_at = None
+
+        async def stream():
+            nonlocal first_sent_at
+            while loop.time() - started < 0.4:
+                asyncio.ensure_future(broadcaster.request("dogs", lambda: {}))
+                if fake.sent and first_sent_at is None:
+                    first_sent_at = loop.time() - started
+                await asyncio.sleep(0.01)
+
+        await stream()
+        await asyncio.sleep(0.1)
+
+        assert first_sent_at is not None
+        assert first_sent_at < 0.3
+        assert len(fake.sent) >= 2
+
+    asyncio.run(scenario())
+
+
+def test_zero_window_sends_immediately():
+    """Test wysyłki bez opóźnienia przy zerowym oknie"""
+    async def scenario():
+        fake = FakeManager()
+        broadcaster = StatsBroadcaster(fake, window=0, max_latency=0)
+        await broadcaster.request("cats", lambda: {"n": 1})
+        assert fake.sent == [("cats", {"n": 1})]
+
+    asyncio.run(scenario())
@@ -0,0 +1,97 @@
+from app import cache
+from app.cache import EntityCache, MemoryCacheBackend, ResultCache
+from app.versions import table_versions
+
+
+def test_lru_evicts_least_recently_used():
+    """Test wyrzucania najdawniej używanego wpisu po przekroczeniu rozmiaru"""
+    backend = MemoryCacheBackend(max_size=2, ttl=60)
+    backend.set("dogs:1", {"id": 1})
+    backend.set("dogs:2", {"id": 2})
+    assert backend.get("dogs:1") == {"id": 1}
+    backend.set("dogs:3", {"id": 3})
+
+    assert backend.get("dogs:2") is None
+    assert backend.get("dogs:1") == {"id": 1}
+    stats = backend.stats()
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    """Test wygasania wpisów po czasie życia (TTL)"""
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    backend = MemoryCacheBackend(max_size=10, ttl=5)
+    backend.set("cats:1", {"id": 1})
+    now[0] += 4
+    assert backend.get("cats:1") == {"id": 1}
+    now[0] += 2
+    assert backend.get("cats:1") is None
+    assert backend.stats()["expirations"] == 1
+
+
+def test_zero_size_disables_cache():
+    """Test wyłączenia pamięci podręcznej rozmiarem 0"""
+    backend = MemoryCacheBackend(max_size=0, ttl=60)
+    backend.set("dogs:1", {"id": 1})
+    assert backend.get("dogs:1") is None
+
+
+def test_set_skipped_when_table_changed_during_read():
+    """Test pominięcia zapisu danych odczytanych przed równoległym zapisem do tabeli"""
+    entity_cache = EntityCache(MemoryCacheBackend(max_size=10, ttl=60))
+    version = table_versions.get("dogs")
+    table_versions.advance("dogs", version + 1)
+    entity_cache.set("dogs", 1, {"id": 1}, version)
+    assert entity_cache.get("dogs", 1) is None
+
+    entity_cache.set("dogs", 1, {"id": 1}, table_versions.get("dogs"))
+    assert entity_cache.get("dogs", 1) == {"id": 1}
+    entity_cache.invalidate("dogs", [1])
+    assert entity_cache.get("dogs", 1) is None
+
+
+def test_backend_is_pluggable():
+    """Test podmiany magazynu wpisów"""
+    class DictBackend(cache.CacheBackend):
+        def __init__(self):
+            self.data = {}
+
+        def get(self, key):
+            return self.data.get(key)
+
+        def set(self, key, value):
+            self.data[key] = value
+
+        def delete(self, keys):
+            for key in keys:
+                self.data.pop(key, None)
+
+        def clear(self):
+            self.data.clear()
+
+        def stats(self):
+            return {"backend": "dict", "size": len(self.data)}
+
+    backend = DictBackend()
+    entity_cache = EntityCache()
+    entity_cache.use(backend)
+    entity_cache.set("cats", 7, {"id": 7}, table_versions.get("cats"))
+    assert backend.data == {"cats:7": {"id": 7}}
+    assert entity_cache.stats() == {"backend": "dict", "size": 1}
+
+
+def test_result_cache_valid_until_table_write():
+    """Test unieważniania wyników zapytań po zapisie do którejkolwiek z tabel"""
+    results = ResultCache(("dogs", "cats"), max_size=2)
+    versions = results.versions()
+    results.set("stays", {"groups": []}, versions)
+    assert results.get("stays") == {"groups": []}
+
+    table_versions.advance("cats", table_versions.get("cats") + 1)
+    assert results.get("stays") is None
+    # wynik odczytany przed zapisem nie jest zapamiętywany
+    results.set("stays", {"groups": []}, versions)
+    assert results.get("stays") is None
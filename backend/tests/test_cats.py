@@ -1,16 +1,24 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
-from app.routers.cat import get_db
-from tests.database_test import override_get_db, setup_test_db, TestingSessionLocal
+from app.database import get_db, get_async_db
+from tests.database_test import override_get_db, override_get_async_db, setup_test_db
 
 @pytest.fixture(autouse=True)
 def run_before_tests():
     setup_test_db()
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 client = TestClient(app)
 
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Uruchamia lifespan aplikacji (dispatcher zdarzeń, liczniki) na czas testów modułu."""
+    with client:
+        yield
+
 @pytest.fixture(autouse=True)
 def run_before_each_test():
     setup_test_db()
@@ -284,3 +292,117 @@ def test_delete_non_existent_cat():
     """Test usuwania nieistniejącego kota"""
     response = client.delete("/cats/9999")
     assert response.status_code == 404
+
+
+def _create_cats_for_filters():
+    cats = [
+        {"name": "Mruczek", "size": "small", "status": "arrived", "indoor_only": True,
+         "admitted_date": "2024-01-01", "released_date": None},
+        {"name": "Filemon", "size": "medium", "status": "adopted", "indoor_only": False,
+         "admitted_date": "2024-02-01", "released_date": "2024-04-01"},
+        {"name": "Puszek", "size": "medium", "status": "arrived", "indoor_only": False,
+         "admitted_date": "2024-03-01", "released_date": None},
+    ]
+    for cat in cats:
+        client.post("/cats/", json={**cat, "birth_date": None, "sex": None, "neutered": False})
+
+
+def test_filter_cats_by_indoor_only_and_status():
+    """Test filtrowania kotów po indoor_only i statusie"""
+    _create_cats_for_filters()
+    response = client.get("/cats/", params={"indoor_only": False, "status": "arrived"})
+    assert response.status_code == 200
+    assert [cat["name"] for cat in response.json()] == ["Puszek"]
+
+
+def test_filter_cats_by_admitted_range():
+    """Test filtrowania kotów po dacie przyjęcia"""
+    _create_cats_for_filters()
+    response = client.get("/cats/", params={"admitted_from": "2024-02-01"})
+    assert [cat["name"] for cat in response.json()] == ["Filemon", "Puszek"]
+
+
+def test_paginate_cats_with_cursor():
+    """Test paginacji keyset po liście kotów"""
+    _create_cats_for_filters()
+    first = client.get("/cats/", params={"limit": 2})
+    assert [cat["name"] for cat in first.json()] == ["Mruczek", "Filemon"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/cats/", params={"limit": 2, "cursor": cursor})
+    assert [cat["name"] for cat in second.json()] == ["Puszek"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def _bulk_cat(name, **overrides):
+    cat = {"name": name, "size": "small", "birth_date": None, "sex": None, "neutered": False,
+           "admitted_date": "2024-01-01", "released_date": None, "status": "arrived", "indoor_only": True}
+    cat.update(overrides)
+    return cat
+
+
+def test_bulk_create_update_delete_cats():
+    """Test masowego tworzenia, aktualizacji i usuwania kotów"""
+    created = client.post("/cats/bulk", json=[_bulk_cat("Mruczek"), _bulk_cat("Filemon")])
+    assert created.status_code == 200
+    ids = [result["id"] for result in created.json()]
+
+    updated = client.patch("/cats/bulk", json=[{"id": ids[0], "indoor_only": False}, {"id": 99999, "name": "Duch"}])
+    assert [result["status"] for result in updated.json()] == ["updated", "not_found"]
+    assert updated.json()[0]["cat"]["indoor_only"] is False
+
+    deleted = client.request("DELETE", "/cats/bulk", json={"ids": ids})
+    assert [result["status"] for result in deleted.json()] == ["deleted", "deleted"]
+    assert client.get("/cats/").json() == []
+
+
+def test_export_cats_ndjson():
+    """Test eksportu kotów w formacie NDJSON"""
+    _create_cats_for_filters()
+    response = client.get("/cats/export", params={"indoor_only": False})
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Filemon", "Puszek"]
+    assert rows[0]["indoor_only"] is False
+
+
+def test_cats_etag_changes_after_bulk_create():
+    """Test odpowiedzi 304 i zmiany ETagu listy kotów po zapisie"""
+    etag = client.get("/cats/").headers["etag"]
+    assert etag.startswith('W/"cats-')
+    assert client.get("/cats/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/cats/bulk", json=[_bulk_cat("Mruczek")])
+    response = client.get("/cats/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [cat["name"] for cat in response.json()] == ["Mruczek"]
+
+
+def test_bulk_update_cats_invalidates_cache():
+    """Test unieważnienia pamięci podręcznej kotów po aktualizacji masowej"""
+    cat_id = client.post("/cats/bulk", json=[_bulk_cat("Mruczek")]).json()[0]["id"]
+    assert client.get(f"/cats/{cat_id}").json()["name"] == "Mruczek"
+
+    client.patch("/cats/bulk", json=[{"id": cat_id, "name": "Filemon"}])
+    assert client.get(f"/cats/{cat_id}").json()["name"] == "Filemon"
+
+    client.request("DELETE", "/cats/bulk", json={"ids": [cat_id]})
+    assert client.get(f"/cats/{cat_id}").status_code == 404
+
+
+def test_list_cats_fast_path_matches_response_model():
+    """Test zgodności listy kotów kodowanej z wierszy Core ze schematem odpowiedzi"""
+    from app.schemas.cat import Cat as CatSchema
+
+    client.post("/cats/bulk", json=[_bulk_cat("Mruczek"), _bulk_cat("Filemon")])
+    body = client.get("/cats/").json()
+    assert [CatSchema.model_validate(cat).model_dump(mode="json") for cat in body] == body
+    assert list(body[0]) == list(CatSchema.model_fields)
+
+
+def test_list_cats_sparse_fields():
+    """Test wyboru pól listy kotów"""
+    client.post("/cats/bulk", json=[_bulk_cat("Mruczek")])
+    response = client.get("/cats/", params={"fields": "indoor_only,name"})
+    assert response.json() == [{"name": "Mruczek", "indoor_only": True}]
+    assert client.get("/cats/", params={"fields": "breed"}).status_code == 422
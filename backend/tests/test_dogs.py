@@ -1,8 +1,13 @@
+import inspect
+import csv
+import io
+import json
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
-from app.routers.dog import get_db
-from tests.database_test import override_get_db, setup_test_db, TestingSessionLocal
+from app.config import settings
+from app.database import get_db, get_async_db
+from tests.database_test import background_paused, override_get_db, override_get_async_db, setup_test_db, TestingSessionLocal
 from datetime import date, timedelta
 
 @pytest.fixture(autouse=True)
@@ -10,8 +15,15 @@ def run_before_tests():
     setup_test_db()
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 client = TestClient(app)
 
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Uruchamia lifespan aplikacji (dispatcher zdarzeń, liczniki) na czas testów modułu."""
+    with client:
+        yield
+
 @pytest.fixture(autouse=True)
 def run_before_each_test():
     setup_test_db()
@@ -309,3 +321,359 @@ def test_delete_dog_by_id():
     assert 2 not in ids
 
 
+
+# ============= TESTY FILTROWANIA I PAGINACJI =============
+
+def _create_dogs_for_filters():
+    dogs = [
+        {"name": "Rex", "size": "small", "status": "arrived", "neutered": True,
+         "admitted_date": "2024-01-01", "released_date": None},
+        {"name": "Luna", "size": "medium", "status": "adopted", "neutered": False,
+         "admitted_date": "2024-02-01", "released_date": "2024-05-01"},
+        {"name": "Max", "size": "large", "status": "arrived", "neutered": False,
+         "admitted_date": "2024-03-01", "released_date": None},
+        {"name": "Bella", "size": "medium", "status": "returned", "neutered": True,
+         "admitted_date": "2024-03-01", "released_date": "2024-06-01"},
+    ]
+    for dog in dogs:
+        client.post("/dogs/", json={**dog, "birth_date": "2020-01-01", "sex": "male"})
+
+
+def test_filter_dogs_by_status():
+    """Test filtrowania psów po statusie"""
+    _create_dogs_for_filters()
+    response = client.get("/dogs/", params={"status": "arrived"})
+    assert response.status_code == 200
+    assert {dog["name"] for dog in response.json()} == {"Rex", "Max"}
+
+
+def test_filter_dogs_by_size_and_neutered():
+    """Test łączenia filtrów rozmiaru i sterylizacji"""
+    _create_dogs_for_filters()
+    response = client.get("/dogs/", params={"size": "medium", "neutered": True})
+    assert [dog["name"] for dog in response.json()] == ["Bella"]
+
+
+def test_filter_dogs_by_date_ranges():
+    """Test filtrowania psów po zakresach dat"""
+    _create_dogs_for_filters()
+    response = client.get("/dogs/", params={"admitted_from": "2024-02-01", "admitted_to": "2024-02-28"})
+    assert [dog["name"] for dog in response.json()] == ["Luna"]
+
+    response = client.get("/dogs/", params={"released_from": "2024-05-15"})
+    assert [dog["name"] for dog in response.json()] == ["Bella"]
+
+
+def test_paginate_dogs_with_cursor():
+    """Test paginacji keyset po liście psów"""
+    _create_dogs_for_filters()
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/dogs/", params=params)
+        assert response.status_code == 200
+        names += [dog["name"] for dog in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 2
+    # sortowanie po dacie przyjęcia, a przy równych datach po ID
+    assert names == ["Rex", "Luna", "Max", "Bella"]
+
+
+def test_paginate_dogs_last_page_has_no_cursor():
+    """Test braku kursora, gdy wszystkie psy mieszczą się na stronie"""
+    _create_dogs_for_filters()
+    response = client.get("/dogs/", params={"limit": 4})
+    assert len(response.json()) == 4
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_paginate_dogs_invalid_cursor():
+    """Test nieprawidłowego kursora"""
+    response = client.get("/dogs/", params={"limit": 2, "cursor": "nie-kursor"})
+    assert response.status_code == 400
+
+
+def _bulk_dog(name, **overrides):
+    dog = {"name": name, "size": "medium", "birth_date": None, "sex": None, "neutered": False,
+           "admitted_date": "2024-01-01", "released_date": None, "status": "arrived"}
+    dog.update(overrides)
+    return dog
+
+
+def test_bulk_create_dogs():
+    """Test masowego tworzenia psów"""
+    response = client.post("/dogs/bulk", json=[_bulk_dog("Rex"), _bulk_dog("Luna"), _bulk_dog("Max")])
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == ["created"] * 3
+    assert [result["dog"]["name"] for result in results] == ["Rex", "Luna", "Max"]
+    assert all(result["id"] == result["dog"]["id"] for result in results)
+    assert len(client.get("/dogs/").json()) == 3
+
+
+def test_bulk_create_dogs_validates_whole_batch():
+    """Test że błąd walidacji jednego psa odrzuca całą partię"""
+    response = client.post("/dogs/bulk", json=[_bulk_dog("Rex"), _bulk_dog("Luna", admitted_date="2999-01-01")])
+    assert response.status_code == 422
+    assert client.get("/dogs/").json() == []
+
+
+def test_bulk_update_dogs():
+    """Test masowej aktualizacji psów z pominięciem nieistniejących"""
+    created = client.post("/dogs/bulk", json=[_bulk_dog("Rex"), _bulk_dog("Luna")]).json()
+    rex_id, luna_id = created[0]["id"], created[1]["id"]
+
+    response = client.patch("/dogs/bulk", json=[
+        {"id": rex_id, "status": "adopted", "released_date": "2024-02-01"},
+        {"id": 99999, "name": "Duch"},
+        {"id": luna_id, "name": "Luna II"},
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == ["updated", "not_found", "updated"]
+    assert results[0]["dog"]["status"] == "adopted"
+    assert results[2]["dog"]["name"] == "Luna II"
+    assert results[2]["dog"]["status"] == "arrived"
+
+
+def test_bulk_delete_dogs():
+    """Test masowego usuwania psów"""
+    created = client.post("/dogs/bulk", json=[_bulk_dog("Rex"), _bulk_dog("Luna"), _bulk_dog("Max")]).json()
+    ids = [created[0]["id"], created[2]["id"], 99999]
+
+    response = client.request("DELETE", "/dogs/bulk", json={"ids": ids})
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == ["deleted", "deleted", "not_found"]
+    assert [dog["name"] for dog in client.get("/dogs/").json()] == ["Luna"]
+
+
+def test_bulk_dogs_too_many_items(monkeypatch):
+    """Test odrzucenia zbyt dużej partii"""
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+    response = client.post("/dogs/bulk", json=[_bulk_dog("Rex"), _bulk_dog("Luna"), _bulk_dog("Max")])
+    assert response.status_code == 413
+    assert client.get("/dogs/").json() == []
+
+
+def test_export_dogs_ndjson():
+    """Test eksportu psów w formacie NDJSON z filtrami"""
+    _create_dogs_for_filters()
+    response = client.get("/dogs/export", params={"status": "arrived"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Rex", "Max"]
+    assert rows[0]["size"] == "small"
+    assert rows[0]["admitted_date"] == "2024-01-01"
+
+
+def test_export_dogs_csv_in_batches(monkeypatch):
+    """Test eksportu psów w formacie CSV odczytywanego partiami"""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 3)
+    _create_dogs_for_filters()
+    response = client.get("/dogs/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="dogs.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["Rex", "Luna", "Max", "Bella"]
+    assert rows[1]["status"] == "adopted"
+    assert rows[1]["released_date"] == "2024-05-01"
+    assert rows[0]["released_date"] == ""
+
+
+def test_export_dogs_invalid_format():
+    """Test nieobsługiwanego formatu eksportu"""
+    response = client.get("/dogs/export", params={"format": "xml"})
+    assert response.status_code == 422
+
+
+def test_dog_crud_routes_run_on_event_loop():
+    """Test że endpointy CRUD psów są asynchroniczne (nie zajmują wątków z puli)"""
+    from app.routers.dog import router
+    endpoints = {route.name: route.endpoint for route in router.routes}
+    for name in ["list_dogs", "get_one_dog", "create_one_dog", "update_dog", "delete_one_dog",
+                 "create_dogs", "update_dogs", "delete_dogs"]:
+        assert inspect.iscoroutinefunction(endpoints[name]), name
+
+
+# ============= TESTY ETAG / IF-NONE-MATCH =============
+
+def test_list_dogs_not_modified():
+    """Test odpowiedzi 304 dla listy psów przy aktualnym ETagu"""
+    client.post("/dogs/", json=_bulk_dog("Rex"))
+    response = client.get("/dogs/")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"dogs-')
+
+    cached = client.get("/dogs/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+
+def test_dog_write_changes_etag():
+    """Test zmiany ETagu listy i szczegółów psa po zapisie"""
+    dog_id = client.post("/dogs/", json=_bulk_dog("Rex")).json()["id"]
+    list_etag = client.get("/dogs/").headers["etag"]
+    detail_etag = client.get(f"/dogs/{dog_id}").headers["etag"]
+    assert client.get(f"/dogs/{dog_id}", headers={"If-None-Match": detail_etag}).status_code == 304
+
+    client.put(f"/dogs/{dog_id}", json={"name": "Reksio"})
+    response = client.get(f"/dogs/{dog_id}", headers={"If-None-Match": detail_etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Reksio"
+    assert response.headers["etag"] != detail_etag
+
+    client.request("DELETE", "/dogs/bulk", json={"ids": [dog_id]})
+    response = client.get("/dogs/", headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_dogs_not_modified_without_database_query():
+    """Test że odpowiedź 304 nie wykonuje zapytań do bazy danych"""
+    from sqlalchemy import event
+    from tests.database_test import async_engine
+
+    etag = client.get("/dogs/").headers["etag"]
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    # zadania w tle (dispatcher zdarzeń, wysyłka statystyk) wstrzymane - liczone są tylko zapytania żądań
+    with background_paused():
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            assert client.get("/dogs/", headers={"If-None-Match": etag}).status_code == 304
+            assert client.get("/dogs/1", headers={"If-None-Match": etag}).status_code == 304
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    assert statements == []
+
+
+# ============= TESTY PAMIĘCI PODRĘCZNEJ ODCZYTÓW =============
+
+def test_get_dog_served_from_cache_and_invalidated_on_update():
+    """Test odczytu psa z pamięci podręcznej i unieważnienia wpisu po aktualizacji"""
+    from sqlalchemy import event
+    from app.cache import entity_cache
+    from tests.database_test import async_engine
+
+    dog_id = client.post("/dogs/", json=_bulk_dog("Rex")).json()["id"]
+    assert client.get(f"/dogs/{dog_id}").json()["name"] == "Rex"
+    hits = entity_cache.stats()["hits"]
+
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    with background_paused():
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            response = client.get(f"/dogs/{dog_id}")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    assert response.json()["name"] == "Rex"
+    assert statements == []
+    assert entity_cache.stats()["hits"] == hits + 1
+
+    client.put(f"/dogs/{dog_id}", json={"name": "Reksio"})
+    assert client.get(f"/dogs/{dog_id}").json()["name"] == "Reksio"
+
+    client.delete(f"/dogs/{dog_id}")
+    assert client.get(f"/dogs/{dog_id}").status_code == 404
+
+
+def test_cache_metrics_endpoint():
+    """Test endpointu z licznikami pamięci podręcznej"""
+    body = client.get("/metrics/cache").json()
+    assert {"hits", "misses", "evictions", "size", "max_size"} <= set(body)
+
+
+# ============= TESTY SZYBKIEJ ŚCIEŻKI ODCZYTU =============
+
+def test_list_dogs_fast_path_matches_response_model():
+    """Test zgodności listy kodowanej z wierszy Core ze schematem odpowiedzi"""
+    from app.crud import dog as crud
+    from app.schemas.dog import Dog as DogSchema
+
+    _create_dogs_for_filters()
+    response = client.get("/dogs/")
+    assert response.headers["content-type"] == "application/json"
+
+    with TestingSessionLocal() as db:
+        dogs, _ = crud.get_dogs(db)
+        expected = [DogSchema.model_validate(dog).model_dump(mode="json") for dog in dogs]
+    assert response.json() == expected
+    assert list(response.json()[0]) == list(DogSchema.model_fields)
+
+
+def test_fast_path_keeps_cursor_and_etag_headers():
+    """Test przeniesienia nagłówków X-Next-Cursor i ETag do odpowiedzi szybkiej ścieżki"""
+    _create_dogs_for_filters()
+    response = client.get("/dogs/", params={"limit": 2})
+    assert len(response.json()) == 2
+    assert response.headers["x-next-cursor"]
+    assert response.headers["etag"]
+
+
+# ============= TESTY WYBORU PÓL (?fields=) =============
+
+def test_list_dogs_sparse_fields_narrow_select():
+    """Test zawężenia kolumn zapytania SQL i odpowiedzi parametrem fields"""
+    from sqlalchemy import event
+    from tests.database_test import async_engine
+
+    _create_dogs_for_filters()
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = client.get("/dogs/", params={"fields": "status,name,id"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body[0] == {"name": "Rex", "status": "arrived", "id": 1}
+    assert all(set(dog) == {"id", "name", "status"} for dog in body)
+    select_sql = next(statement for statement in statements if statement.lstrip().upper().startswith("SELECT"))
+    assert "birth_date" not in select_sql
+    assert "neutered" not in select_sql
+
+
+def test_list_dogs_sparse_fields_with_pagination():
+    """Test paginacji kursorowej przy polach bez kolumn kursora"""
+    _create_dogs_for_filters()
+    first = client.get("/dogs/", params={"fields": "name", "limit": 3})
+    assert first.json() == [{"name": "Rex"}, {"name": "Luna"}, {"name": "Max"}]
+    second = client.get("/dogs/", params={"fields": "name", "limit": 3, "cursor": first.headers["x-next-cursor"]})
+    assert second.json() == [{"name": "Bella"}]
+
+
+def test_get_dog_sparse_fields():
+    """Test wyboru pól dla pojedynczego psa"""
+    dog_id = client.post("/dogs/", json=_bulk_dog("Rex")).json()["id"]
+    response = client.get(f"/dogs/{dog_id}", params={"fields": "id,name"})
+    assert response.json() == {"name": "Rex", "id": dog_id}
+
+
+def test_dogs_unknown_field_rejected():
+    """Test odrzucenia pola spoza schematu"""
+    response = client.get("/dogs/", params={"fields": "id,password"})
+    assert response.status_code == 422
+    assert "password" in response.json()["detail"]
+    assert client.get("/dogs/1", params={"fields": ","}).status_code == 422
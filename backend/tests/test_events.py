@@ -0,0 +1,236 @@
+import asyncio
+import pytest
+from datetime import date
+from app.crud.dog import create_dog, update_dog, delete_dog, create_dogs, update_dogs, delete_dogs
+from app.crud.cat import create_cat
+from app.database import get_db, get_async_db
+from app.events import AnimalCreated, AnimalDeleted, OutboxDispatcher
+from app.models import OutboxEvent, DogSize, DogStatus, CatSize, CatStatus
+from app.schemas.dog import DogCreate, DogUpdate, DogBulkUpdate
+from app.schemas.cat import CatCreate
+from app.versions import table_versions
+from tests.database_test import setup_test_db, TestingSessionLocal, override_get_db, override_get_async_db
+
+
+class FakeApp:
+    """Atrapa aplikacji przekazująca sesje testowej bazy danych."""
+
+    def __init__(self) -> None:
+        self.dependency_overrides = {get_db: override_get_db, get_async_db: override_get_async_db}
+
+
+@pytest.fixture(autouse=True)
+def run_before_each_test():
+    setup_test_db()
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _dog(**overrides) -> DogCreate:
+    data = dict(name="Rex", size=DogSize.medium, birth_date=None, sex=None, neutered=False,
+                admitted_date=date(2024, 1, 1), released_date=None, status=DogStatus.arrived)
+    data.update(overrides)
+    return DogCreate(**data)
+
+
+def test_crud_records_events_in_outbox(db):
+    """Test zapisu zdarzeń w outboxie przez operacje CRUD"""
+    dog = create_dog(db, _dog())
+    update_dog(db, dog.id, DogUpdate(status=DogStatus.adopted, released_date=date(2024, 2, 1)))
+    delete_dog(db, dog.id)
+
+    events = db.query(OutboxEvent).order_by(OutboxEvent.id).all()
+    assert [event.event_type for event in events] == ["AnimalCreated", "AnimalUpdated", "AnimalDeleted"]
+    assert all(event.species == "dogs" and event.animal_id == dog.id for event in events)
+    assert events[0].payload["status"] == "arrived"
+    assert events[1].payload == {
+        "old": {"status": "arrived", "released_date": None},
+        "new": {"status": "adopted", "released_date": "2024-02-01"},
+    }
+    assert events[2].payload["status"] == "adopted"
+
+
+def test_bulk_operations_record_one_event_per_animal(db):
+    """Test zapisu zdarzeń dla każdego zwierzęcia w operacjach masowych"""
+    dogs = create_dogs(db, [_dog(name="Rex"), _dog(name="Luna")])
+    update_dogs(db, [DogBulkUpdate(id=dogs[0].id, status=DogStatus.adopted), DogBulkUpdate(id=99999, name="Duch")])
+    assert delete_dogs(db, [dog.id for dog in dogs] + [99999]) == [dog.id for dog in dogs]
+
+    events = db.query(OutboxEvent).order_by(OutboxEvent.id).all()
+    assert [event.event_type for event in events] == [
+        "AnimalCreated", "AnimalCreated", "AnimalUpdated", "AnimalDeleted", "AnimalDeleted",
+    ]
+    assert events[2].payload == {"old": {"status": "arrived"}, "new": {"status": "adopted"}}
+
+
+def test_update_without_changes_records_no_event(db):
+    """Test że aktualizacja bez zmian nie zapisuje zdarzenia ani nie zmienia wersji tabeli"""
+    dog = create_dog(db, _dog(name="Rex"))
+    version = table_versions.get("dogs")
+    update_dog(db, dog.id, DogUpdate(name="Rex"))
+    update_dogs(db, [DogBulkUpdate(id=dog.id, status=DogStatus.arrived)])
+    assert table_versions.get("dogs") == version
+    assert [event.event_type for event in db.query(OutboxEvent).all()] == ["AnimalCreated"]
+
+
+def test_failed_write_does_not_record_event(db):
+    """Test że zdarzenie jest wycofywane razem z nieudaną zmianą"""
+    dog = create_dog(db, _dog())
+    with pytest.raises(Exception):
+        update_dog(db, dog.id, DogUpdate(name=None))
+    db.rollback()
+
+    assert [event.event_type for event in db.query(OutboxEvent).all()] == ["AnimalCreated"]
+
+
+def test_dispatcher_delivers_batches_and_clears_outbox(db):
+    """Test przekazania zdarzeń konsumentom i usunięcia ich z outboxa"""
+    for i in range(3):
+        create_dog(db, _dog(name=f"Pies_{i}"))
+    create_cat(db, CatCreate(name="Mruczek", size=CatSize.small, birth_date=None, sex=None,
+                             neutered=False, admitted_date=date(2024, 1, 1), released_date=None,
+                             status=CatStatus.arrived, indoor_only=True))
+
+    received = []
+
+    async def consumer(events):
+        received.append(events)
+
+    async def scenario():
+        dispatcher = OutboxDispatcher(batch_size=3, poll_interval=10)
+        dispatcher.app = FakeApp()
+        dispatcher.subscribe(consumer)
+        assert await dispatcher.dispatch_batch() == 3
+        assert await dispatcher.dispatch_batch() == 1
+        assert await dispatcher.dispatch_batch() == 0
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+
+    assert [len(batch) for batch in received] == [3, 1]
+    assert all(isinstance(event, AnimalCreated) for batch in received for event in batch)
+    assert [event.species for event in received[1]] == ["cats"]
+    assert dispatcher.dispatched_events == 4
+    assert db.query(OutboxEvent).count() == 0
+
+
+def test_bulk_operation_is_dispatched_in_one_batch(db):
+    """Test że zdarzenia jednej transakcji (operacji masowej) nie są dzielone między partie"""
+    create_dogs(db, [_dog(name=f"Pies_{i}") for i in range(5)])
+    create_dog(db, _dog(name="Rex"))
+    received = []
+
+    async def consumer(events):
+        received.append(len(events))
+
+    async def scenario():
+        dispatcher = OutboxDispatcher(batch_size=2)
+        dispatcher.app = FakeApp()
+        dispatcher.subscribe(consumer)
+        while await dispatcher.dispatch_batch():
+            pass
+
+    asyncio.run(scenario())
+    assert received == [5, 1]
+
+
+def test_failing_consumer_does_not_block_others(db):
+    """Test że błąd jednego konsumenta nie zatrzymuje pozostałych, a partia czeka na ponowienie"""
+    create_dog(db, _dog())
+    received = []
+
+    async def failing(events):
+        raise RuntimeError("boom")
+
+    async def consumer(events):
+        received.extend(events)
+
+    async def scenario():
+        dispatcher = OutboxDispatcher(retry_delay=60)
+        dispatcher.app = FakeApp()
+        dispatcher.subscribe(failing)
+        dispatcher.subscribe(consumer)
+        assert await dispatcher.dispatch_batch() == 1
+        # partia niedostępna do upływu retry_delay
+        assert await dispatcher.dispatch_batch() == 0
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    assert len(received) == 1
+    assert dispatcher.dispatched_events == 0
+    event = db.query(OutboxEvent).one()
+    assert event.attempts == 1 and event.available_at is not None
+
+
+def test_failed_batch_is_retried_until_max_attempts(db):
+    """Test ponownego przekazania nieprzyjętej partii i porzucenia jej po max_attempts próbach"""
+    create_dog(db, _dog())
+    attempts = []
+
+    async def flaky(events):
+        attempts.append(len(events))
+        raise RuntimeError("boom")
+
+    async def scenario():
+        dispatcher = OutboxDispatcher(retry_delay=0, max_attempts=3)
+        dispatcher.app = FakeApp()
+        dispatcher.subscribe(flaky)
+        while await dispatcher.dispatch_batch():
+            pass
+
+    asyncio.run(scenario())
+    assert attempts == [1, 1, 1]
+    assert db.query(OutboxEvent).count() == 0
+
+
+def test_dispatcher_wakes_up_on_notify(db):
+    """Test że powiadomienie budzi dispatcher bez czekania na interwał"""
+    received = []
+
+    async def consumer(events):
+        received.extend(events)
+
+    async def scenario():
+        dispatcher = OutboxDispatcher(poll_interval=30)
+        dispatcher.subscribe(consumer)
+        dispatcher.start(FakeApp())
+        try:
+            await asyncio.sleep(0.05)
+            create_dog(db, _dog())
+            dispatcher.notify()
+            for _ in range(100):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert [type(event) for event in received] == [AnimalCreated]
+
+
+def test_events_from_previous_run_are_delivered(db):
+    """Test że zdarzenia zapisane przed awarią procesu nie są tracone"""
+    # zdarzenie zatwierdzone, ale nigdy nie przekazane (brak działającego dispatchera)
+    dog = create_dog(db, _dog())
+    delete_dog(db, dog.id)
+    received = []
+
+    async def consumer(events):
+        received.extend(events)
+
+    async def scenario():
+        dispatcher = OutboxDispatcher()
+        dispatcher.app = FakeApp()
+        dispatcher.subscribe(consumer)
+        await dispatcher.dispatch_batch()
+
+    asyncio.run(scenario())
+    assert [type(event) for event in received] == [AnimalCreated, AnimalDeleted]
@@ -0,0 +1,120 @@
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import get_db, get_async_db
+from app.importer import ImportValidationError, _copy_field, import_animals
+from app.models import Dog, OutboxEvent
+from app.schemas.dog import DogCreate
+from tests.database_test import override_get_db, override_get_async_db, setup_test_db, TestingSessionLocal, background_paused
+
+app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Uruchamia lifespan aplikacji (dispatcher zdarzeń, liczniki) na czas testów modułu."""
+    with client:
+        yield
+
+
+@pytest.fixture(autouse=True)
+def run_before_each_test():
+    setup_test_db()
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+DOGS_CSV = (
+    "name,size,birth_date,sex,neutered,admitted_date,released_date,status\n"
+    "Rex,small,2020-01-01,male,true,2024-01-01,,arrived\n"
+    "Luna,medium,,,false,2024-02-01,2024-03-01,adopted\n"
+    "Max,large,,female,1,2024-03-01,,arrived\n"
+)
+
+
+def test_import_dogs_csv():
+    """Test importu psów z pliku CSV"""
+    response = client.post("/dogs/import", params={"format": "csv"}, content=DOGS_CSV)
+    assert response.status_code == 200
+    assert response.json() == {"imported": 3}
+
+    dogs = client.get("/dogs/").json()
+    assert [dog["name"] for dog in dogs] == ["Rex", "Luna", "Max"]
+    assert dogs[0]["neutered"] is True
+    assert dogs[1]["birth_date"] is None
+    assert dogs[1]["released_date"] == "2024-03-01"
+
+
+def test_import_cats_ndjson():
+    """Test importu kotów z pliku NDJSON"""
+    cats = [
+        {"name": "Mruczek", "size": "small", "birth_date": None, "sex": None, "neutered": False,
+         "admitted_date": "2024-01-01", "released_date": None, "status": "arrived", "indoor_only": True},
+        {"name": "Filemon", "size": "medium", "birth_date": None, "sex": None, "neutered": True,
+         "admitted_date": "2024-02-01", "released_date": None, "status": "arrived", "indoor_only": False},
+    ]
+    body = "\n".join(json.dumps(cat) for cat in cats) + "\n\n"
+    response = client.post("/cats/import", content=body)
+    assert response.status_code == 200
+    assert response.json() == {"imported": 2}
+    assert len(client.get("/cats/").json()) == 2
+
+
+def test_import_invalid_record_rolls_back():
+    """Test że niepoprawny rekord (data z przyszłości) wycofuje cały import"""
+    body = DOGS_CSV + "Duch,small,,,false,2999-01-01,,arrived\n"
+    response = client.post("/dogs/import", params={"format": "csv"}, content=body)
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 5
+    assert response.json()["detail"]["errors"][0]["loc"] == ["admitted_date"]
+    assert client.get("/dogs/").json() == []
+
+
+def test_export_can_be_imported_back():
+    """Test ponownego importu pliku z eksportu"""
+    client.post("/dogs/import", params={"format": "csv"}, content=DOGS_CSV)
+    exported = client.get("/dogs/export", params={"format": "csv"}).text
+    setup_test_db()
+
+    response = client.post("/dogs/import", params={"format": "csv"}, content=exported)
+    assert response.json() == {"imported": 3}
+
+
+def test_import_in_chunks_records_single_event(db):
+    """Test importu partiami z jednym zdarzeniem w outboxie"""
+    # wstrzymany dispatcher nie przekaże (i nie usunie) zdarzenia przed sprawdzeniem outboxa
+    with background_paused():
+        imported = import_animals(db, Dog, DogCreate, io.StringIO(DOGS_CSV), "csv", chunk_size=2)
+        events = db.query(OutboxEvent).all()
+
+    assert imported == 3
+    assert db.query(Dog).count() == 3
+    assert [(event.event_type, event.animal_id, event.payload) for event in events] == [
+        ("AnimalsImported", None, {"count": 3}),
+    ]
+
+
+def test_import_invalid_ndjson_record(db):
+    """Test błędu walidacji rekordu NDJSON z numerem linii"""
+    with pytest.raises(ImportValidationError) as exc_info:
+        import_animals(db, Dog, DogCreate, io.StringIO('{"name": "Rex"}\n'), "ndjson")
+    assert exc_info.value.line == 1
+    assert db.query(Dog).count() == 0
+
+
+def test_copy_fields_distinguish_null_from_empty_string():
+    """Test kodowania pól COPY: None jako NULL (puste, niecytowane), pusty napis cytowany"""
+    assert [_copy_field(value) for value in (None, "", 'Rex "Junior", Sr', 3, True)] == [
+        "", '""', '"Rex ""Junior"", Sr"', "3", "True",
+    ]
@@ -0,0 +1,108 @@
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from app.database import Base
+from app.schema import SchemaRevisionError, alembic_config, head_revision, include_name, verify_schema_revision
+
+# SQLite nie odczytuje indeksów wyrażeń (lower(name)) - są pomijane przy porównaniu schematu
+pytestmark = pytest.mark.filterwarnings("ignore:Skipped unsupported reflection of expression-based index")
+
+
+@pytest.fixture
+def empty_engine(tmp_path):
+    """Silnik pustej bazy SQLite (bez tabel i rewizji)."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _upgrade(engine, revision="head"):
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), revision)
+
+
+def test_migrations_match_models(empty_engine):
+    """Test że schemat z migracji jest zgodny z modelami ORM"""
+    _upgrade(empty_engine)
+    with empty_engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection, opts={"include_name": include_name}), Base.metadata) == []
+
+
+def test_migrations_create_performance_indexes(empty_engine):
+    """Test indeksów statusu, dat i częściowego indeksu zwierząt w schronisku"""
+    _upgrade(empty_engine)
+    for table in ("dogs", "cats"):
+        indexes = {index["name"]: index for index in inspect(empty_engine).get_indexes(table)}
+        assert indexes[f"ix_{table}_status"]["column_names"] == ["status"]
+        assert indexes[f"ix_{table}_released_date"]["column_names"] == ["released_date"]
+        assert indexes[f"ix_{table}_admitted_date_id"]["column_names"] == ["admitted_date", "id"]
+        assert f"ix_{table}_in_shelter" in indexes
+
+
+def test_migrations_create_name_search_index(empty_engine):
+    """Test indeksu FTS5 imion aktualizowanego wyzwalaczami"""
+    _upgrade(empty_engine, "0002")
+    with empty_engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO dogs (name, size, neutered, admitted_date, status) "
+            "VALUES ('Burek', 'small', 0, '2024-01-01', 'arrived')"
+        ))
+    _upgrade(empty_engine)
+    with empty_engine.begin() as connection:
+        # imiona sprzed migracji są indeksowane, kolejne zapisy aktualizują indeks wyzwalaczami
+        connection.execute(text(
+            "INSERT INTO dogs (name, size, neutered, admitted_date, status) "
+            "VALUES ('Azor', 'small', 0, '2024-01-01', 'arrived')"
+        ))
+        connection.execute(text("UPDATE dogs SET name = 'Reksio' WHERE name = 'Burek'"))
+        found = connection.execute(text("SELECT name FROM dogs_name_fts WHERE dogs_name_fts MATCH 'eks'"))
+        assert [row.name for row in found] == ["Reksio"]
+        assert connection.execute(text("SELECT count(*) FROM dogs_name_fts WHERE dogs_name_fts MATCH 'azo'")).scalar() == 1
+        assert connection.execute(text("SELECT count(*) FROM dogs_name_fts WHERE dogs_name_fts MATCH 'ure'")).scalar() == 0
+
+
+def test_migrations_backfill_occupancy_running_total(empty_engine):
+    """Test wypełnienia sumy narastającej zestawienia zajętości dla istniejących dni"""
+    _upgrade(empty_engine, "0008")
+    with empty_engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO occupancy_daily (species, day, admitted, released) VALUES "
+            "('dogs', '2024-01-01', 2, 0), ('dogs', '2024-01-03', 1, 1), ('dogs', '2024-01-05', 0, 2), "
+            "('cats', '2024-01-02', 1, 0)"
+        ))
+    _upgrade(empty_engine)
+    with empty_engine.connect() as connection:
+        rows = connection.execute(text("SELECT species, day, occupancy FROM occupancy_daily ORDER BY species, day"))
+        assert [tuple(row) for row in rows] == [
+            ("cats", "2024-01-02", 1),
+            ("dogs", "2024-01-01", 2),
+            ("dogs", "2024-01-03", 2),
+            ("dogs", "2024-01-05", 0),
+        ]
+
+
+def test_verify_schema_revision(empty_engine):
+    """Test sprawdzania rewizji schematu przy starcie aplikacji"""
+    with empty_engine.connect() as connection:
+        with pytest.raises(SchemaRevisionError):
+            verify_schema_revision(connection)
+
+    _upgrade(empty_engine, "0001")
+    with empty_engine.connect() as connection:
+        with pytest.raises(SchemaRevisionError):
+            verify_schema_revision(connection)
+
+    _upgrade(empty_engine)
+    with empty_engine.connect() as connection:
+        verify_schema_revision(connection)
+        assert head_revision() == "0009"
+
+
+def test_downgrade_to_base(empty_engine):
+    """Test wycofania wszystkich migracji"""
+    _upgrade(empty_engine)
+    with empty_engine.begin() as connection:
+        command.downgrade(alembic_config(connection), "base")
+    assert set(inspect(empty_engine).get_table_names()) == {"alembic_version"}
@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from app.config import settings
+from app.main import app
+from app.pool_metrics import PoolMetrics, instrumented_pool_class
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def metrics():
+    return PoolMetrics()
+
+
+@pytest.fixture
+def pool_engine(metrics):
+    """Silnik z małą, instrumentowaną pulą (1 połączenie + 1 ponad limit)."""
+    engine = create_engine(
+        settings.TEST_DATABASE_URL,
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    metrics.attach(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_and_checkins_are_counted(pool_engine, metrics):
+    """Test zliczania pobrań i zwrotów połączeń"""
+    for _ in range(3):
+        with pool_engine.connect():
+            assert metrics.snapshot()["in_use"] == 1
+
+    stats = metrics.snapshot()
+    assert stats["checkouts"] == 3
+    assert stats["checkins"] == 3
+    assert stats["connections_created"] == 1
+    assert stats["in_use"] == 0
+    assert stats["pool_size"] == 1
+
+
+def test_overflow_and_timeout_are_reported(pool_engine, metrics):
+    """Test raportowania połączeń ponad pool_size i przekroczeń pool_timeout"""
+    first = pool_engine.connect()
+    second = pool_engine.connect()
+    try:
+        stats = metrics.snapshot()
+        assert stats["overflow_events"] == 1
+        assert stats["overflow"] == 1
+        assert stats["in_use"] == 2
+
+        with pytest.raises(PoolTimeoutError):
+            pool_engine.connect()
+    finally:
+        first.close()
+        second.close()
+
+    stats = metrics.snapshot()
+    assert stats["timeouts"] == 1
+    # oczekiwanie zakończone przekroczeniem limitu trwało co najmniej pool_timeout
+    assert stats["wait_time_max_ms"] >= 50
+
+
+def test_pool_metrics_endpoint():
+    """Test endpointu z metrykami pul połączeń"""
+    response = client.get("/metrics/pool")
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"sync", "async"}
+    assert {"checkouts", "in_use", "overflow_events", "wait_time_avg_ms", "timeouts"} <= set(body["sync"])
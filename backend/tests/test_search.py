@@ -0,0 +1,151 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from app.main import app
+from app.database import get_db, get_async_db
+from app.crud.search import fts_query, search_rows, similarity
+from app.models import Dog
+from tests.database_test import (
+    async_engine, background_paused, engine, override_get_db, override_get_async_db, setup_test_db, TestingSessionLocal,
+)
+
+app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+client = TestClient(app)
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Uruchamia lifespan aplikacji (dispatcher zdarzeń, liczniki) na czas testów modułu."""
+    with client:
+        yield
+
+@pytest.fixture(autouse=True)
+def run_before_each_test():
+    setup_test_db()
+
+
+def _create(species, *names, **overrides):
+    animals = []
+    for name in names:
+        animal = {"name": name, "size": "small", "birth_date": None, "sex": None, "neutered": False,
+                  "admitted_date": "2024-01-01", "released_date": None, "status": "arrived"}
+        animal.update(overrides)
+        animals.append(animal)
+    response = client.post(f"/{species}/bulk", json=animals)
+    assert response.status_code == 200
+    return [result["id"] for result in response.json()]
+
+
+def _names(species, q, **params):
+    response = client.get(f"/{species}/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return [animal["name"] for animal in response.json()]
+
+
+def test_similarity_matches_pg_trgm():
+    """Test podobieństwa trigramowego zgodnego z pg_trgm"""
+    assert similarity("Burek", "burek") == 1.0
+    # 3 wspólne z 9 różnych trigramów
+    assert similarity("burek", "burke") == pytest.approx(1 / 3)
+    assert similarity("Rex", "Mruczek") == 0.0
+    assert fts_query('ab"c') == '"ab""" OR "b""c"'
+
+
+def test_search_dogs_ranking():
+    """Test kolejności wyników: prefiks, podciąg, literówka"""
+    _create("dogs", "Reksio", "Burek", "Azor", "Burko", "Saburek")
+    assert _names("dogs", "bure") == ["Burek", "Saburek", "Burko"]
+    assert _names("dogs", "urek") == ["Burek", "Saburek"]
+    # literówki - kolejność według podobieństwa trigramowego
+    assert _names("dogs", "Burke") == ["Burko", "Burek"]
+    assert _names("dogs", "reksjo") == ["Reksio"]
+    assert _names("dogs", "ksi") == ["Reksio"]
+    assert _names("dogs", "xyz") == []
+
+
+def test_search_uses_name_index():
+    """Test że wyszukiwanie korzysta z indeksu trigramowego jednym zapytaniem (pg_trgm lub FTS5)"""
+    _create("dogs", "Reksio", "Burek")
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        assert _names("dogs", "reks") == ["Reksio"]
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    assert len(statements) == 1
+    if async_engine.dialect.name == "postgresql":
+        # operator % i similarity korzystają z indeksu GIN gin_trgm_ops
+        assert "%" in statements[0] and "similarity(" in statements[0]
+    else:
+        assert "dogs_name_fts MATCH" in statements[0]
+
+
+def test_search_short_query_and_limit():
+    """Test zapytań krótszych niż trigram (tylko prefiks) i limitu wyników"""
+    _create("dogs", "Bo", "Bolek", "Abo", "Bary")
+    assert _names("dogs", "bo") == ["Bo", "Bolek"]
+    assert _names("dogs", "b", limit=2) == ["Bary", "Bo"]
+    assert len(_names("dogs", "bo", limit=1)) == 1
+    assert client.get("/dogs/search", params={"q": ""}).status_code == 422
+    assert client.get("/dogs/search", params={"q": "bo", "limit": 0}).status_code == 422
+
+
+def test_search_short_query_uses_prefix_index():
+    """Test że zapytanie krótsze niż trigram korzysta z indeksu lower(name)"""
+    _create("dogs", "Bo", "Bolek", "Azor")
+    postgresql = engine.dialect.name == "postgresql"
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    db = TestingSessionLocal()
+    try:
+        with background_paused():
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                assert [row.name for row in search_rows(db, Dog, "bo", 10, ["name"])] == ["Bo", "Bolek"]
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+        statement, parameters = statements[-1]
+        if postgresql:
+            # w małej tabeli planista wybrałby odczyt sekwencyjny
+            db.execute(text("SET LOCAL enable_seqscan = off"))
+        explain = "EXPLAIN " if postgresql else "EXPLAIN QUERY PLAN "
+        rows = db.connection().exec_driver_sql(explain + statement, parameters)
+        plan = " ".join(str(value) for row in rows for value in row)
+    finally:
+        db.close()
+    assert "ix_dogs_name_lower" in plan
+
+
+def test_search_typo_match_not_crowded_out():
+    """Test że dopasowanie z literówką nie ginie wśród wielu imion z jednym wspólnym trigramem"""
+    _create("dogs", *["Ure"] * 10, "Burke")
+    assert _names("dogs", "burek", limit=1) == ["Burke"]
+
+
+def test_search_follows_updates_and_deletes():
+    """Test aktualizacji indeksu wyszukiwania przy zmianie imienia i usunięciu"""
+    burek_id, azor_id = _create("dogs", "Burek", "Azor")
+    client.put(f"/dogs/{burek_id}", json={"name": "Reksio"})
+    assert _names("dogs", "burek") == []
+    assert _names("dogs", "reksio") == ["Reksio"]
+    client.delete(f"/dogs/{azor_id}")
+    assert _names("dogs", "azor") == []
+
+
+def test_search_cats_fields_and_etag():
+    """Test wyszukiwania kotów z wyborem pól i ETagiem"""
+    _create("cats", "Mruczek", "Filemon", indoor_only=True)
+    response = client.get("/cats/search", params={"q": "mrucz", "fields": "name"})
+    assert response.json() == [{"name": "Mruczek"}]
+    etag = response.headers["etag"]
+    cached = client.get("/cats/search", params={"q": "mrucz"}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert client.get("/cats/search", params={"q": "x", "fields": "owner"}).status_code == 422
@@ -0,0 +1,81 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from app import database
+from app.config import settings
+from app.database import get_async_db, get_db, to_async_url
+from app.main import app
+from app.startup import open_async_pool, open_pool
+from .database_test import override_get_async_db, override_get_db, setup_test_db
+
+app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module", autouse=True)
+def prepare_db():
+    setup_test_db()
+
+
+def test_import_has_no_side_effects():
+    """Test braku wczytywania konfiguracji i tworzenia silników przy imporcie aplikacji"""
+    script = (
+        "import app.main\n"
+        "from app import database\n"
+        "from app.config import get_settings\n"
+        "print(get_settings.cache_info().currsize, database.engine, database.async_engine)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["0", "None", "None"]
+
+
+def test_open_pool_fills_pool():
+    """Test rozgrzewania puli połączeń silnika synchronicznego"""
+    engine = create_engine(settings.TEST_DATABASE_URL, pool_size=3, max_overflow=0)
+    try:
+        assert open_pool(engine, 3) == 3
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+    finally:
+        engine.dispose()
+
+
+def test_open_async_pool_fills_pool():
+    """Test rozgrzewania puli połączeń silnika asynchronicznego"""
+    async def run():
+        engine = create_async_engine(to_async_url(settings.TEST_DATABASE_URL), pool_size=3, max_overflow=0)
+        try:
+            opened = await open_async_pool(engine, 3)
+            return opened, engine.sync_engine.pool.checkedin()
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(run()) == (3, 3)
+
+
+def test_lifespan_creates_engines_and_records_boot_time(monkeypatch):
+    """Test tworzenia silników w lifespan, rozgrzewki i zapisu czasu startu"""
+    monkeypatch.setattr(settings, "STARTUP_WARMUP", True)
+    with TestClient(app) as client:
+        assert database.engine is not None
+        assert database.async_engine is not None
+        # rozgrzewka otworzyła DB_POOL_SIZE połączeń
+        assert database.engine.pool.checkedin() == settings.DB_POOL_SIZE
+
+        response = client.get("/metrics/startup")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["boot_seconds"] > 0
+        assert {"init_db", "schema_check", "occupancy", "warmup"} <= set(body["phases_ms"])
+
+    # silniki są zamykane przy zatrzymaniu aplikacji
+    assert database.engine is None
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from datetime import date
+from sqlalchemy import event
+from app.crud.animal import get_shelter_stats, get_occupancy_stats, refresh_occupancy
+from app.crud.dog import get_dog_stats, create_dog, update_dog, delete_dog
+from app.crud.cat import get_cat_stats
+from app.crud import async_animal, async_dog
+from app.models import Dog, DogSize, DogStatus, Cat, CatSize, CatStatus
+from app.occupancy import counters
+from app.schemas.dog import DogCreate, DogUpdate
+from tests.database_test import setup_test_db, TestingSessionLocal, TestingAsyncSessionLocal, engine
+
+
+@pytest.fixture(autouse=True)
+def run_before_each_test():
+    setup_test_db()
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def statements():
+    """Zbiera zapytania SQL wysłane do testowej bazy danych."""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _add_animals(db):
+    for status in [DogStatus.arrived, DogStatus.arrived, DogStatus.adopted, DogStatus.returned]:
+        db.add(Dog(name="Pies", size=DogSize.medium, neutered=False,
+                   admitted_date=date(2024, 1, 1), status=status))
+    for status in [CatStatus.arrived, CatStatus.adopted, CatStatus.adopted]:
+        db.add(Cat(name="Kot", size=CatSize.small, neutered=False, indoor_only=False,
+                   admitted_date=date(2024, 1, 1), status=status))
+    db.commit()
+
+
+def test_dog_stats_single_query(db, statements):
+    """Test że statystyki psów wyznaczane są jednym zapytaniem"""
+    _add_animals(db)
+    statements.clear()
+
+    stats = get_dog_stats(db)
+
+    assert stats == {"current_in_shelter": 2, "adopted_total": 1, "returned_total": 1, "all_dogs_total": 4}
+    assert len(statements) == 1
+
+
+def test_cat_stats_empty_database(db):
+    """Test statystyk kotów dla pustej bazy"""
+    assert get_cat_stats(db) == {"current_in_shelter": 0, "adopted_total": 0, "returned_total": 0, "all_cats_total": 0}
+
+
+def test_shelter_stats_single_query(db, statements):
+    """Test statystyk całego schroniska w jednym zapytaniu"""
+    _add_animals(db)
+    statements.clear()
+
+    stats = get_shelter_stats(db)
+
+    assert len(statements) == 1
+    assert stats["dogs"] == {"current_in_shelter": 2, "adopted_total": 1, "returned_total": 1, "all_dogs_total": 4}
+    assert stats["cats"] == {"current_in_shelter": 1, "adopted_total": 2, "returned_total": 0, "all_cats_total": 3}
+
+
+# ============= TESTY LICZNIKÓW ZAJĘTOŚCI =============
+
+def test_occupancy_counters_follow_crud_operations(db, statements):
+    """Test przyrostowej aktualizacji liczników przez operacje CRUD"""
+    refresh_occupancy(db)
+    dog = create_dog(db, DogCreate(name="Rex", size=DogSize.medium, birth_date=None, sex=None,
+                                   neutered=False, admitted_date=date(2024, 1, 1),
+                                   released_date=None, status=DogStatus.arrived))
+    update_dog(db, dog.id, DogUpdate(status=DogStatus.adopted))
+    statements.clear()
+
+    assert get_occupancy_stats(db, "dogs") == {"current_in_shelter": 0, "adopted_total": 1,
+                                                "returned_total": 0, "all_dogs_total": 1}
+    assert statements == []
+
+    delete_dog(db, dog.id)
+    assert get_occupancy_stats(db, "dogs")["all_dogs_total"] == 0
+
+
+def test_occupancy_counters_primed_lazily(db):
+    """Test wczytania liczników przy pierwszym odczycie"""
+    _add_animals(db)
+    assert not counters.primed
+
+    assert get_occupancy_stats(db, "cats") == get_cat_stats(db)
+    assert counters.primed
+
+
+def test_refresh_occupancy_corrects_drift(db):
+    """Test uzgodnienia liczników zmienionych poza aplikacją"""
+    refresh_occupancy(db)
+    # zmiany wykonane bezpośrednio w bazie nie aktualizują liczników
+    _add_animals(db)
+    assert get_occupancy_stats(db, "dogs")["all_dogs_total"] == 0
+
+    refresh_occupancy(db)
+    assert get_occupancy_stats(db, "dogs") == get_dog_stats(db)
+    assert get_occupancy_stats(db, "cats") == get_cat_stats(db)
+
+
+def test_async_stats_match_sync(db):
+    """Test że asynchroniczne wersje statystyk zwracają te same wyniki"""
+    _add_animals(db)
+
+    async def scenario():
+        async with TestingAsyncSessionLocal() as session:
+            return await async_dog.get_dog_stats(session), await async_animal.get_shelter_stats(session)
+
+    dog_stats, shelter_stats = asyncio.run(scenario())
+    assert dog_stats == get_dog_stats(db)
+    assert shelter_stats == get_shelter_stats(db)
@@ -0,0 +1,22 @@
+from app.stats_stream import StatsStream
+
+
+def test_advance_returns_only_changed_fields():
+    """Test numeracji i wyznaczania zmienionych pól statystyk"""
+    stream = StatsStream()
+    assert stream.advance("dogs", {"current_in_shelter": 1, "adopted_total": 0}) == (
+        1, {"current_in_shelter": 1, "adopted_total": 0},
+    )
+    assert stream.advance("dogs", {"current_in_shelter": 0, "adopted_total": 0}) == (2, {"current_in_shelter": 0})
+    assert stream.snapshot("dogs") == (2, {"current_in_shelter": 0, "adopted_total": 0})
+
+
+def test_unchanged_stats_do_not_advance_sequence():
+    """Test że powtórzony snapshot nie zwiększa numeru"""
+    stream = StatsStream()
+    stream.advance("cats", {"current_in_shelter": 2})
+    assert stream.advance("cats", {"current_in_shelter": 2}) is None
+    assert stream.snapshot("cats") == (1, {"current_in_shelter": 2})
+    # tematy mają niezależną numerację
+    assert stream.snapshot("dogs") is None
+    assert stream.advance("dogs", {"current_in_shelter": 2})[0] == 1
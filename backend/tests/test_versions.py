@@ -0,0 +1,140 @@
+import asyncio
+import pytest
+from datetime import date
+from app.cache import entity_cache
+from app.crud.dog import create_dog, delete_dog
+from app.database import get_db
+from app.events import AnimalCreated, AnimalDeleted, AnimalUpdated, dispatcher, record_event
+from app.invalidation import INVALIDATION_TOPIC, apply_table_changes, publish_table_changes
+from app.models import DogSize, DogStatus
+from app.schemas.dog import DogCreate
+from app.versions import TableVersions, etag_matches, read_table_versions, refresh_table_versions, table_versions
+from app.websocket_manager import manager
+from tests.database_test import setup_test_db, TestingSessionLocal, override_get_db
+
+
+class FakeApp:
+    """Atrapa aplikacji przekazująca sesje testowej bazy danych."""
+
+    def __init__(self) -> None:
+        self.dependency_overrides = {get_db: override_get_db}
+
+
+@pytest.fixture(autouse=True)
+def run_before_each_test():
+    setup_test_db()
+
+
+def _dog() -> DogCreate:
+    return DogCreate(name="Rex", size=DogSize.medium, birth_date=None, sex=None, neutered=False,
+                     admitted_date=date(2024, 1, 1), released_date=None, status=DogStatus.arrived)
+
+
+def test_advance_changes_only_given_table():
+    """Test ustawiania wersji pojedynczej tabeli (starsza wersja nie cofa znanej)"""
+    versions = TableVersions()
+    dogs_etag, cats_etag = versions.etag("dogs"), versions.etag("cats")
+    assert versions.advance("dogs", 3) == 3
+    assert versions.advance("dogs", 2) == 3
+    assert versions.get("dogs") == 3
+    assert versions.etag("dogs") != dogs_etag
+    assert versions.etag("cats") == cats_etag
+
+
+def test_etag_is_shared_between_processes():
+    """Test że procesy znające tę samą wersję tabel zwracają ten sam ETag"""
+    first, second = TableVersions(), TableVersions()
+    first.load({"dogs": 4, "cats": 2})
+    second.load({"dogs": 4, "cats": 2})
+    assert first.etag("dogs", "cats") == second.etag("dogs", "cats") == 'W/"dogs+cats-4-2"'
+
+
+def test_etag_matches_weak_comparison():
+    """Test porównania If-None-Match (lista ETagów, ETagi słabe i silne, *)"""
+    etag = 'W/"dogs-3"'
+    assert etag_matches(etag, etag)
+    assert etag_matches('"dogs-3"', etag)
+    assert etag_matches('W/"dogs-2", W/"dogs-3"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"dogs-2"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_write_bumps_version_in_database():
+    """Test zwiększania wspólnej wersji tabeli w transakcji zapisu"""
+    db = TestingSessionLocal()
+    try:
+        dog = create_dog(db, _dog())
+        create_dog(db, _dog())
+        assert read_table_versions(db) == {"dogs": 2}
+        assert table_versions.get("dogs") == 2
+
+        # inny worker wczytuje wersję z bazy danych i zwraca ten sam ETag
+        other = TableVersions()
+        other.load(read_table_versions(db))
+        assert other.etag("dogs") == table_versions.etag("dogs")
+
+        delete_dog(db, dog.id)
+        assert read_table_versions(db) == {"dogs": 3}
+        assert table_versions.get("cats") == 0
+    finally:
+        db.close()
+
+
+def test_rolled_back_write_keeps_version():
+    """Test że wycofany zapis nie zmienia wersji tabeli w bazie ani w procesie"""
+    db = TestingSessionLocal()
+    try:
+        create_dog(db, _dog())
+        record_event(db, AnimalCreated("dogs", None))
+        db.rollback()
+        assert read_table_versions(db) == {"dogs": 1}
+        assert table_versions.get("dogs") == 1
+    finally:
+        db.close()
+
+
+def test_refresh_loads_versions_from_database():
+    """Test uzgadniania znanych wersji tabel z bazą danych (zapisy innych workerów)"""
+    db = TestingSessionLocal()
+    try:
+        create_dog(db, _dog())
+        table_versions.reset()
+        refresh_table_versions(db)
+        assert table_versions.get("dogs") == 1
+    finally:
+        db.close()
+
+
+def test_table_changes_from_other_workers_invalidate(monkeypatch):
+    """Test unieważniania wersji tabel i pamięci podręcznej zapisami innych workerów"""
+    published = []
+
+    async def broadcast(topic, message):
+        published.append((topic, message))
+
+    db = TestingSessionLocal()
+    try:
+        create_dog(db, _dog())
+        create_dog(db, _dog())
+    finally:
+        db.close()
+    monkeypatch.setattr(manager, "broadcast", broadcast)
+    monkeypatch.setattr(dispatcher, "app", FakeApp())
+    events = [AnimalCreated("dogs", 1), AnimalUpdated("dogs", 2), AnimalDeleted("cats", 3), AnimalUpdated("dogs", 2)]
+    asyncio.run(publish_table_changes(events))
+    assert sorted(published, key=lambda item: item[1]["table"]) == [
+        (INVALIDATION_TOPIC, {"table": "cats", "ids": [3], "version": 0}),
+        (INVALIDATION_TOPIC, {"table": "dogs", "ids": [2], "version": 2}),
+    ]
+
+    # worker, który nie wykonał zapisów, zna jeszcze starą wersję
+    table_versions.reset()
+    entity_cache.set("dogs", 2, {"name": "Burek"}, table_versions.get("dogs"))
+    dogs_etag, cats_etag = table_versions.etag("dogs"), table_versions.etag("cats")
+    assert apply_table_changes(*published[0]) == []
+    assert entity_cache.get("dogs", 2) is None
+    assert table_versions.get("dogs") == 2
+    assert table_versions.etag("dogs") != dogs_etag
+    assert table_versions.etag("cats") == cats_etag
+    assert apply_table_changes("dogs", {"type": "dog_stats"}) == []
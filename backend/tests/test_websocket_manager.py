@@ -0,0 +1,186 @@
+import asyncio
+import uuid
+import pytest
+from sqlalchemy.engine import make_url
+from app.backplane import PostgresBackplane, UnixSocketBackplane, decode_message, encode_message
+from app.config import settings
+from app.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """Prosta atrapa WebSocket zapisująca wysłane wiadomości."""
+
+    def __init__(self, blocked: bool = False, broken: bool = False) -> None:
+        self.sent = []
+        self.closed_with = None
+        self.broken = broken
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_json(self, message: dict) -> None:
+        await self.unblocked.wait()
+        if self.broken:
+            raise RuntimeError("connection lost")
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+async def _settle() -> None:
+    """Oddaje sterowanie zadaniom wysyłającym."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_slow_consumer_does_not_block_broadcast():
+    """Test że wolny klient nie opóźnia pozostałych"""
+    async def scenario():
+        manager = WebSocketManager(queue_size=10)
+        slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+        await manager.connect(slow, "dogs")
+        await manager.connect(fast, "dogs")
+
+        await asyncio.wait_for(manager.broadcast("dogs", {"n": 1}), timeout=1)
+        await _settle()
+
+        assert fast.sent == [{"n": 1}]
+        assert slow.sent == []
+
+        slow.unblocked.set()
+        await _settle()
+        assert slow.sent == [{"n": 1}]
+
+    asyncio.run(scenario())
+
+
+def test_failing_connection_is_removed_without_affecting_others():
+    """Test że błąd wysyłki dotyczy tylko jednego połączenia"""
+    async def scenario():
+        manager = WebSocketManager()
+        broken, healthy = FakeWebSocket(broken=True), FakeWebSocket()
+        await manager.connect(broken, "cats")
+        await manager.connect(healthy, "cats")
+
+        await manager.broadcast("cats", {"n": 1})
+        await _settle()
+        await manager.broadcast("cats", {"n": 2})
+        await _settle()
+
+        assert healthy.sent == [{"n": 1}, {"n": 2}]
+        assert manager.subscribers("cats") == {healthy}
+
+    asyncio.run(scenario())
+
+
+def test_drop_oldest_policy_keeps_latest_messages():
+    """Test polityki drop_oldest przy przepełnionej kolejce"""
+    async def scenario():
+        manager = WebSocketManager(queue_size=2, overflow_policy="drop_oldest")
+        slow = FakeWebSocket(blocked=True)
+        await manager.connect(slow, "dogs")
+        await _settle()  # writer czeka na pierwszą wiadomość
+
+        for n in range(5):
+            manager.send(slow, {"n": n})
+
+        slow.unblocked.set()
+        await _settle()
+        # w kolejce zostały tylko dwie najnowsze wiadomości
+        assert slow.sent == [{"n": 3}, {"n": 4}]
+        assert manager.dropped_messages == 3
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_policy_evicts_slow_consumer():
+    """Test polityki disconnect przy przepełnionej kolejce"""
+    async def scenario():
+        manager = WebSocketManager(queue_size=1, overflow_policy="disconnect")
+        slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+        await manager.connect(slow, "dogs")
+        await manager.connect(fast, "dogs")
+        await _settle()
+
+        # pierwsza wiadomość blokuje writer wolnego klienta, druga zapełnia kolejkę
+        for n in range(3):
+            await manager.broadcast("dogs", {"n": n})
+            await _settle()
+
+        assert manager.subscribers("dogs") == {fast}
+        assert slow.closed_with == 1013
+        assert manager.evicted_connections == 1
+        assert len(fast.sent) == 3
+
+    asyncio.run(scenario())
+
+
+def test_unix_socket_backplane_fans_out_across_managers(tmp_path):
+    """Test rozsyłania broadcastu do połączeń innego workera przez gniazda Unix"""
+    async def scenario():
+        worker_a, worker_b = WebSocketManager(), WebSocketManager()
+        await worker_a.use_backplane(UnixSocketBackplane(str(tmp_path)))
+        await worker_b.use_backplane(UnixSocketBackplane(str(tmp_path)))
+        on_a, on_b, status_b = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await worker_a.connect(on_a, "dogs")
+        await worker_b.connect(on_b, "dogs")
+        await worker_b.connect(status_b, "status")
+
+        await worker_a.broadcast("dogs", {"n": 1})
+        for _ in range(50):
+            if on_a.sent and on_b.sent:
+                break
+            await asyncio.sleep(0.01)
+
+        assert on_a.sent == on_b.sent == [{"n": 1}]
+        # worker odbierający też aktualizuje i rozsyła swój status
+        assert status_b.sent[0]["type"] == "server_status"
+        assert worker_b.get_status()["last_activity"] is not None
+
+        await worker_a.close_backplane()
+        await worker_b.close_backplane()
+        assert list(tmp_path.glob("*.sock")) == []
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.skipif(
+    make_url(settings.TEST_DATABASE_URL).get_backend_name() != "postgresql",
+    reason="PostgresBackplane wymaga bazy danych PostgreSQL",
+)
+def test_postgres_backplane_fans_out_across_managers():
+    """Test rozsyłania broadcastu do połączeń innego workera przez PostgreSQL LISTEN/NOTIFY"""
+    async def scenario():
+        # osobny kanał, żeby nie odbierać wiadomości innych procesów
+        channel = f"test_ws_{uuid.uuid4().hex[:8]}"
+        worker_a, worker_b = WebSocketManager(), WebSocketManager()
+        await worker_a.use_backplane(PostgresBackplane(settings.TEST_DATABASE_URL, channel))
+        await worker_b.use_backplane(PostgresBackplane(settings.TEST_DATABASE_URL, channel))
+        on_a, on_b = FakeWebSocket(), FakeWebSocket()
+        await worker_a.connect(on_a, "dogs")
+        await worker_b.connect(on_b, "dogs")
+
+        await worker_b.broadcast("dogs", {"n": 1})
+        await worker_a.broadcast("dogs", {"n": 2})
+        for _ in range(100):
+            if len(on_a.sent) == len(on_b.sent) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        # NOTIFY dociera również do nadawcy, w kolejności publikacji
+        assert on_a.sent == on_b.sent == [{"n": 1}, {"n": 2}]
+
+        await worker_a.close_backplane()
+        await worker_b.close_backplane()
+
+    asyncio.run(scenario())
+
+
+def test_backplane_message_round_trip():
+    """Test kodowania wiadomości przesyłanych między workerami"""
+    message = {"type": "dog_stats", "current_in_shelter": 3}
+    assert decode_message(encode_message("dogs", message)) == ("dogs", message)
@@ -1,8 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
-from app.routers.dog import get_db
-from tests.database_test import override_get_db, setup_test_db
+from app.database import get_db, get_async_db
+from tests.database_test import override_get_db, override_get_async_db, setup_test_db, engine, async_engine
+from sqlalchemy import event
 import json
 import time
 
@@ -11,8 +12,15 @@ def run_before_tests():
     setup_test_db()
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 client = TestClient(app)
 
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Uruchamia lifespan aplikacji (dispatcher zdarzeń, liczniki) na czas testów modułu."""
+    with client:
+        yield
+
 @pytest.fixture(autouse=True)
 def setup():
     setup_test_db()
@@ -217,3 +225,233 @@ def test_multiple_websocket_connections():
             
             assert updated1 == updated2
             assert updated1["all_dogs_total"] == 1
+
+
+# ============= TESTY WEBSOCKET - LICZNIKI ZAJĘTOŚCI =============
+
+def test_websocket_reconnects_do_not_query_database():
+    """Test że ponowne połączenia nie wykonują zapytań do bazy"""
+    with client.websocket_connect("/ws/dogs") as websocket:
+        websocket.receive_json()  # wczytuje liczniki
+
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for _ in range(5):
+            with client.websocket_connect("/ws/cats") as websocket:
+                stats = websocket.receive_json()
+                assert stats["all_cats_total"] == 0
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    assert executed == []
+
+
+# ============= TESTY WEBSOCKET - TEMATY =============
+
+def test_websocket_topics_are_isolated():
+    """Test że klienci psów nie otrzymują statystyk kotów i odwrotnie"""
+    cat = {
+        "name": "Mruczek",
+        "size": "small",
+        "indoor_only": True,
+        "birth_date": None,
+        "sex": None,
+        "neutered": False,
+        "admitted_date": "2024-01-01",
+        "released_date": None,
+        "status": "arrived",
+    }
+    dog = {
+        "name": "Rex",
+        "size": "medium",
+        "birth_date": None,
+        "sex": None,
+        "admitted_date": "2024-01-01",
+        "released_date": None,
+        "status": "arrived",
+        "neutered": False
+    }
+    with client.websocket_connect("/ws/dogs") as dogs_ws, client.websocket_connect("/ws/cats") as cats_ws:
+        dogs_ws.receive_json()
+        cats_ws.receive_json()
+
+        client.post("/cats/", json=cat)
+        client.post("/dogs/", json=dog)
+
+        # pierwszą wiadomością na kanale psów są statystyki psów, a nie kotów
+        assert dogs_ws.receive_json()["type"] == "dog_stats"
+        assert cats_ws.receive_json()["type"] == "cat_stats"
+
+
+def test_websocket_disconnect_unsubscribes():
+    """Test wypisania połączenia z tematu po rozłączeniu"""
+    from app.websocket_manager import manager
+
+    with client.websocket_connect("/ws/dogs") as websocket:
+        websocket.receive_json()
+        assert len(manager.subscribers("dogs")) == 1
+
+    # rozłączenie jest obsługiwane asynchronicznie przez serwer
+    for _ in range(50):
+        if not manager.subscribers("dogs"):
+            break
+        time.sleep(0.01)
+    assert manager.subscribers("dogs") == set()
+
+
+# ============= TESTY WEBSOCKET - ŁĄCZENIE AKTUALIZACJI =============
+
+def test_broadcast_metrics_count_merged_updates(monkeypatch):
+    """Test że seria zapisów daje jedną aktualizację, a połączone żądania są widoczne w /metrics/broadcast"""
+    from app.broadcaster import stats_broadcaster
+
+    # okno dłuższe niż seria zapisów, więc wszystkie zmiany trafiają do jednej wiadomości
+    monkeypatch.setattr(stats_broadcaster, "_window", 0.5)
+    monkeypatch.setattr(stats_broadcaster, "_max_latency", 2.0)
+    dog = {
+        "name": "Rex",
+        "size": "medium",
+        "birth_date": None,
+        "sex": None,
+        "admitted_date": "2024-01-01",
+        "released_date": None,
+        "status": "arrived",
+        "neutered": False
+    }
+    before = client.get("/metrics/broadcast").json()
+    with client.websocket_connect("/ws/dogs") as websocket:
+        websocket.receive_json()
+        for _ in range(5):
+            client.post("/dogs/", json=dog)
+        assert websocket.receive_json()["all_dogs_total"] == 5
+
+    after = client.get("/metrics/broadcast").json()
+    assert after["sent_updates"] - before["sent_updates"] == 1
+    assert after["merged_updates"] > before["merged_updates"]
+
+
+# ============= TESTY WEBSOCKET - WIELE WORKERÓW =============
+
+def test_stats_include_writes_of_other_workers(monkeypatch):
+    """Test że przy kilku workerach statystyki pochodzą z bazy, a liczniki pozostałych workerów są uzgadniane"""
+    from datetime import date
+    from app.config import settings
+    from app.events import AnimalCreated, dispatcher, record_event
+    from app.models import Dog
+    from app.occupancy import counters
+    from app.routers import ws
+    from app.websocket_manager import manager
+    from tests.database_test import TestingSessionLocal
+
+    monkeypatch.setattr(settings, "WS_BACKPLANE", "postgres")
+    monkeypatch.setattr(manager, "_delivery_hooks", [*manager._delivery_hooks, ws.sync_counters])
+    with client.websocket_connect("/ws/dogs") as websocket:
+        assert websocket.receive_json()["all_dogs_total"] == 0
+
+        # zapis innego workera - lokalne liczniki o nim nie wiedzą
+        db = TestingSessionLocal()
+        try:
+            dog = Dog(name="Rex", size="medium", neutered=False, admitted_date=date(2024, 1, 1), status="arrived")
+            db.add(dog)
+            db.flush()
+            record_event(db, AnimalCreated("dogs", dog.id))
+            db.commit()
+        finally:
+            db.close()
+        dispatcher.notify()
+
+        stats = websocket.receive_json()
+        assert (stats["current_in_shelter"], stats["all_dogs_total"]) == (1, 1)
+
+    # wiadomość z kanału od innego workera nadpisuje lokalne liczniki gatunku
+    manager.deliver("dogs", {"type": "dog_stats", "current_in_shelter": 2, "adopted_total": 1,
+                             "returned_total": 0, "all_dogs_total": 3})
+    assert counters.snapshot("dogs")["all_dogs_total"] == 3
+
+
+# ============= TESTY WEBSOCKET - PROTOKÓŁ V2 =============
+
+def test_websocket_protocol_v2_sends_sequenced_deltas():
+    """Test protokołu v2: snapshot z numerem, potem tylko zmienione pola z kolejnymi numerami"""
+    dog = {
+        "name": "Rex",
+        "size": "medium",
+        "birth_date": None,
+        "sex": None,
+        "admitted_date": "2024-01-01",
+        "released_date": None,
+        "status": "arrived",
+        "neutered": False
+    }
+    with client.websocket_connect("/ws/dogs?protocol=2") as websocket:
+        snapshot = websocket.receive_json()
+        assert snapshot["type"] == "dog_stats"
+        assert snapshot["all_dogs_total"] == 0
+        seq = snapshot["seq"]
+
+        dog_id = client.post("/dogs/", json=dog).json()["id"]
+        delta = websocket.receive_json()
+        assert delta == {"type": "dog_stats_delta", "seq": seq + 1, "current_in_shelter": 1, "all_dogs_total": 1}
+
+        client.put(f"/dogs/{dog_id}", json={"status": "adopted"})
+        delta = websocket.receive_json()
+        assert delta == {"type": "dog_stats_delta", "seq": seq + 2, "current_in_shelter": 0, "adopted_total": 1}
+
+        # prośba o pełny snapshot (np. po wykryciu luki w numeracji)
+        websocket.send_text(json.dumps({"type": "snapshot"}))
+        assert websocket.receive_json() == {
+            "type": "dog_stats", "seq": seq + 2,
+            "current_in_shelter": 0, "adopted_total": 1, "returned_total": 0, "all_dogs_total": 1,
+        }
+
+
+def test_websocket_protocol_v1_unchanged_alongside_v2():
+    """Test że klienci v1 nadal dostają pełne snapshoty bez numeru"""
+    dog = {
+        "name": "Rex",
+        "size": "medium",
+        "birth_date": None,
+        "sex": None,
+        "admitted_date": "2024-01-01",
+        "released_date": None,
+        "status": "arrived",
+        "neutered": False
+    }
+    with client.websocket_connect("/ws/dogs") as v1, client.websocket_connect("/ws/dogs?protocol=2") as v2:
+        v1.receive_json()
+        v2.receive_json()
+        client.post("/dogs/", json=dog)
+
+        assert v1.receive_json() == {
+            "type": "dog_stats",
+            "current_in_shelter": 1, "adopted_total": 0, "returned_total": 0, "all_dogs_total": 1,
+        }
+        assert v2.receive_json()["type"] == "dog_stats_delta"
+
+
+# ============= TESTY WEBSOCKET - SESJE BAZY DANYCH =============
+
+def test_websocket_does_not_hold_database_connection():
+    """Test że otwarty WebSocket nie trzyma połączenia z puli"""
+    # liczniki są niewczytane, więc początkowe statystyki wymagają zapytania
+    with client.websocket_connect("/ws/dogs") as websocket:
+        stats = websocket.receive_json()
+        assert stats["all_dogs_total"] == 0
+        assert engine.pool.checkedout() == 0
+
+
+def test_websocket_rejects_unknown_protocol():
+    """Test odrzucenia nieobsługiwanej wersji protokołu"""
+    from starlette.websockets import WebSocketDisconnect
+
+    for protocol in ("0", "3", "v2"):
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect(f"/ws/dogs?protocol={protocol}") as websocket:
+                websocket.receive_json()